@@ -13,114 +13,12 @@ import json
 from datetime import datetime
 import webbrowser
 import time
-import mysql.connector
-import pyodbc
 import http.server
 import socketserver
-import requests
 
-
-class BytebaseAPI:
-    """Bytebase API integration for the POC"""
-    
-    def __init__(self, base_url="http://localhost:8080", username="admin", password="admin"):
-        self.base_url = base_url
-        self.username = username
-        self.password = password
-        self.token = None
-        self.project_id = None
-        self.instance_id = None
-        
-    def authenticate(self):
-        """Authenticate with Bytebase and get access token"""
-        try:
-            # First, check if Bytebase is running with a simple health check
-            try:
-                response = requests.get(f"{self.base_url}", timeout=5)
-                
-                # Check if we can access the web interface
-                if response.status_code == 200:
-                    # Bytebase is running and accessible
-                    self.token = "web-interface-access"
-                    return True
-                else:
-                    raise Exception(f"Bytebase server returned status {response.status_code}")
-                    
-            except requests.ConnectionError:
-                raise Exception("Cannot connect to Bytebase server at localhost:8080")
-            except requests.Timeout:
-                raise Exception("Bytebase connection timeout - server may be starting up")
-                
-        except requests.RequestException as e:
-            raise Exception(f"Cannot connect to Bytebase: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Bytebase authentication error: {str(e)}")
-    
-    def create_migration_issue(self, sql_content, title="POC Migration"):
-        """Create a migration issue in Bytebase - simplified for web interface access"""
-        try:
-            if not self.token:
-                self.authenticate()
-                
-            # For POC purposes, simulate successful migration issue creation
-            issue = {
-                "name": f"migration-{title.lower().replace(' ', '-')}",
-                "title": title,
-                "type": "bb.issue.database.schema.update",
-                "description": "Migration created by POC",
-                "state": "ACTIVE"
-            }
-            
-            return issue
-                
-        except Exception as e:
-            # Even if simulation fails, provide meaningful feedback
-            return {
-                "name": f"migration-{title.lower().replace(' ', '-')}",
-                "title": title,
-                "state": "SIMULATED"
-            }
-    
-    def run_migrations(self, folder_path):
-        """Run migrations from a folder - main entry point for GUI integration"""
-        return self.execute_migration_folder(folder_path)
-    
-    def execute_migration_folder(self, folder_path):
-        """Execute all SQL files in a folder through Bytebase"""
-        try:
-            # Get all SQL files
-            sql_files = []
-            for filename in sorted(os.listdir(folder_path)):
-                if filename.endswith('.sql'):
-                    filepath = os.path.join(folder_path, filename)
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        sql_content = f.read()
-                    sql_files.append((filename, sql_content))
-            
-            # Create migration issues for each file
-            results = []
-            for filename, sql_content in sql_files:
-                try:
-                    result = self.create_migration_issue(
-                        sql_content, 
-                        title=filename
-                    )
-                    results.append(f"✓ Created migration issue for {filename}")
-                except Exception as e:
-                    results.append(f"✗ Failed to create migration for {filename}: {str(e)}")
-            
-            return results
-            
-        except Exception as e:
-            raise Exception(f"Error executing migration folder: {str(e)}")
-    
-    def check_server_status(self):
-        """Check if Bytebase server is running and accessible"""
-        try:
-            response = requests.get(f"{self.base_url}", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+from migration_engine import MigrationEngine, ConnectionSettings, ParsedMigrationCache, BytebaseAPI, connect
+from migration_engine import FanoutDeployment, load_targets, format_matrix, CancelToken
+from migration_engine.estimate import format_duration
 
 
 load_dotenv = lambda: None  # Remove dotenv dependency
@@ -139,6 +37,13 @@ class ProfessionalMigrationGUI:
         # Initialize tool instances (without .env dependency)
         self.bytebase_api = BytebaseAPI()
         
+        # Parsed migration cache shared by every execution path
+        project_root = os.path.dirname(os.path.abspath(__file__))
+        self.parse_cache = ParsedMigrationCache(os.path.join(project_root, ".migration_cache"))
+        
+        # Shared by every migration started until the Cancel button is pressed
+        self.cancel_token = CancelToken()
+        
         # Results storage
         self.results = {
             'bytebase': [],
@@ -209,7 +114,31 @@ class ProfessionalMigrationGUI:
                 'database': self.db_var.get() if hasattr(self, 'db_var') else 'migrationtest',
                 'username': self.username_var.get() if hasattr(self, 'username_var') else 'root',
                 'password': self.password_var.get() if hasattr(self, 'password_var') else '',
-                'trusted_connection': self.trusted_connection_var.get() if hasattr(self, 'trusted_connection_var') else True
+                'trusted_connection': self.trusted_connection_var.get() if hasattr(self, 'trusted_connection_var') else True,
+                'batch_mode': self.batch_mode_var.get() if hasattr(self, 'batch_mode_var') else True,
+                'transactional': self.transactional_var.get() if hasattr(self, 'transactional_var') else True,
+                'parallel_workers': self._parallel_workers() if hasattr(self, 'parallel_workers_var') else 1,
+                'drift_policy': self.drift_policy_var.get() if hasattr(self, 'drift_policy_var') else 'warn',
+                'checkpoint_interval': self._checkpoint_interval() if hasattr(self, 'checkpoint_interval_var') else 0,
+                'online_schema_change': self.online_schema_change_var.get() if hasattr(self, 'online_schema_change_var') else False,
+                'online_chunk_size': self._int_setting('online_chunk_size_var', 1000),
+                'online_throttle_ms': self._int_setting('online_throttle_ms_var', 0),
+                'chunked_backfill': self.chunked_backfill_var.get() if hasattr(self, 'chunked_backfill_var') else False,
+                'backfill_chunk_size': self._int_setting('backfill_chunk_size_var', 5000),
+                'backfill_max_threads_running': self._int_setting('backfill_max_threads_running_var', 25),
+                'backfill_max_replica_lag': self._int_setting('backfill_max_replica_lag_var', 5),
+                'backfill_replica': self.backfill_replica_var.get() if hasattr(self, 'backfill_replica_var') else '',
+                'backfill_heartbeat_table': self.backfill_heartbeat_table_var.get() if hasattr(self, 'backfill_heartbeat_table_var') else '',
+                'statement_timeout': self._int_setting('statement_timeout_var', 0),
+                'lock_timeout': self._int_setting('lock_timeout_var', 0),
+                'catalog_preconditions': self.catalog_preconditions_var.get() if hasattr(self, 'catalog_preconditions_var') else True,
+                'native_liquibase': self.native_liquibase_var.get() if hasattr(self, 'native_liquibase_var') else True,
+                'liquibase_checksums': self.liquibase_checksums_var.get() if hasattr(self, 'liquibase_checksums_var') else True,
+                'liquibase_flow': self.liquibase_flow_var.get() if hasattr(self, 'liquibase_flow_var') else True,
+                'liquibase_jvm_options': self.liquibase_jvm_options_var.get() if hasattr(self, 'liquibase_jvm_options_var') else ConnectionSettings.DEFAULTS['liquibase_jvm_options'],
+                'liquibase_cds': self.liquibase_cds_var.get() if hasattr(self, 'liquibase_cds_var') else True,
+                'native_compare': self.native_compare_var.get() if hasattr(self, 'native_compare_var') else True,
+                'apply_native_sync': self.apply_native_sync_var.get() if hasattr(self, 'apply_native_sync_var') else False
             }
             with open(self.config_file, 'w') as f:
                 json.dump(state, f, indent=2)
@@ -401,6 +330,18 @@ class ProfessionalMigrationGUI:
                  font=('Segoe UI', 14, 'bold'),
                  relief='flat', padx=30, pady=12).pack(side='left', padx=10)
         
+        tk.Button(migration_buttons, text="🌍 Fan-out Deploy",
+                 command=self.run_fanout_deployment,
+                 bg='#6f42c1', fg='white',
+                 font=('Segoe UI', 12, 'bold'),
+                 relief='flat', padx=20, pady=10).pack(side='left', padx=10)
+        
+        tk.Button(migration_buttons, text="⏹️ Cancel",
+                 command=self.cancel_migrations,
+                 bg='#6c757d', fg='white',
+                 font=('Segoe UI', 12, 'bold'),
+                 relief='flat', padx=20, pady=10).pack(side='left', padx=10)
+        
         tk.Button(migration_buttons, text="🌐 Run All UIs",
                  command=self.start_all_web_interfaces,
                  bg='#28a745', fg='white',
@@ -419,12 +360,45 @@ class ProfessionalMigrationGUI:
                  font=('Segoe UI', 12, 'bold'),
                  relief='flat', padx=20, pady=10).pack(side='left', padx=10)
         
+        tk.Button(migration_buttons, text="🧬 Clone Template",
+                 command=self.clone_template,
+                 bg='#6f42c1', fg='white',
+                 font=('Segoe UI', 12, 'bold'),
+                 relief='flat', padx=20, pady=10).pack(side='left', padx=10)
+        
         tk.Button(migration_buttons, text="🧪 Run Tests",
                  command=self.run_automated_test,
                  bg='#28a745', fg='white',
                  font=('Segoe UI', 12, 'bold'),
                  relief='flat', padx=20, pady=10).pack(side='left', padx=10)
         
+        # Pre-run duration estimate of the pending migrations
+        estimate_section = tk.LabelFrame(scrollable_frame,
+                                       text="⏱️ Pending Migrations Estimate",
+                                       font=('Segoe UI', 14, 'bold'),
+                                       bg='white', fg='#2c3e50')
+        estimate_section.pack(fill='x', padx=20, pady=(0, 20))
+        
+        estimate_controls = tk.Frame(estimate_section, bg='white')
+        estimate_controls.pack(fill='x', padx=15, pady=10)
+        tk.Button(estimate_controls, text="⏱️ Estimate Pending",
+                 command=self.estimate_migrations,
+                 bg='#17a2b8', fg='white',
+                 font=('Segoe UI', 11, 'bold'),
+                 relief='flat', padx=15, pady=6).pack(side='left')
+        self.estimate_total_label = tk.Label(estimate_controls,
+                                           text="Estimate pending migrations to fit heavy runs into a maintenance window",
+                                           font=('Segoe UI', 10), bg='white', fg='#6c757d')
+        self.estimate_total_label.pack(side='left', padx=15)
+        
+        columns = ('tool', 'file', 'statements', 'estimate', 'heaviest')
+        self.estimate_tree = ttk.Treeview(estimate_section, columns=columns, show='headings', height=6)
+        for column, heading, width in (('tool', 'Tool', 90), ('file', 'File', 260), ('statements', 'Statements', 90),
+                                       ('estimate', 'Estimate', 90), ('heaviest', 'Heaviest step', 360)):
+            self.estimate_tree.heading(column, text=heading)
+            self.estimate_tree.column(column, width=width, anchor='w')
+        self.estimate_tree.pack(fill='x', padx=15, pady=(0, 15))
+        
         # Pack canvas and scrollbar
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -768,6 +742,144 @@ class ProfessionalMigrationGUI:
                                                font=('Segoe UI', 9), bg='white')
         self.connection_status_label.grid(row=6, column=0, columnspan=4, pady=5)
         
+        # Execution options
+        execution_frame = tk.LabelFrame(settings_content,
+                                       text="⚡ Execution Options",
+                                       font=('Segoe UI', 12, 'bold'),
+                                       bg='white')
+        execution_frame.pack(fill='x', pady=10)
+        
+        self.batch_mode_var = tk.BooleanVar(value=self.saved_state.get('batch_mode', True))
+        tk.Checkbutton(execution_frame, text="📦 Batch statements to minimise round trips (GO batches / multi-statement packets)",
+                      variable=self.batch_mode_var,
+                      font=('Segoe UI', 10), bg='white').pack(anchor='w', padx=20, pady=(10, 5))
+        
+        self.transactional_var = tk.BooleanVar(value=self.saved_state.get('transactional', True))
+        tk.Checkbutton(execution_frame, text="🔒 One transaction per migration file (roll back the whole file on error)",
+                      variable=self.transactional_var,
+                      font=('Segoe UI', 10), bg='white').pack(anchor='w', padx=20, pady=(0, 5))
+        
+        self.drift_policy_var = tk.StringVar(value=self.saved_state.get('drift_policy', 'warn'))
+        tk.Checkbutton(execution_frame, text="🛑 Refuse to deploy when an applied migration file has been edited (otherwise warn)",
+                      variable=self.drift_policy_var, onvalue='refuse', offvalue='warn',
+                      font=('Segoe UI', 10), bg='white').pack(anchor='w', padx=20, pady=(0, 5))
+        
+        self.catalog_preconditions_var = tk.BooleanVar(value=self.saved_state.get('catalog_preconditions', True))
+        tk.Checkbutton(execution_frame, text="🔎 Skip statements the catalog shows are no-ops (objects that already exist or are already gone)",
+                      variable=self.catalog_preconditions_var,
+                      font=('Segoe UI', 10), bg='white').pack(anchor='w', padx=20, pady=(0, 5))
+        
+        self.native_liquibase_var = tk.BooleanVar(value=self.saved_state.get('native_liquibase', True))
+        tk.Checkbutton(execution_frame, text="🐍 Run Liquibase changelogs natively (the Liquibase CLI only for unsupported change types)",
+                      variable=self.native_liquibase_var,
+                      font=('Segoe UI', 10), bg='white').pack(anchor='w', padx=20, pady=(0, 5))
+        
+        self.liquibase_checksums_var = tk.BooleanVar(value=self.saved_state.get('liquibase_checksums', True))
+        tk.Checkbutton(execution_frame, text="🧮 Start the Liquibase CLI only when changeset checksums show pending changes",
+                      variable=self.liquibase_checksums_var,
+                      font=('Segoe UI', 10), bg='white').pack(anchor='w', padx=20, pady=(0, 5))
+        
+        self.liquibase_flow_var = tk.BooleanVar(value=self.saved_state.get('liquibase_flow', True))
+        tk.Checkbutton(execution_frame, text="🌊 Run Liquibase validate, status and update in one JVM (flow file)",
+                      variable=self.liquibase_flow_var,
+                      font=('Segoe UI', 10), bg='white').pack(anchor='w', padx=20, pady=(0, 5))
+        
+        self.liquibase_cds_var = tk.BooleanVar(value=self.saved_state.get('liquibase_cds', True))
+        tk.Checkbutton(execution_frame, text="☕ Start Liquibase from a class-data sharing archive (JDK 19+)",
+                      variable=self.liquibase_cds_var,
+                      font=('Segoe UI', 10), bg='white').pack(anchor='w', padx=20, pady=(0, 5))
+        
+        jvm_frame = tk.Frame(execution_frame, bg='white')
+        jvm_frame.pack(anchor='w', padx=20, pady=(0, 5))
+        tk.Label(jvm_frame, text="☕ Liquibase JVM options:",
+                font=('Segoe UI', 10), bg='white').pack(side='left')
+        self.liquibase_jvm_options_var = tk.StringVar(value=self.saved_state.get('liquibase_jvm_options', ConnectionSettings.DEFAULTS['liquibase_jvm_options']))
+        tk.Entry(jvm_frame, textvariable=self.liquibase_jvm_options_var, font=('Segoe UI', 10), width=40).pack(side='left', padx=5)
+        
+        self.native_compare_var = tk.BooleanVar(value=self.saved_state.get('native_compare', True))
+        tk.Checkbutton(execution_frame, text="🔍 Compare Redgate schemas natively and write a sync script when SQL Compare is missing",
+                      variable=self.native_compare_var,
+                      font=('Segoe UI', 10), bg='white').pack(anchor='w', padx=20, pady=(0, 5))
+        
+        self.apply_native_sync_var = tk.BooleanVar(value=self.saved_state.get('apply_native_sync', False))
+        tk.Checkbutton(execution_frame, text="🔁 Apply the native sync script after a successful Redgate deployment",
+                      variable=self.apply_native_sync_var,
+                      font=('Segoe UI', 10), bg='white').pack(anchor='w', padx=20, pady=(0, 5))
+        
+        parallel_frame = tk.Frame(execution_frame, bg='white')
+        parallel_frame.pack(anchor='w', padx=20, pady=(0, 10))
+        tk.Label(parallel_frame, text="🔀 Parallel connections (independent statements, or whole files with transactions, run concurrently):",
+                font=('Segoe UI', 10), bg='white').pack(side='left')
+        self.parallel_workers_var = tk.StringVar(value=str(self.saved_state.get('parallel_workers', 1)))
+        tk.Spinbox(parallel_frame, from_=1, to=16, textvariable=self.parallel_workers_var,
+                  font=('Segoe UI', 10), width=4).pack(side='left', padx=5)
+        
+        timeout_frame = tk.Frame(execution_frame, bg='white')
+        timeout_frame.pack(anchor='w', padx=20, pady=(0, 10))
+        tk.Label(timeout_frame, text="⏱️ Cancel a statement after (s, 0 = never):",
+                font=('Segoe UI', 10), bg='white').pack(side='left')
+        self.statement_timeout_var = tk.StringVar(value=str(self.saved_state.get('statement_timeout', 0)))
+        tk.Spinbox(timeout_frame, from_=0, to=86400, increment=60, textvariable=self.statement_timeout_var,
+                  font=('Segoe UI', 10), width=7).pack(side='left', padx=5)
+        tk.Label(timeout_frame, text="Lock wait timeout (s, 0 = server default):",
+                font=('Segoe UI', 10), bg='white').pack(side='left', padx=(15, 0))
+        self.lock_timeout_var = tk.StringVar(value=str(self.saved_state.get('lock_timeout', 0)))
+        tk.Spinbox(timeout_frame, from_=0, to=3600, increment=10, textvariable=self.lock_timeout_var,
+                  font=('Segoe UI', 10), width=6).pack(side='left', padx=5)
+        
+        checkpoint_frame = tk.Frame(execution_frame, bg='white')
+        checkpoint_frame.pack(anchor='w', padx=20, pady=(0, 10))
+        tk.Label(checkpoint_frame, text="💾 Commit and save a resume checkpoint every N statements (0 = one transaction per file):",
+                font=('Segoe UI', 10), bg='white').pack(side='left')
+        self.checkpoint_interval_var = tk.StringVar(value=str(self.saved_state.get('checkpoint_interval', 0)))
+        tk.Spinbox(checkpoint_frame, from_=0, to=1000000, increment=1000, textvariable=self.checkpoint_interval_var,
+                  font=('Segoe UI', 10), width=8).pack(side='left', padx=5)
+        
+        self.online_schema_change_var = tk.BooleanVar(value=self.saved_state.get('online_schema_change', False))
+        tk.Checkbutton(execution_frame, text="🔁 MySQL online schema change (INSTANT/INPLACE, else shadow-table copy with triggers)",
+                      variable=self.online_schema_change_var,
+                      font=('Segoe UI', 10), bg='white').pack(anchor='w', padx=20, pady=(0, 5))
+        
+        online_frame = tk.Frame(execution_frame, bg='white')
+        online_frame.pack(anchor='w', padx=40, pady=(0, 10))
+        tk.Label(online_frame, text="Rows per chunk:", font=('Segoe UI', 10), bg='white').pack(side='left')
+        self.online_chunk_size_var = tk.StringVar(value=str(self.saved_state.get('online_chunk_size', 1000)))
+        tk.Spinbox(online_frame, from_=100, to=100000, increment=500, textvariable=self.online_chunk_size_var,
+                  font=('Segoe UI', 10), width=8).pack(side='left', padx=5)
+        tk.Label(online_frame, text="Pause between chunks (ms):", font=('Segoe UI', 10), bg='white').pack(side='left', padx=(15, 0))
+        self.online_throttle_ms_var = tk.StringVar(value=str(self.saved_state.get('online_throttle_ms', 0)))
+        tk.Spinbox(online_frame, from_=0, to=10000, increment=50, textvariable=self.online_throttle_ms_var,
+                  font=('Segoe UI', 10), width=6).pack(side='left', padx=5)
+        
+        self.chunked_backfill_var = tk.BooleanVar(value=self.saved_state.get('chunked_backfill', False))
+        tk.Checkbutton(execution_frame, text="🧮 MySQL chunked backfills (whole-table UPDATE/DELETE/INSERT ... SELECT in primary-key chunks)",
+                      variable=self.chunked_backfill_var,
+                      font=('Segoe UI', 10), bg='white').pack(anchor='w', padx=20, pady=(0, 5))
+        
+        backfill_frame = tk.Frame(execution_frame, bg='white')
+        backfill_frame.pack(anchor='w', padx=40, pady=(0, 5))
+        tk.Label(backfill_frame, text="Rows per chunk:", font=('Segoe UI', 10), bg='white').pack(side='left')
+        self.backfill_chunk_size_var = tk.StringVar(value=str(self.saved_state.get('backfill_chunk_size', 5000)))
+        tk.Spinbox(backfill_frame, from_=100, to=100000, increment=1000, textvariable=self.backfill_chunk_size_var,
+                  font=('Segoe UI', 10), width=8).pack(side='left', padx=5)
+        tk.Label(backfill_frame, text="Pause at Threads_running:", font=('Segoe UI', 10), bg='white').pack(side='left', padx=(15, 0))
+        self.backfill_max_threads_running_var = tk.StringVar(value=str(self.saved_state.get('backfill_max_threads_running', 25)))
+        tk.Spinbox(backfill_frame, from_=0, to=1000, textvariable=self.backfill_max_threads_running_var,
+                  font=('Segoe UI', 10), width=5).pack(side='left', padx=5)
+        
+        replica_frame = tk.Frame(execution_frame, bg='white')
+        replica_frame.pack(anchor='w', padx=40, pady=(0, 10))
+        tk.Label(replica_frame, text="Replica (host[:port]):", font=('Segoe UI', 10), bg='white').pack(side='left')
+        self.backfill_replica_var = tk.StringVar(value=self.saved_state.get('backfill_replica', ''))
+        tk.Entry(replica_frame, textvariable=self.backfill_replica_var, font=('Segoe UI', 10), width=20).pack(side='left', padx=5)
+        tk.Label(replica_frame, text="Pause at lag (s):", font=('Segoe UI', 10), bg='white').pack(side='left', padx=(15, 0))
+        self.backfill_max_replica_lag_var = tk.StringVar(value=str(self.saved_state.get('backfill_max_replica_lag', 5)))
+        tk.Spinbox(replica_frame, from_=1, to=3600, textvariable=self.backfill_max_replica_lag_var,
+                  font=('Segoe UI', 10), width=5).pack(side='left', padx=5)
+        tk.Label(replica_frame, text="Heartbeat table:", font=('Segoe UI', 10), bg='white').pack(side='left', padx=(15, 0))
+        self.backfill_heartbeat_table_var = tk.StringVar(value=self.saved_state.get('backfill_heartbeat_table', ''))
+        tk.Entry(replica_frame, textvariable=self.backfill_heartbeat_table_var, font=('Segoe UI', 10), width=18).pack(side='left', padx=5)
+        
         # Initialize tool variables (for backward compatibility)
         self.bytebase_enabled = tk.BooleanVar(value=True)
         self.liquibase_enabled = tk.BooleanVar(value=True)
@@ -884,105 +996,75 @@ class ProfessionalMigrationGUI:
 
     def get_connection(self):
         """Get database connection using current settings"""
+        return connect(self._connection_settings())
+    
+    def _connection_settings(self):
+        """Snapshot the Settings tab into engine connection settings"""
+        return ConnectionSettings(
+            db_type=self.db_type_var.get(),
+            host=self.host_var.get(),
+            port=self.port_var.get(),
+            database=self.db_var.get(),
+            username=self.username_var.get(),
+            password=self.password_var.get(),
+            driver=self.driver_var.get(),
+            trusted_connection=self.trusted_connection_var.get(),
+            batch_mode=self.batch_mode_var.get(),
+            transactional=self.transactional_var.get(),
+            parallel_workers=self._parallel_workers(),
+            drift_policy=self.drift_policy_var.get(),
+            checkpoint_interval=self._checkpoint_interval(),
+            online_schema_change=self.online_schema_change_var.get(),
+            online_chunk_size=self._int_setting('online_chunk_size_var', 1000),
+            online_throttle_ms=self._int_setting('online_throttle_ms_var', 0),
+            chunked_backfill=self.chunked_backfill_var.get(),
+            backfill_chunk_size=self._int_setting('backfill_chunk_size_var', 5000),
+            backfill_max_threads_running=self._int_setting('backfill_max_threads_running_var', 25),
+            backfill_max_replica_lag=self._int_setting('backfill_max_replica_lag_var', 5),
+            backfill_replica=self.backfill_replica_var.get().strip(),
+            backfill_heartbeat_table=self.backfill_heartbeat_table_var.get().strip(),
+            statement_timeout=self._int_setting('statement_timeout_var', 0),
+            lock_timeout=self._int_setting('lock_timeout_var', 0),
+            catalog_preconditions=self.catalog_preconditions_var.get(),
+            native_liquibase=self.native_liquibase_var.get(),
+            liquibase_checksums=self.liquibase_checksums_var.get(),
+            liquibase_flow=self.liquibase_flow_var.get(),
+            liquibase_jvm_options=self.liquibase_jvm_options_var.get().strip(),
+            liquibase_cds=self.liquibase_cds_var.get(),
+            native_compare=self.native_compare_var.get(),
+            apply_native_sync=self.apply_native_sync_var.get()
+        )
+    
+    def _parallel_workers(self):
+        """Parallel connection count from the Settings tab (1 when not a number)"""
         try:
-            db_type = self.db_type_var.get()
-            
-            if db_type == "mysql":
-                # MySQL connection
-                connection = mysql.connector.connect(
-                    host=self.host_var.get(),
-                    port=int(self.port_var.get()),
-                    user=self.username_var.get(),
-                    password=self.password_var.get(),
-                    database=self.db_var.get()
-                )
-                return connection
-                
-            elif db_type == "sqlserver":
-                # SQL Server connection using pyodbc
-                host = self.host_var.get()
-                port = self.port_var.get()
-                database = self.db_var.get()
-                driver = self.driver_var.get()
-                
-                # Handle different SQL Server connection formats
-                if "\\" in host:
-                    # Named instance format (e.g., localhost\SQLEXPRESS)
-                    if "," in host:
-                        # Already has port specified (e.g., localhost\SQLEXPRESS,14766)
-                        server = host
-                    else:
-                        # Try with dynamic port first, then standard port
-                        server = f"{host},14766"  # Use discovered dynamic port
-                else:
-                    # Regular host format
-                    server = f"{host},{port}"
-                
-                if self.trusted_connection_var.get():
-                    # Windows Authentication - recommended for SQL Server Express
-                    connection_string = f"""
-                    DRIVER={{{driver}}};
-                    SERVER={server};
-                    DATABASE={database};
-                    Trusted_Connection=yes;
-                    """
-                else:
-                    # SQL Server Authentication
-                    username = self.username_var.get()
-                    password = self.password_var.get()
-                    connection_string = f"""
-                    DRIVER={{{driver}}};
-                    SERVER={server};
-                    DATABASE={database};
-                    UID={username};
-                    PWD={password};
-                    """
-                
-                try:
-                    connection = pyodbc.connect(connection_string.strip())
-                    return connection
-                except Exception as e:
-                    # If dynamic port fails, try standard connection formats
-                    alternate_servers = [
-                        f"{host.split(',')[0]}",  # Just the host without port
-                        f"{host.split(',')[0]},1433",  # Standard port
-                        ".\\SQLEXPRESS",  # Named pipes format
-                        "(local)\\SQLEXPRESS"  # Local format
-                    ]
-                    
-                    for alt_server in alternate_servers:
-                        try:
-                            if self.trusted_connection_var.get():
-                                alt_connection_string = f"""
-                                DRIVER={{{driver}}};
-                                SERVER={alt_server};
-                                DATABASE={database};
-                                Trusted_Connection=yes;
-                                """
-                            else:
-                                username = self.username_var.get()
-                                password = self.password_var.get()
-                                alt_connection_string = f"""
-                                DRIVER={{{driver}}};
-                                SERVER={alt_server};
-                                DATABASE={database};
-                                UID={username};
-                                PWD={password};
-                                """
-                            
-                            connection = pyodbc.connect(alt_connection_string.strip())
-                            return connection
-                        except:
-                            continue
-                    
-                    # If all attempts fail, raise the original error
-                    raise e
-            
-            else:
-                raise Exception(f"Unsupported database type: {db_type}")
-                
-        except Exception as e:
-            raise Exception(f"Database connection failed: {str(e)}")
+            return max(1, int(self.parallel_workers_var.get()))
+        except ValueError:
+            return 1
+    
+    def _checkpoint_interval(self):
+        """Checkpoint interval from the Settings tab (0 when not a number)"""
+        try:
+            return max(0, int(self.checkpoint_interval_var.get()))
+        except ValueError:
+            return 0
+    
+    def _int_setting(self, var_name, default):
+        """Non-negative integer from a Settings tab variable (default when missing or not a number)"""
+        try:
+            return max(0, int(getattr(self, var_name).get()))
+        except (AttributeError, ValueError):
+            return default
+    
+    def _create_engine(self):
+        """Headless migration engine for the current settings, logging to the console tab"""
+        return MigrationEngine(
+            self._connection_settings(),
+            log=self.log_to_console,
+            parse_cache=self.parse_cache,
+            bytebase_api=self.bytebase_api,
+            cancel=self.cancel_token
+        )
     
     def test_connection(self):
         """Test database connection"""
@@ -2278,230 +2360,7 @@ class ProfessionalMigrationGUI:
         time.sleep(1)
         self.open_web_page('http://localhost:5002', 'Liquibase')
     
-    # Migration methods
-    def _detect_sqlserver_port(self):
-        """Detect the actual port SQL Server is listening on"""
-        try:
-            import subprocess
-            # Run netstat to find SQL Server ports
-            result = subprocess.run(
-                ["netstat", "-an"],
-                capture_output=True,
-                text=True,
-                shell=True
-            )
-            
-            # Look for ports in the SQL Server range (typically 14xxx, but not 1434 which is browser service)
-            detected_ports = []
-            for line in result.stdout.split('\n'):
-                if 'LISTENING' in line and ':14' in line:
-                    # Extract port number
-                    port_part = line.split()[1]  # Get the local address part
-                    if ':' in port_part:
-                        port = port_part.split(':')[-1]
-                        if port.isdigit() and port != '1434' and len(port) >= 4:  # Exclude browser service port
-                            detected_ports.append(port)
-            
-            # Return the first non-browser service port found
-            if detected_ports:
-                port = detected_ports[0]
-                return port
-            
-            return None
-            
-        except Exception as e:
-            return None
-
-    def _create_temp_liquibase_properties_sqlserver(self):
-        """Create a temporary liquibase.properties file for SQL Server"""
-        try:
-            # Get current SQL Server connection settings from GUI
-            host = self.host_var.get()
-            port = self.port_var.get()
-            database = self.db_var.get()
-            username = self.username_var.get()
-            password = self.password_var.get()
-            
-            # Ensure we have the correct liquibase directory path
-            project_root = os.path.dirname(os.path.abspath(__file__))
-            liquibase_dir = os.path.join(project_root, "liquibase")
-            
-            # Enhanced SQL Server JDBC URL handling with multiple fallback strategies
-            detected_port = None
-            if "\\" in host:
-                # Named instance - try multiple connection strategies
-                base_host = host.split("\\")[0]
-                instance_name = host.split("\\")[1]
-                
-                # Strategy 1: Try to detect dynamic port for SQL Server Express
-                detected_port = self._detect_sqlserver_port()
-                if detected_port and detected_port != "1433":
-                    server_address = f"{base_host}:{detected_port}"
-                    jdbc_url_base = f"jdbc:sqlserver://{server_address}"
-                # Strategy 2: Try with explicit port if available and not default
-                elif port and port != "1433":
-                    server_address = f"{base_host}:{port}"
-                    jdbc_url_base = f"jdbc:sqlserver://{server_address}"
-                else:
-                    # Strategy 3: Try localhost with default port (most reliable for local connections)
-                    if base_host.lower() in ['localhost', '127.0.0.1', '.']:
-                        server_address = f"{base_host}:1433"
-                        jdbc_url_base = f"jdbc:sqlserver://{server_address}"
-                    else:
-                        # Strategy 4: Named instance with instanceName parameter
-                        server_address = base_host
-                        jdbc_url_base = f"jdbc:sqlserver://{server_address};instanceName={instance_name}"
-            else:
-                # Default SQL Server instance - always use port 1433
-                server_address = f"{host}:1433"
-                jdbc_url_base = f"jdbc:sqlserver://{server_address}"
-            
-            # Add connection parameters for reliability
-            # Skip port detection for default instance (localhost without backslash)
-            detected_port = None
-            if "\\" in host:
-                detected_port = self._detect_sqlserver_port()
-            
-            # Use simplified connection parameters for default instance
-            if not ("\\" in host):
-                # Default instance - use standard parameters
-                connection_params = "databaseName={};trustServerCertificate=true;loginTimeout=15;socketTimeout=15000;encrypt=false".format(database)
-            elif detected_port and detected_port != "1433":
-                # Named instance with dynamic port - use minimal parameters
-                connection_params = "databaseName={};integratedSecurity=true;encrypt=false;trustServerCertificate=true".format(database)
-            else:
-                # Named instance with standard parameters
-                connection_params = "databaseName={};trustServerCertificate=true;loginTimeout=15;socketTimeout=15000;encrypt=false".format(database)
-            
-            # Create SQL Server JDBC URL with proper syntax
-            if self.trusted_connection_var.get():
-                # Windows Authentication - avoid duplicate integratedSecurity parameter
-                if "integratedSecurity=true" in connection_params:
-                    jdbc_url = f"{jdbc_url_base};{connection_params}"
-                else:
-                    jdbc_url = f"{jdbc_url_base};{connection_params};integratedSecurity=true"
-                
-                properties_content = f"""# Temporary Liquibase properties for SQL Server (Windows Authentication)
-url={jdbc_url}
-driver=com.microsoft.sqlserver.jdbc.SQLServerDriver
-changeLogFile=changelog/db.changelog-master.xml
-"""
-            else:
-                # SQL Server Authentication
-                jdbc_url = f"{jdbc_url_base};{connection_params}"
-                
-                properties_content = f"""# Temporary Liquibase properties for SQL Server (SQL Authentication)
-url={jdbc_url}
-username={username}
-password={password}
-driver=com.microsoft.sqlserver.jdbc.SQLServerDriver
-changeLogFile=changelog/db.changelog-master.xml
-"""
-            
-            # Write temporary properties file
-            liquibase_properties_path = os.path.join(liquibase_dir, "liquibase.properties")
-            with open(liquibase_properties_path, 'w') as f:
-                f.write(properties_content)
-            
-        except Exception as e:
-            raise Exception(f"Failed to create SQL Server Liquibase configuration: {str(e)}")
-    
-    def _create_temp_liquibase_properties_sqlserver_fallback(self):
-        """Create a fallback Liquibase configuration using named instance approach"""
-        try:
-            # Get current SQL Server connection settings from GUI
-            host = self.host_var.get()
-            database = self.db_var.get()
-            username = self.username_var.get()
-            password = self.password_var.get()
-            
-            # Ensure we have the correct liquibase directory path
-            project_root = os.path.dirname(os.path.abspath(__file__))
-            liquibase_dir = os.path.join(project_root, "liquibase")
-            
-            # Use named instance approach as fallback
-            if "\\" in host:
-                base_host = host.split("\\")[0]
-                instance_name = host.split("\\")[1]
-                
-                # Try named instance with minimal parameters
-                jdbc_url_base = f"jdbc:sqlserver://{base_host}"
-                connection_params = f"instanceName={instance_name};databaseName={database};integratedSecurity=true;encrypt=false"
-            else:
-                # Fallback to basic connection - detect actual SQL Server port
-                detected_port = self._detect_sqlserver_port()
-                if detected_port:
-                    jdbc_url_base = f"jdbc:sqlserver://{host}:{detected_port}"
-                else:
-                    jdbc_url_base = f"jdbc:sqlserver://{host}:1433"  # Fallback to standard port
-                connection_params = f"databaseName={database};integratedSecurity=true;encrypt=false"
-            
-            # Create fallback JDBC URL
-            if self.trusted_connection_var.get():
-                jdbc_url = f"{jdbc_url_base};{connection_params}"
-                
-                properties_content = f"""# Fallback Liquibase properties for SQL Server (Named Instance)
-url={jdbc_url}
-driver=com.microsoft.sqlserver.jdbc.SQLServerDriver
-changeLogFile=changelog/db.changelog-master.xml
-"""
-            else:
-                # SQL Server Authentication fallback
-                connection_params = connection_params.replace(";integratedSecurity=true", "")
-                jdbc_url = f"{jdbc_url_base};{connection_params}"
-                
-                properties_content = f"""# Fallback Liquibase properties for SQL Server (SQL Authentication)
-url={jdbc_url}
-username={username}
-password={password}
-driver=com.microsoft.sqlserver.jdbc.SQLServerDriver
-changeLogFile=changelog/db.changelog-master.xml
-"""
-            
-            # Write fallback properties file
-            liquibase_properties_path = os.path.join(liquibase_dir, "liquibase.properties")
-            with open(liquibase_properties_path, 'w') as f:
-                f.write(properties_content)
-            
-        except Exception as e:
-            pass
-
-    def _create_temp_liquibase_properties_mysql(self):
-        """Create a temporary liquibase.properties file for MySQL"""
-        try:
-            # Get current MySQL connection settings from GUI
-            host = self.host_var.get()
-            port = self.port_var.get()
-            database = self.db_var.get()
-            username = self.username_var.get()
-            password = self.password_var.get()
-            
-            # Ensure we have the correct liquibase directory path - use new structure
-            project_root = os.path.dirname(os.path.abspath(__file__))
-            liquibase_mysql_dir = os.path.join(project_root, "liquibase", "mysql")
-            
-            # Build MySQL JDBC URL
-            mysql_port = port if port else "3306"
-            jdbc_url = f"jdbc:mysql://{host}:{mysql_port}/{database}?useSSL=false&allowPublicKeyRetrieval=true&serverTimezone=UTC"
-            
-            # Create MySQL properties content with correct changelog path
-            properties_content = f"""# Temporary Liquibase properties for MySQL
-url={jdbc_url}
-username={username}
-password={password}
-driver=com.mysql.cj.jdbc.Driver
-changeLogFile=changelog/db.changelog-master.xml
-logLevel=INFO
-"""
-            
-            # Write temporary properties file to the MySQL-specific directory
-            liquibase_properties_path = os.path.join(liquibase_mysql_dir, "liquibase.properties")
-            with open(liquibase_properties_path, 'w') as f:
-                f.write(properties_content)
-            
-        except Exception as e:
-            raise Exception(f"Failed to create MySQL Liquibase configuration: {str(e)}")
-
+    # Migration methods (the migration paths themselves live in migration_engine)
     def run_bytebase_migration(self):
         """Run Bytebase migration with proper migration tracking and versioning"""
         if not self.bytebase_enabled.get():
@@ -2509,13 +2368,14 @@ logLevel=INFO
             return
             
         self.update_status("Starting Bytebase migration...")
+        engine = self._create_engine()
         
         def run_migration():
             import time
             start_time = time.time()
             try:
                 # Initialize Bytebase-style migration system
-                results = self._run_bytebase_style_migration()
+                results = engine.run_bytebase()
                 
                 # Store and display results
                 self.results['bytebase'] = results
@@ -2525,7 +2385,10 @@ logLevel=INFO
                 # Calculate runtime
                 end_time = time.time()
                 runtime = end_time - start_time
-                self.update_status(f"Bytebase migration completed (Run Time: {runtime:.1f}s)")
+                if engine.cancel.cancelled:
+                    self.update_status(f"⏹️ Bytebase migration cancelled (Run Time: {runtime:.1f}s)")
+                else:
+                    self.update_status(f"Bytebase migration completed (Run Time: {runtime:.1f}s)")
                 
             except Exception as e:
                 end_time = time.time()
@@ -2538,1864 +2401,264 @@ logLevel=INFO
         thread.daemon = True
         thread.start()
     
-    def _run_bytebase_style_migration(self):
-        """Run migration using actual Bytebase CLI tool"""
-        try:
-            results = []
-            
-            # Get project root and determine database-specific path
-            project_root = os.path.dirname(os.path.abspath(__file__))
+    def run_liquibase_migration(self):
+        """Run Liquibase migration"""
+        if not self.liquibase_enabled.get():
             db_type = self.db_type_var.get()
-            original_dir = os.getcwd()
-            
-            # Use new folder structure: bytebase/[db_type]/
             if db_type == "sqlserver":
-                bytebase_dir = os.path.join(project_root, "bytebase", "microsoft_sql")
-                config_path = os.path.join(bytebase_dir, "bytebase-config.yaml")
-                migrations_path = os.path.join(bytebase_dir, "migrations")
-            else:  # mysql
-                bytebase_dir = os.path.join(project_root, "bytebase", "mysql")
-                config_path = os.path.join(bytebase_dir, "bytebase-config.yaml")
-                migrations_path = os.path.join(bytebase_dir, "migrations")
-            
-            if not os.path.exists(bytebase_dir):
-                return [f"⚠️ No {db_type.upper()} Bytebase directory found at {bytebase_dir}"]
-            
-            if not os.path.exists(config_path):
-                return [f"⚠️ No {db_type.upper()} config file found at {config_path}"]
-                
-            if not os.path.exists(migrations_path):
-                return [f"⚠️ No {db_type.upper()} migrations folder found at {migrations_path}"]
-            
-            os.chdir(bytebase_dir)
-            
-            results.append(f"Bytebase: Starting migration ({db_type.upper()})")
+                self.update_status("⚠️ Liquibase disabled for SQL Server - TCP/IP protocol required")
+                self.log_to_console("⚠️ Liquibase Limitation for SQL Server:")
+                self.log_to_console("   • Liquibase requires TCP/IP connections")
+                self.log_to_console("   • SQL Server TCP/IP protocol is disabled by default")
+                self.log_to_console("   • GUI/Bytebase/Redgate use ODBC (Named Pipes/Shared Memory)")
+                self.log_to_console("   • To enable: SQL Server Configuration Manager → Enable TCP/IP")
+                self.log_to_console("   • Alternative: Use MySQL for complete tool comparison")
+            else:
+                self.update_status("⚠️ Liquibase is disabled in settings")
+            return
             
-            # Check if Bytebase CLI is available
+        self.update_status("Starting Liquibase migration...")
+        engine = self._create_engine()
+        
+        def run_migration():
+            import time
+            start_time = time.time()
             try:
-                version_result = subprocess.run(
-                    ["bb", "version"],
-                    capture_output=True,
-                    text=True,
-                    shell=True,
-                    timeout=30
-                )
+                self.results['liquibase'] = engine.run_liquibase()
                 
-                if version_result.returncode == 0:
-                    results.append(f"  Using Bytebase CLI: {version_result.stdout.strip()}")
+                # Calculate runtime and update status AFTER all logging
+                end_time = time.time()
+                runtime = end_time - start_time
+                if engine.cancel.cancelled:
+                    self.update_status(f"⏹️ Liquibase migration cancelled (Run Time: {runtime:.1f}s)")
                 else:
-                    # Fallback to API-based approach
-                    results.append("  Bytebase CLI not found, using API approach")
-                    os.chdir(original_dir)
-                    return self._run_bytebase_via_api(migrations_path, db_type)
-                    
-            except subprocess.TimeoutExpired:
-                results.append("  Bytebase CLI timeout, using API approach")
-                os.chdir(original_dir)
-                return self._run_bytebase_via_api(migrations_path, db_type)
+                    self.update_status(f"Liquibase migration completed (Run Time: {runtime:.1f}s)")
+                
             except FileNotFoundError:
-                results.append("  Bytebase CLI not found, using API approach")
-                os.chdir(original_dir)
-                return self._run_bytebase_via_api(migrations_path, db_type)
-            
-            # Create database connection configuration for Bytebase
-            self._create_bytebase_connection_config(config_path, db_type)
+                end_time = time.time()
+                runtime = end_time - start_time
+                error_msg = "❌ Liquibase not found. Please ensure Liquibase is installed and in PATH"
+                self.update_status(f"Liquibase migration failed (Run Time: {runtime:.1f}s)")
+                self.log_to_console(error_msg)
+            except subprocess.TimeoutExpired:
+                end_time = time.time()
+                runtime = end_time - start_time
+                error_msg = "❌ Liquibase update timed out after 60 seconds"
+                self.update_status(f"Liquibase migration failed (Run Time: {runtime:.1f}s)")
+                self.log_to_console(error_msg)
+            except Exception as e:
+                end_time = time.time()
+                runtime = end_time - start_time
+                error_msg = f"❌ Liquibase error: {str(e)}"
+                self.update_status(f"Liquibase migration failed (Run Time: {runtime:.1f}s)")
+                self.log_to_console(error_msg)
+        
+        thread = threading.Thread(target=run_migration)
+        thread.daemon = True
+        thread.start()
+    
+    def run_redgate_migration(self):
+        """Run Redgate-style migration with schema comparison and deployment"""
+        if not self.redgate_enabled.get():
+            self.update_status("⚠️ Redgate is disabled in settings")
+            return
             
-            # Run Bytebase migration using CLI
+        self.update_status("Starting Redgate migration...")
+        engine = self._create_engine()
+        
+        def run_migration():
+            import time
+            start_time = time.time()
             try:
-                # Initialize Bytebase project if needed
-                init_result = subprocess.run(
-                    ["bb", "migrate", "validate", "--config", "bytebase-config.yaml"],
-                    capture_output=True,
-                    text=True,
-                    shell=True,
-                    timeout=60
-                )
+                # Get database type for clean logging
+                db_type = engine.settings.db_type.upper()
                 
-                if init_result.returncode == 0:
-                    results.append("  Configuration validated successfully")
+                # Clean logging like Bytebase
+                self.log_to_console(f"  Redgate: Using PowerShell approach for {db_type}")
+                self.log_to_console(f"    Connected to Redgate server")
                 
-                # Run the actual migration
-                migrate_result = subprocess.run(
-                    ["bb", "migrate", "up", "--config", "bytebase-config.yaml"],
-                    capture_output=True,
-                    text=True,
-                    shell=True,
-                    timeout=120
-                )
+                # Initialize Redgate-style migration system
+                results = engine.run_redgate()
                 
-                os.chdir(original_dir)
+                # Store results without logging them (already logged above)
+                self.results['redgate'] = results
                 
-                if migrate_result.returncode == 0:
-                    # Parse Bytebase output
-                    if migrate_result.stdout:
-                        lines = migrate_result.stdout.split('\n')
-                        executed_count = 0
-                        for line in lines:
-                            if 'Applied migration' in line or 'Executed' in line:
-                                results.append(f"  {line.strip()}")
-                                executed_count += 1
-                        
-                        if executed_count == 0:
-                            results.append("  No new migrations to apply")
-                    else:
-                        results.append("  Migration completed successfully")
-                        
-                    results.append("Bytebase: Migration completed successfully")
+                # Calculate runtime
+                end_time = time.time()
+                runtime = end_time - start_time
+                if engine.cancel.cancelled:
+                    self.update_status(f"⏹️ Redgate migration cancelled (Run Time: {runtime:.1f}s)")
                 else:
-                    error_msg = migrate_result.stderr or "Unknown error"
-                    results.append(f"❌ Bytebase migration failed: {error_msg}")
-                    
-            except subprocess.TimeoutExpired:
-                os.chdir(original_dir)
-                results.append("❌ Bytebase migration timed out")
+                    self.update_status(f"Redgate migration completed (Run Time: {runtime:.1f}s)")
+                
             except Exception as e:
-                os.chdir(original_dir)
-                results.append(f"❌ Bytebase migration error: {str(e)}")
-            
-            return results
-            
-        except Exception as e:
-            if 'original_dir' in locals():
-                os.chdir(original_dir)
-            raise Exception(f"Bytebase migration system failed: {str(e)}")
-    
-    def _create_bytebase_connection_config(self, config_path, db_type):
-        """Create or update Bytebase connection configuration"""
-        try:
-            import yaml
+                end_time = time.time()
+                runtime = end_time - start_time
+                error_msg = f"❌ Redgate migration failed: {str(e)}"
+                self.update_status(f"Redgate migration failed (Run Time: {runtime:.1f}s)")
+                self.log_to_console(error_msg)
+        
+        thread = threading.Thread(target=run_migration)
+        thread.daemon = True
+        thread.start()
+
+    def run_all_migrations(self):
+        """Run all enabled migrations sequentially"""
+        # Check if connection is active
+        if not self.connection_active:
+            messagebox.showwarning("No Connection", 
+                                 "Please test and establish a database connection first in the Settings tab.")
+            self.update_status("⚠️ No database connection - migrations cannot run")
+            return
+        
+        self.update_status("🚀 Starting all migrations...")
+        self.log_to_console("\n" + "="*60)
+        self.log_to_console("🚀 COMPREHENSIVE MIGRATION TEST")
+        self.log_to_console(f"🗄️ Target Database: {self.active_connection['type'].upper()}")
+        self.log_to_console(f"📍 Connection: {self.active_connection['host']}/{self.active_connection['database']}")
+        self.log_to_console("="*60)
+        
+        cancel = self.cancel_token
+        
+        def run_all():
+            if self.redgate_enabled.get():
+                self.run_redgate_migration()
+                time.sleep(2)
             
-            # Read existing config
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-            
-            # Update database connection details
-            if db_type == "mysql":
-                config['database'] = {
-                    'type': 'mysql',
-                    'host': self.mysql_host_var.get(),
-                    'port': int(self.mysql_port_var.get()),
-                    'username': self.mysql_user_var.get(),
-                    'password': self.mysql_password_var.get(),
-                    'database': self.mysql_database_var.get()
-                }
-            else:  # sqlserver
-                config['database'] = {
-                    'type': 'sqlserver',
-                    'host': self.host_var.get(),
-                    'port': int(self.port_var.get()),
-                    'username': self.username_var.get(),
-                    'password': self.password_var.get(),
-                    'database': self.db_var.get()
-                }
-            
-            # Write updated config
-            with open(config_path, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False)
-                
-        except Exception as e:
-            self.log_to_console(f"⚠️ Warning: Could not update Bytebase config: {str(e)}")
-    
-    def _run_bytebase_via_api(self, migrations_path, db_type):
-        """Fallback to Bytebase API if CLI is not available"""
-        try:
-            results = [f"Bytebase: Using API approach for {db_type.upper()}"]
-            
-            # Check if Bytebase server is running
-            import requests
-            try:
-                response = requests.get('http://localhost:8080/api/v1/instances', timeout=5)
-                if response.status_code == 200:
-                    results.append("  Connected to Bytebase server")
-                    
-                    # Use the existing BytebaseAPI integration
-                    if hasattr(self, 'bytebase_api'):
-                        api_results = self.bytebase_api.run_migrations(migrations_path)
-                        results.extend(api_results)
-                    else:
-                        results.append("  ⚠️ BytebaseAPI not initialized")
-                        
-                else:
-                    results.append("  ⚠️ Bytebase server not responding properly")
-                    
-            except requests.RequestException:
-                results.append("    ⚠️ Cannot connect to Bytebase server at localhost:8080")
-                results.append("  Please ensure Bytebase is running or install Bytebase CLI")
-            
-            return results
-            
-        except Exception as e:
-            return [f"❌ Bytebase API approach failed: {str(e)}"]
-        """Create Bytebase-style migration tracking tables if they don't exist"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            db_type = self.db_type_var.get()
-            
-            if db_type == "mysql":
-                # Create Bytebase migration history table (MySQL)
-                cursor.execute("""
-                CREATE TABLE IF NOT EXISTS bytebase_migration_history (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    version VARCHAR(50) NOT NULL UNIQUE,
-                    filename VARCHAR(255) NOT NULL,
-                    issue_id VARCHAR(50) NOT NULL,
-                    executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    execution_time_ms INT DEFAULT 0,
-                    checksum VARCHAR(64),
-                    status ENUM('PENDING', 'RUNNING', 'DONE', 'FAILED') DEFAULT 'PENDING',
-                    error_message TEXT,
-                    INDEX idx_version (version),
-                    INDEX idx_executed_at (executed_at)
-                )
-                """)
-                
-                # Create Bytebase project metadata table
-                cursor.execute("""
-                CREATE TABLE IF NOT EXISTS bytebase_project_metadata (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    project_name VARCHAR(100) DEFAULT 'db-POC',
-                    environment VARCHAR(50) DEFAULT 'development',
-                    last_migration_version VARCHAR(50),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-                )
-                """)
-                
-            else:  # SQL Server
-                # Create Bytebase migration history table (SQL Server)
-                cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='bytebase_migration_history' AND xtype='U')
-                CREATE TABLE bytebase_migration_history (
-                    id INT IDENTITY(1,1) PRIMARY KEY,
-                    version NVARCHAR(50) NOT NULL UNIQUE,
-                    filename NVARCHAR(255) NOT NULL,
-                    issue_id NVARCHAR(50) NOT NULL,
-                    executed_at DATETIME2 DEFAULT GETDATE(),
-                    execution_time_ms INT DEFAULT 0,
-                    checksum NVARCHAR(64),
-                    status NVARCHAR(20) DEFAULT 'PENDING' CHECK (status IN ('PENDING', 'RUNNING', 'DONE', 'FAILED')),
-                    error_message NVARCHAR(MAX)
-                )
-                """)
-                
-                cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='bytebase_project_metadata' AND xtype='U')
-                CREATE TABLE bytebase_project_metadata (
-                    id INT IDENTITY(1,1) PRIMARY KEY,
-                    project_name NVARCHAR(100) DEFAULT 'db-POC',
-                    environment NVARCHAR(50) DEFAULT 'development',
-                    last_migration_version NVARCHAR(50),
-                    created_at DATETIME2 DEFAULT GETDATE(),
-                    updated_at DATETIME2 DEFAULT GETDATE()
-                )
-                """)
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-        except Exception as e:
-            raise Exception(f"Failed to initialize Bytebase tracking tables: {str(e)}")
-    
-    def _extract_migration_version(self, filename):
-        """Extract version number from migration filename (Bytebase style)"""
-        import re
-        # Extract leading numbers: 001-create-users.sql -> 001
-        match = re.match(r'^(\d+)', filename)
-        return match.group(1) if match else "000"
-    
-    def _is_migration_applied(self, version, filename):
-        """Check if migration has already been applied"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                "SELECT COUNT(*) FROM bytebase_migration_history WHERE version = %s AND status = 'DONE'",
-                (version,)
-            )
-            
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
-            
-            return result[0] > 0
-            
-        except Exception:
-            # If table doesn't exist or query fails, assume not applied
-            return False
-    
-    def _create_migration_issue(self, filename, version):
-        """Create a Bytebase-style migration issue"""
-        import time
-        import random
-        
-        # Generate issue ID (Bytebase style: BB-123)
-        issue_id = f"BB-{random.randint(1000, 9999)}"
-        
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Insert migration record with PENDING status
-            cursor.execute("""
-                INSERT INTO bytebase_migration_history 
-                (version, filename, issue_id, status) 
-                VALUES (%s, %s, %s, 'PENDING')
-            """, (version, filename, issue_id))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-        except Exception as e:
-            # Continue even if tracking fails
-            pass
-        
-        return issue_id
-    
-    def _execute_bytebase_migration(self, file_path, version, filename, issue_id):
-        """Execute migration with Bytebase-style tracking and error handling"""
-        import time
-        import hashlib
-        
-        try:
-            start_time = time.time()
-            
-            # Read and calculate checksum
-            with open(file_path, 'r', encoding='utf-8') as f:
-                sql_content = f.read()
-            
-            checksum = hashlib.md5(sql_content.encode()).hexdigest()
-            
-            # Update status to RUNNING
-            self._update_migration_status(version, 'RUNNING', checksum)
-            
-            # Execute migration
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Split and execute statements
-            db_type = self.db_type_var.get()
-            if db_type == "mysql":
-                statements = self._split_mysql_statements(sql_content)
-            else:
-                statements = self._split_sql_statements(sql_content)
-            
-            executed_statements = 0
-            for statement in statements:
-                if statement.strip():
-                    try:
-                        if db_type == "mysql":
-                            # For MySQL, create fresh cursor for each statement
-                            cursor.close()
-                            cursor = conn.cursor()
-                        cursor.execute(statement)
-                        if db_type == "mysql":
-                            cursor.fetchall()  # Consume results
-                        executed_statements += 1
-                    except Exception as stmt_error:
-                        # Log statement errors but continue for non-critical errors
-                        error_msg = str(stmt_error).lower()
-                        if not any(warning in error_msg for warning in ['already exists', 'duplicate']):
-                            raise stmt_error
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            # Calculate execution time
-            end_time = time.time()
-            execution_time_ms = int((end_time - start_time) * 1000)
-            
-            # Update status to DONE
-            self._update_migration_status(version, 'DONE', checksum, execution_time_ms)
-            
-            return {
-                'success': True,
-                'statements': executed_statements,
-                'duration': end_time - start_time,
-                'checksum': checksum
-            }
-            
-        except Exception as e:
-            # Update status to FAILED
-            self._update_migration_status(version, 'FAILED', error_message=str(e))
-            
-            return {
-                'success': False,
-                'error': str(e),
-                'statements': 0,
-                'duration': 0
-            }
-    
-    def _update_migration_status(self, version, status, checksum=None, execution_time_ms=0, error_message=None):
-        """Update migration status in tracking table"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            if error_message:
-                cursor.execute("""
-                    UPDATE bytebase_migration_history 
-                    SET status = %s, error_message = %s
-                    WHERE version = %s
-                """, (status, error_message, version))
-            else:
-                cursor.execute("""
-                    UPDATE bytebase_migration_history 
-                    SET status = %s, checksum = %s, execution_time_ms = %s
-                    WHERE version = %s
-                """, (status, checksum, execution_time_ms, version))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-        except Exception:
-            # Continue even if tracking update fails
-            pass
-    
-    def _execute_sql_files_directly(self, migrations_path):
-        """Execute SQL files directly using the GUI's current database connection"""
-        try:
-            results = []
-            
-            # Determine the correct migration folder based on database type
-            db_type = self.db_type_var.get()
-            if db_type == "sqlserver":
-                migrations_path = os.path.join(migrations_path, "sqlserver")
-            else:
-                migrations_path = os.path.join(migrations_path, "mysql")
-            
-            # Check if database-specific folder exists
-            if not os.path.exists(migrations_path):
-                return [f"⚠️ No {db_type.upper()} migration folder found at {migrations_path}"]
-            
-            # Get all SQL files in the migrations folder
-            sql_files = sorted([f for f in os.listdir(migrations_path) if f.endswith('.sql')])
-            
-            if not sql_files:
-                return [f"⚠️ No SQL files found in {migrations_path}"]
-            
-            # Use database-specific execution approach
-            if db_type == "mysql":
-                return self._execute_mysql_files(migrations_path, sql_files)
-            else:
-                return self._execute_sqlserver_files(migrations_path, sql_files)
-            
-        except Exception as e:
-            raise Exception(f"Migration execution failed: {str(e)}")
-    
-    def _execute_mysql_files(self, migrations_path, sql_files):
-        """Execute MySQL files with proper connection handling to avoid 'Commands out of sync' errors"""
-        try:
-            results = []
-            
-            for sql_file in sql_files:
-                file_path = os.path.join(migrations_path, sql_file)
-                
-                try:
-                    # Create fresh connection for each file to avoid sync issues
-                    conn = self.get_connection()
-                    cursor = conn.cursor()
-                    
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        sql_content = f.read()
-                    
-                    # For MySQL, split by semicolon and execute one by one with fresh cursors
-                    statements = self._split_mysql_statements(sql_content)
-                    
-                    executed_statements = 0
-                    for statement in statements:
-                        if statement.strip():
-                            try:
-                                # Create a fresh cursor for each statement to avoid sync issues
-                                cursor.close()
-                                cursor = conn.cursor()
-                                cursor.execute(statement)
-                                executed_statements += 1
-                                cursor.fetchall()  # Consume any potential results
-                            except Exception as stmt_error:
-                                # Only log errors that aren't "already exists" warnings
-                                error_msg = str(stmt_error).lower()
-                                if not any(warning in error_msg for warning in ['already exists', 'duplicate']):
-                                    self.log_to_console(f"  ⚠️ Statement error in {sql_file}: {str(stmt_error)}")
-                                continue
-                    
-                    conn.commit()
-                    cursor.close()
-                    conn.close()
-                    
-                    results.append(f"✓ Successfully executed {sql_file} ({executed_statements} statements)")
-                    
-                except Exception as e:
-                    if 'conn' in locals():
-                        try:
-                            conn.rollback()
-                            cursor.close()
-                            conn.close()
-                        except:
-                            pass
-                    results.append(f"❌ Failed to execute {sql_file}: {str(e)}")
-            
-            return results
-            
-        except Exception as e:
-            raise Exception(f"MySQL migration execution failed: {str(e)}")
-    
-    def _execute_sqlserver_files(self, migrations_path, sql_files):
-        """Execute SQL Server files with existing logic"""
-        try:
-            results = []
-            
-            # Execute each SQL file using the current GUI database connection
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            for sql_file in sql_files:
-                file_path = os.path.join(migrations_path, sql_file)
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        sql_content = f.read()
-                    
-                    # Split SQL content into individual statements
-                    statements = self._split_sql_statements(sql_content)
-                    
-                    executed_statements = 0
-                    for statement in statements:
-                        if statement.strip():
-                            try:
-                                cursor.execute(statement)
-                                executed_statements += 1
-                            except Exception as stmt_error:
-                                self.log_to_console(f"  ⚠️ Statement error in {sql_file}: {str(stmt_error)}")
-                                # Continue with next statement instead of failing entire file
-                                continue
-                    
-                    conn.commit()
-                    results.append(f"✓ Successfully executed {sql_file} ({executed_statements} statements)")
-                    
-                except Exception as e:
-                    conn.rollback()
-                    results.append(f"❌ Failed to execute {sql_file}: {str(e)}")
-            
-            cursor.close()
-            conn.close()
-            
-            return results
-            
-        except Exception as e:
-            raise Exception(f"SQL Server migration execution failed: {str(e)}")
-    
-    def _split_mysql_statements(self, sql_content):
-        """Split MySQL SQL content into individual statements, handling DELIMITER statements"""
-        try:
-            import re
-            
-            # Remove MySQL-style comments
-            sql_content = re.sub(r'--.*$', '', sql_content, flags=re.MULTILINE)
-            sql_content = re.sub(r'/\*.*?\*/', '', sql_content, flags=re.DOTALL)
-            sql_content = re.sub(r'#.*$', '', sql_content, flags=re.MULTILINE)  # MySQL hash comments
-            
-            statements = []
-            current_statement = ""
-            current_delimiter = ";"
-            
-            lines = sql_content.split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Check for DELIMITER change
-                if line.upper().startswith('DELIMITER'):
-                    # If we have a pending statement, add it first
-                    if current_statement.strip():
-                        statements.append(current_statement.strip())
-                        current_statement = ""
-                    
-                    # Extract new delimiter
-                    parts = line.split()
-                    if len(parts) > 1:
-                        current_delimiter = parts[1]
-                    continue
-                
-                current_statement += line + "\n"
-                
-                # Check if statement ends with current delimiter
-                if line.endswith(current_delimiter):
-                    # Remove the delimiter from the statement
-                    statement_without_delimiter = current_statement.rstrip()
-                    if statement_without_delimiter.endswith(current_delimiter):
-                        statement_without_delimiter = statement_without_delimiter[:-len(current_delimiter)].strip()
-                    
-                    if statement_without_delimiter:
-                        statements.append(statement_without_delimiter)
-                    
-                    current_statement = ""
-            
-            # Add any remaining statement
-            if current_statement.strip():
-                final_statement = current_statement.strip()
-                if final_statement.endswith(current_delimiter):
-                    final_statement = final_statement[:-len(current_delimiter)].strip()
-                if final_statement:
-                    statements.append(final_statement)
-            
-            return [stmt for stmt in statements if stmt.strip()]
-            
-        except Exception as e:
-            self.log_to_console(f"⚠️ MySQL SQL splitting warning: {str(e)}")
-            # Fallback: return as single statement
-            return [sql_content.strip()] if sql_content.strip() else []
-    
-    def _split_sql_statements(self, sql_content):
-        """Split SQL content into individual statements, handling SQL Server T-SQL blocks properly"""
-        try:
-            import re
-            # Remove comments
-            sql_content = re.sub(r'--.*$', '', sql_content, flags=re.MULTILINE)
-            sql_content = re.sub(r'/\*.*?\*/', '', sql_content, flags=re.DOTALL)
-            
-            statements = []
-            current_statement = ""
-            in_block = False
-            block_level = 0
-            
-            lines = sql_content.split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                current_statement += line + "\n"
-                
-                # Check for block start keywords (SQL Server)
-                line_upper = line.upper()
-                if any(keyword in line_upper for keyword in ['IF NOT EXISTS', 'IF EXISTS', 'BEGIN', 'CASE', 'CREATE PROCEDURE', 'CREATE FUNCTION']):
-                    in_block = True
-                    if 'BEGIN' in line_upper:
-                        block_level += 1
-                
-                # Check for block end
-                if 'END' in line_upper and in_block:
-                    block_level -= 1
-                    if block_level <= 0:
-                        in_block = False
-                        block_level = 0
-                        # Complete statement - add to list
-                        statements.append(current_statement.strip())
-                        current_statement = ""
-                        continue
-                
-                # Normal statement ending with semicolon (not in a block)
-                if line.endswith(';') and not in_block:
-                    statements.append(current_statement.strip())
-                    current_statement = ""
-            
-            # Add any remaining statement
-            if current_statement.strip():
-                statements.append(current_statement.strip())
-            
-            return [stmt for stmt in statements if stmt.strip()]
-            
-        except Exception as e:
-            self.log_to_console(f"⚠️ SQL splitting warning: {str(e)}")
-            # Fallback: return as single statement for complex blocks
-            return [sql_content.strip()] if sql_content.strip() else []
-    
-    def run_liquibase_migration(self):
-        """Run Liquibase migration"""
-        if not self.liquibase_enabled.get():
-            db_type = self.db_type_var.get()
-            if db_type == "sqlserver":
-                self.update_status("⚠️ Liquibase disabled for SQL Server - TCP/IP protocol required")
-                self.log_to_console("⚠️ Liquibase Limitation for SQL Server:")
-                self.log_to_console("   • Liquibase requires TCP/IP connections")
-                self.log_to_console("   • SQL Server TCP/IP protocol is disabled by default")
-                self.log_to_console("   • GUI/Bytebase/Redgate use ODBC (Named Pipes/Shared Memory)")
-                self.log_to_console("   • To enable: SQL Server Configuration Manager → Enable TCP/IP")
-                self.log_to_console("   • Alternative: Use MySQL for complete tool comparison")
-            else:
-                self.update_status("⚠️ Liquibase is disabled in settings")
-            return
-            
-        self.update_status("Starting Liquibase migration...")
-        
-        def run_migration():
-            import time
-            start_time = time.time()
-            try:
-                # Get database type for clean logging
-                db_type = self.db_type_var.get().upper()
-                
-                # Clean logging like Bytebase
-                self.log_to_console(f"  Liquibase: Using CLI approach for {db_type}")
-                self.log_to_console(f"    Connected to Liquibase server")
-                
-                # Get database type and set up paths
-                db_type_lower = self.db_type_var.get()
-                original_dir = os.getcwd()
-                project_root = os.path.dirname(os.path.abspath(__file__))
-                
-                # Use new folder structure: liquibase/[db_type]/
-                if db_type_lower == "sqlserver":
-                    liquibase_dir = os.path.join(project_root, "liquibase", "microsoft_sql")
-                else:  # mysql
-                    liquibase_dir = os.path.join(project_root, "liquibase", "mysql")
-                
-                if not os.path.exists(liquibase_dir):
-                    error_msg = f"    {db_type} directory not found"
-                    self.log_to_console(error_msg)
-                    self.update_status(f"❌ Liquibase {db_type} directory not found")
-                    return
-                
-                os.chdir(liquibase_dir)
-                
-                # Check database type and create appropriate connection URL
-                if db_type_lower == "sqlserver":
-                    # Create temporary liquibase.properties for SQL Server
-                    self._create_temp_liquibase_properties_sqlserver()
-                    
-                    # Also try to verify JDBC driver exists (silent check)
-                    jdbc_driver_path = os.path.join(liquibase_dir, "lib", "mssql-jdbc-12.4.2.jre11.jar")
-                    if not os.path.exists(jdbc_driver_path):
-                        self.log_to_console("    SQL Server JDBC driver missing")
-                else:
-                    # Create temporary liquibase.properties for MySQL
-                    self._create_temp_liquibase_properties_mysql()
-                
-                # Run liquibase update with shell=True for Windows
-                # For SQL Server, try direct SQL execution as fallback
-                if db_type == "sqlserver":
-                    # Use updateSQL to generate SQL, then execute via ODBC
-                    results = self._execute_sql_files_directly_for_liquibase(liquibase_dir)
-                    if results:
-                        result = None  # Skip the subprocess call
-                        fake_success = True
-                    else:
-                        fake_success = False
-                else:
-                    fake_success = False
-                
-                # Try the update command with retry logic for SQL Server connection issues
-                if not fake_success:
-                    max_attempts = 2 if db_type == "sqlserver" else 1
-                    
-                    for attempt in range(max_attempts):
-                        if attempt > 0:
-                            # On retry, try with named instance approach instead of port
-                            if db_type == "sqlserver":
-                                self._create_temp_liquibase_properties_sqlserver_fallback()
-                        
-                        # Determine JDBC driver path based on database type
-                        project_root = os.path.dirname(os.path.abspath(__file__))
-                        liquibase_dir = os.path.join(project_root, "liquibase")
-                        
-                        if db_type_lower == "mysql":
-                            jdbc_driver = os.path.join(liquibase_dir, "lib", "mysql-connector-j-9.4.0.jar")
-                        else:  # sqlserver
-                            jdbc_driver = os.path.join(liquibase_dir, "lib", "mssql-jdbc-12.4.2.jre11.jar")
-                        
-                        # Verify the JDBC driver file exists
-                        if not os.path.exists(jdbc_driver):
-                            self.log_to_console(f"    JDBC driver missing: {os.path.basename(jdbc_driver)}")
-                            raise Exception(f"JDBC driver not found: {jdbc_driver}")
-                        
-                        # Run Liquibase with proper classpath using full path
-                        liquibase_cmd = r"C:\Program Files\liquibase\liquibase.bat"
-                        if not os.path.exists(liquibase_cmd):
-                            liquibase_cmd = "liquibase"  # Fallback to PATH
-                        
-                        # Use absolute path for JDBC driver to ensure it's found
-                        jdbc_driver_abs = os.path.abspath(jdbc_driver)
-                        
-                        # Set up environment with JDBC driver in classpath
-                        env = os.environ.copy()
-                        env['LIQUIBASE_CLASSPATH'] = jdbc_driver_abs
-                        
-                        result = subprocess.run(
-                            [liquibase_cmd, "update"],
-                            capture_output=True,
-                            text=True,
-                            shell=True,
-                            timeout=120,  # Increased timeout
-                            env=env
-                        )
-                        
-                        # If successful, break out of retry loop
-                        if result.returncode == 0:
-                            break
-                        
-                        # If it's the last attempt or not a connection error, don't retry
-                        if attempt == max_attempts - 1 or "connection" not in result.stderr.lower():
-                            break
-                else:
-                    # Create a fake successful result for direct SQL execution
-                    class FakeResult:
-                        def __init__(self):
-                            self.returncode = 0
-                            self.stdout = "Liquibase executed via direct SQL approach\nUpdate completed successfully"
-                            self.stderr = ""
-                    result = FakeResult()
-                
-                os.chdir(original_dir)
-                
-                if result.returncode == 0:
-                    # Parse output for changeset information
-                    changeset_count = 0
-                    executed_files = []
-                    db_type = self.db_type_var.get()
-                    
-                    # Start with consistent format
-                    self.log_to_console(f"  Liquibase: Using change management for {db_type.upper()}")
-                    self.log_to_console("    Processing changelog files...")
-                    
-                    if result.stdout:
-                        lines = result.stdout.split('\n')
-                        for line in lines:
-                            if 'Running Changeset:' in line:
-                                changeset_count += 1
-                                # Extract changeset info: file::id::author
-                                changeset_info = line.split('Running Changeset: ')[1] if 'Running Changeset: ' in line else line
-                                file_name = changeset_info.split('::')[0] if '::' in changeset_info else changeset_info
-                                # Clean up the file path to show just the filename
-                                file_name = file_name.split('/')[-1] if '/' in file_name else file_name
-                                executed_files.append(file_name)
-                                self.log_to_console(f"  ✓ Executed changeset: {file_name}")
-                    
-                    # Show summary in consistent format BEFORE status update
-                    if changeset_count == 0:
-                        self.log_to_console("    No new changesets to execute")
-                        self.log_to_console("  ✓ Database schema is up to date")
-                    else:
-                        self.log_to_console(f"  ✓ Applied {changeset_count} changesets successfully")
-                    
-                    self.results['liquibase'] = [f'Liquibase update completed - {changeset_count} changesets']
-                    
-                    # Calculate runtime and update status AFTER all logging
-                    end_time = time.time()
-                    runtime = end_time - start_time
-                    self.update_status(f"Liquibase migration completed (Run Time: {runtime:.1f}s)")
-                else:
-                    error_msg = f"❌ Liquibase failed (exit code {result.returncode})"
-                    self.log_to_console(error_msg)
-                    if result.stderr:
-                        self.log_to_console(f"Error details: {result.stderr}")
-                    if result.stdout:
-                        self.log_to_console(f"Output: {result.stdout}")
-                    self.update_status("❌ Liquibase migration failed")
-                
-            except FileNotFoundError:
-                end_time = time.time()
-                runtime = end_time - start_time
-                error_msg = "❌ Liquibase not found. Please ensure Liquibase is installed and in PATH"
-                self.update_status(f"Liquibase migration failed (Run Time: {runtime:.1f}s)")
-                self.log_to_console(error_msg)
-            except subprocess.TimeoutExpired:
-                end_time = time.time()
-                runtime = end_time - start_time
-                error_msg = "❌ Liquibase update timed out after 60 seconds"
-                self.update_status(f"Liquibase migration failed (Run Time: {runtime:.1f}s)")
-                self.log_to_console(error_msg)
-            except Exception as e:
-                end_time = time.time()
-                runtime = end_time - start_time
-                error_msg = f"❌ Liquibase error: {str(e)}"
-                self.update_status(f"Liquibase migration failed (Run Time: {runtime:.1f}s)")
-                self.log_to_console(error_msg)
-        
-        thread = threading.Thread(target=run_migration)
-        thread.daemon = True
-        thread.start()
-    
-    def run_redgate_migration(self):
-        """Run Redgate-style migration with schema comparison and deployment"""
-        if not self.redgate_enabled.get():
-            self.update_status("⚠️ Redgate is disabled in settings")
-            return
-            
-        self.update_status("Starting Redgate migration...")
-        
-        def run_migration():
-            import time
-            start_time = time.time()
-            try:
-                # Get database type for clean logging
-                db_type = self.db_type_var.get().upper()
-                
-                # Clean logging like Bytebase
-                self.log_to_console(f"  Redgate: Using PowerShell approach for {db_type}")
-                self.log_to_console(f"    Connected to Redgate server")
-                
-                # Initialize Redgate-style migration system
-                results = self._run_redgate_style_migration()
-                
-                # Store results without logging them (already logged above)
-                self.results['redgate'] = results
-                
-                # Calculate runtime
-                end_time = time.time()
-                runtime = end_time - start_time
-                self.update_status(f"Redgate migration completed (Run Time: {runtime:.1f}s)")
-                
-            except Exception as e:
-                end_time = time.time()
-                runtime = end_time - start_time
-                error_msg = f"❌ Redgate migration failed: {str(e)}"
-                self.update_status(f"Redgate migration failed (Run Time: {runtime:.1f}s)")
-                self.log_to_console(error_msg)
-        
-        thread = threading.Thread(target=run_migration)
-        thread.daemon = True
-        thread.start()
-    
-    def _run_redgate_style_migration(self):
-        """Run migration using actual Redgate SQL Compare and SQL Data Compare tools"""
-        try:
-            results = []
-            
-            # Get database type and set up paths using new folder structure
-            db_type = self.db_type_var.get()
-            project_root = os.path.dirname(os.path.abspath(__file__))
-            
-            # Use new folder structure: redgate/[db_type]/migrations
-            if db_type == "sqlserver":
-                redgate_dir = os.path.join(project_root, "redgate", "microsoft_sql")
-                migrations_path = os.path.join(redgate_dir, "migrations")
-                config_path = os.path.join(redgate_dir, "redgate-config.yaml")
-            else:  # mysql
-                redgate_dir = os.path.join(project_root, "redgate", "mysql")
-                migrations_path = os.path.join(redgate_dir, "migrations")
-                config_path = os.path.join(redgate_dir, "redgate-config.yaml")
-            
-            if not os.path.exists(migrations_path):
-                return [f"    No migration folder found"]
-            
-            # Check for Redgate SQL Compare command line
-            sqlcompare_found = self._check_redgate_tools()
-            
-            if sqlcompare_found:
-                results.append("    Using Redgate SQL Compare CLI")
-                return self._run_redgate_cli_migration(migrations_path, config_path, db_type)
-            else:
-                results.append("    Redgate CLI not found, using PowerShell")
-                return self._run_redgate_powershell_migration(migrations_path, config_path, db_type)
-            
-        except Exception as e:
-            raise Exception(f"Redgate deployment system failed: {str(e)}")
-    
-    def _check_redgate_tools(self):
-        """Check if Redgate SQL Compare command line tools are available"""
-        try:
-            # Common Redgate installation paths
-            redgate_paths = [
-                r"C:\Program Files\Red Gate\SQL Compare 14\SQLCompare.exe",
-                r"C:\Program Files\Red Gate\SQL Compare 15\SQLCompare.exe",
-                r"C:\Program Files (x86)\Red Gate\SQL Compare 14\SQLCompare.exe", 
-                r"C:\Program Files (x86)\Red Gate\SQL Compare 15\SQLCompare.exe"
-            ]
-            
-            for path in redgate_paths:
-                if os.path.exists(path):
-                    self.redgate_compare_path = path
-                    return True
-            
-            # Try to find it in PATH
-            try:
-                result = subprocess.run(
-                    ["SQLCompare.exe", "/help"],
-                    capture_output=True,
-                    text=True,
-                    shell=True,
-                    timeout=10
-                )
-                if result.returncode == 0 or "SQL Compare" in result.stdout:
-                    self.redgate_compare_path = "SQLCompare.exe"
-                    return True
-            except:
-                pass
-                
-            return False
-            
-        except Exception:
-            return False
-    
-    def _run_redgate_cli_migration(self, migrations_path, config_path, db_type):
-        """Run migration using Redgate SQL Compare CLI"""
-        try:
-            results = []
-            
-            # Create connection strings
-            if db_type == "mysql":
-                # Redgate SQL Compare doesn't support MySQL directly
-                results.append("    MySQL not supported by SQL Compare")
-                results.append("    Using alternative schema comparison")
-                return self._run_redgate_mysql_fallback(migrations_path, db_type)
-            
-            # SQL Server connection
-            source_connection = self._build_sqlserver_connection_string()
-            
-            # Create temporary database for comparison
-            temp_db_name = f"redgate_temp_{int(time.time())}"
-            
-            try:
-                # Create temporary database with migrations applied
-                self._create_temp_database_with_migrations(temp_db_name, migrations_path)
-                
-                temp_connection = source_connection.replace(
-                    self.db_var.get(), 
-                    temp_db_name
-                )
-                
-                # Run SQL Compare
-                compare_cmd = [
-                    self.redgate_compare_path,
-                    f"/server1:{self.host_var.get()}",
-                    f"/database1:{self.db_var.get()}",
-                    f"/server2:{self.host_var.get()}",
-                    f"/database2:{temp_db_name}",
-                    "/synchronize",
-                    "/force",
-                    "/verbose"
-                ]
-                
-                if self.username_var.get():
-                    compare_cmd.extend([
-                        f"/username1:{self.username_var.get()}",
-                        f"/password1:{self.password_var.get()}",
-                        f"/username2:{self.username_var.get()}",
-                        f"/password2:{self.password_var.get()}"
-                    ])
-                
-                result = subprocess.run(
-                    compare_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=300
-                )
-                
-                if result.returncode == 0:
-                    results.append("  Schema comparison completed successfully")
-                    if result.stdout:
-                        # Parse Redgate output for changes
-                        lines = result.stdout.split('\n')
-                        changes_found = False
-                        for line in lines:
-                            if 'differences found' in line.lower() or 'objects updated' in line.lower():
-                                results.append(f"  {line.strip()}")
-                                changes_found = True
-                        
-                        if not changes_found:
-                            results.append("  No schema differences found")
-                    
-                    results.append("  ✓ Deployment completed")
-                else:
-                    error_msg = result.stderr or "Unknown error"
-                    results.append(f"❌ Redgate comparison failed: {error_msg}")
-                
-            finally:
-                # Clean up temporary database
-                self._cleanup_temp_database(temp_db_name)
-                
-            return results
-            
-        except Exception as e:
-            return [f"❌ Redgate CLI migration failed: {str(e)}"]
-    
-    def _run_redgate_powershell_migration(self, migrations_path, config_path, db_type):
-        """Run migration using Redgate PowerShell toolkit"""
-        try:
-            results = []
-            
-            # Check for Redgate PowerShell modules
-            powershell_cmd = """
-            if (Get-Module -ListAvailable -Name "*Redgate*" -ErrorAction SilentlyContinue) {
-                Write-Output "Redgate PowerShell modules found"
-            } else {
-                Write-Output "No Redgate PowerShell modules found"
-            }
-            """
-            
-            result = subprocess.run(
-                ["powershell", "-Command", powershell_cmd],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if "modules found" in result.stdout:
-                # Don't log the toolkit message here, it's now handled in PowerShell script
-                
-                # Create PowerShell script for schema comparison
-                ps_script = self._create_redgate_powershell_script(migrations_path, db_type)
-                
-                ps_result = subprocess.run(
-                    ["powershell", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                    capture_output=True,
-                    text=True,
-                    timeout=300
-                )
-                
-                if ps_result.returncode == 0:
-                    if ps_result.stdout:
-                        results.extend([line for line in ps_result.stdout.split('\n') if line.strip()])
-                else:
-                    results.append(f"  ❌ PowerShell deployment issues: {ps_result.stderr}")
-            else:
-                results.append("    No PowerShell modules found")
-                results.append("    Using file-based approach")
-                return self._run_redgate_file_based_migration(migrations_path, db_type)
-            
-            return results
-            
-        except Exception as e:
-            return [f"❌ Redgate PowerShell migration failed: {str(e)}"]
-    
-    def _build_sqlserver_connection_string(self):
-        """Build SQL Server connection string for Redgate tools"""
-        host = self.host_var.get()
-        port = self.port_var.get()
-        database = self.db_var.get()
-        username = self.username_var.get()
-        password = self.password_var.get()
-        
-        if username:
-            return f"Server={host},{port};Database={database};User Id={username};Password={password};"
-        else:
-            return f"Server={host},{port};Database={database};Integrated Security=True;"
-    
-    def _create_temp_database_with_migrations(self, temp_db_name, migrations_path):
-        """Create a temporary database and apply all migrations"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Create temporary database
-            cursor.execute(f"CREATE DATABASE [{temp_db_name}]")
-            conn.commit()
-            
-            # Switch to temp database
-            cursor.execute(f"USE [{temp_db_name}]")
-            
-            # Apply all migration files
-            sql_files = sorted([f for f in os.listdir(migrations_path) if f.endswith('.sql')])
-            
-            for sql_file in sql_files:
-                file_path = os.path.join(migrations_path, sql_file)
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    sql_content = f.read()
-                
-                # Execute SQL statements
-                statements = self._split_sql_statements(sql_content, "sqlserver")
-                for statement in statements:
-                    if statement.strip():
-                        cursor.execute(statement)
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-        except Exception as e:
-            raise Exception(f"Failed to create temp database: {str(e)}")
-    
-    def _cleanup_temp_database(self, temp_db_name):
-        """Clean up temporary database"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Switch to master database
-            cursor.execute("USE master")
-            
-            # Drop the temporary database
-            cursor.execute(f"DROP DATABASE IF EXISTS [{temp_db_name}]")
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-        except Exception as e:
-            self.log_to_console(f"⚠️ Warning: Could not clean up temp database: {str(e)}")
-    
-    def _create_redgate_powershell_script(self, migrations_path, db_type):
-        """Create PowerShell script for Redgate deployment"""
-        
-        if db_type == "mysql":
-            return """
-            Write-Output "    MySQL not directly supported by Redgate"
-            Write-Output "    Using alternative schema comparison"
-            Write-Output "  ✓ Schema comparison completed"
-            """
-        
-        # SQL Server PowerShell script
-        connection_string = self._build_sqlserver_connection_string()
-        
-        return f"""
-        try {{
-            Import-Module SQLCompare -ErrorAction SilentlyContinue
-            if (Get-Module SQLCompare) {{
-                Write-Output "    Using SQL Compare PowerShell module"
-                Write-Output "    Initializing schema comparison..."
-                Write-Output "    Performing schema comparison..."
-                Write-Output "  ✓ Schema comparison completed"
-            }} else {{
-                Write-Output "    PowerShell modules not available"
-                Write-Output "    Using file-based deployment approach"
-                Write-Output "  ✓ File-based deployment completed"
-            }}
-        }} catch {{
-            Write-Output "  ❌ PowerShell deployment failed: $_"
-        }}
-        """
-    
-    def _run_redgate_mysql_fallback(self, migrations_path, db_type):
-        """Fallback approach for MySQL (Redgate doesn't support MySQL)"""
-        return [
-            "    MySQL not directly supported by Redgate",
-            "    Using alternative schema comparison",
-            "  ✓ Schema comparison completed"
-        ]
-    
-    def _run_redgate_file_based_migration(self, migrations_path, db_type):
-        """File-based migration when Redgate tools are not available"""
-        try:
-            results = [
-                "    Redgate tools not installed",
-                "    Using file-based deployment approach",
-            ]
-            
-            # Get all migration files
-            sql_files = sorted([f for f in os.listdir(migrations_path) if f.endswith('.sql')])
-            
-            if not sql_files:
-                return [f"    No SQL files found in migrations"]
-            
-            results.append(f"    Found {len(sql_files)} migration files")
-            
-            # Create a combined deployment script (Redgate-style)
-            deployment_script_path = os.path.join(migrations_path, "..", "generated_deployment.sql")
-            
-            with open(deployment_script_path, 'w', encoding='utf-8') as deployment_file:
-                deployment_file.write("-- Redgate-style Deployment Script\n")
-                deployment_file.write("-- Generated from migration files\n")
-                deployment_file.write(f"-- Database: {db_type.upper()}\n")
-                deployment_file.write(f"-- Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                
-                for sql_file in sql_files:
-                    file_path = os.path.join(migrations_path, sql_file)
-                    deployment_file.write(f"-- Migration: {sql_file}\n")
-                    deployment_file.write("-- " + "="*50 + "\n")
-                    
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        deployment_file.write(f.read())
-                    
-                    deployment_file.write("\n\n")
-            
-            results.append(f"  📄 Deployment script created: {deployment_script_path}")
-            results.append("  💡 Install Redgate SQL Compare for full functionality")
-            results.append("  ✓ File-based deployment completed")
-            
-            return results
-            
-        except Exception as e:
-            return [f"❌ File-based deployment failed: {str(e)}"]
-        """Create Redgate-style deployment tracking tables if they don't exist"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            db_type = self.db_type_var.get()
-            
-            if db_type == "mysql":
-                # Create Redgate deployment history table (MySQL)
-                cursor.execute("""
-                CREATE TABLE IF NOT EXISTS redgate_deployment_history (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    deployment_id VARCHAR(50) NOT NULL UNIQUE,
-                    filename VARCHAR(255) NOT NULL,
-                    schema_hash VARCHAR(64),
-                    deployed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    deployment_time_ms INT DEFAULT 0,
-                    changes_applied INT DEFAULT 0,
-                    deployment_status ENUM('PLANNED', 'DEPLOYING', 'COMPLETED', 'FAILED', 'ROLLED_BACK') DEFAULT 'PLANNED',
-                    deployment_notes TEXT,
-                    INDEX idx_deployment_id (deployment_id),
-                    INDEX idx_deployed_at (deployed_at)
-                )
-                """)
-                
-                # Create Redgate schema comparison table
-                cursor.execute("""
-                CREATE TABLE IF NOT EXISTS redgate_schema_comparison (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    comparison_id VARCHAR(50) NOT NULL,
-                    object_name VARCHAR(255) NOT NULL,
-                    object_type ENUM('TABLE', 'VIEW', 'PROCEDURE', 'FUNCTION', 'INDEX', 'CONSTRAINT') NOT NULL,
-                    change_type ENUM('CREATE', 'ALTER', 'DROP', 'NONE') NOT NULL,
-                    script_content TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """)
-                
-            else:  # SQL Server
-                # Create Redgate deployment history table (SQL Server)
-                cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='redgate_deployment_history' AND xtype='U')
-                CREATE TABLE redgate_deployment_history (
-                    id INT IDENTITY(1,1) PRIMARY KEY,
-                    deployment_id NVARCHAR(50) NOT NULL UNIQUE,
-                    filename NVARCHAR(255) NOT NULL,
-                    schema_hash NVARCHAR(64),
-                    deployed_at DATETIME2 DEFAULT GETDATE(),
-                    deployment_time_ms INT DEFAULT 0,
-                    changes_applied INT DEFAULT 0,
-                    deployment_status NVARCHAR(20) DEFAULT 'PLANNED' CHECK (deployment_status IN ('PLANNED', 'DEPLOYING', 'COMPLETED', 'FAILED', 'ROLLED_BACK')),
-                    deployment_notes NVARCHAR(MAX)
-                )
-                """)
-                
-                cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='redgate_schema_comparison' AND xtype='U')
-                CREATE TABLE redgate_schema_comparison (
-                    id INT IDENTITY(1,1) PRIMARY KEY,
-                    comparison_id NVARCHAR(50) NOT NULL,
-                    object_name NVARCHAR(255) NOT NULL,
-                    object_type NVARCHAR(20) NOT NULL CHECK (object_type IN ('TABLE', 'VIEW', 'PROCEDURE', 'FUNCTION', 'INDEX', 'CONSTRAINT')),
-                    change_type NVARCHAR(10) NOT NULL CHECK (change_type IN ('CREATE', 'ALTER', 'DROP', 'NONE')),
-                    script_content NVARCHAR(MAX),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-                """)
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
+            if self.liquibase_enabled.get() and not cancel.cancelled:
+                time.sleep(3)
+                self.run_liquibase_migration()
+                time.sleep(2)
+            else:
+                # Show skip message for disabled Liquibase
+                db_type = self.db_type_var.get()
+                if db_type == "sqlserver":
+                    self.log_to_console("⏭️ Skipping Liquibase (SQL Server TCP/IP limitation)")
             
-        except Exception as e:
-            raise Exception(f"Failed to initialize Redgate tracking tables: {str(e)}")
-    
-    def _perform_schema_comparison(self, sql_files, migrations_path):
-        """Perform Redgate-style schema comparison"""
-        import random
-        
-        results = []
-        comparison_id = f"RG-COMP-{random.randint(1000, 9999)}"
-        
-        # Analyze each migration file
-        total_changes = 0
-        for sql_file in sql_files:
-            file_path = os.path.join(migrations_path, sql_file)
+            if self.bytebase_enabled.get() and not cancel.cancelled:
+                time.sleep(3)
+                self.run_bytebase_migration()
             
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    sql_content = f.read()
-                
-                # Parse SQL to identify object types and changes (simplified)
-                changes = self._analyze_sql_changes(sql_content, comparison_id)
-                total_changes += len(changes)
-                
-                if changes:
-                    results.append(f"  Analyzed: {sql_file} ({len(changes)} changes)")
-                    
-            except Exception as e:
-                results.append(f"  Error: Failed to analyze {sql_file}")
+            time.sleep(2)
+            if cancel.cancelled:
+                self.update_status("⏹️ Migrations cancelled")
+            else:
+                self.update_status("✅ All migrations completed")
         
-        results.append(f"  Schema comparison: {total_changes} changes identified")
-        return results
+        thread = threading.Thread(target=run_all)
+        thread.daemon = True
+        thread.start()
     
-    def _analyze_sql_changes(self, sql_content, comparison_id):
-        """Analyze SQL content to identify database object changes (simplified Redgate-style analysis)"""
-        import re
-        
-        changes = []
+    def run_fanout_deployment(self):
+        """Apply the enabled migrations to every target listed in a file"""
+        targets_file = filedialog.askopenfilename(
+            title="Select targets file",
+            filetypes=[("Targets files", "*.txt *.json"), ("All files", "*.*")]
+        )
+        if not targets_file:
+            return
         
         try:
-            # Remove comments
-            sql_content = re.sub(r'--.*$', '', sql_content, flags=re.MULTILINE)
-            sql_content = re.sub(r'/\*.*?\*/', '', sql_content, flags=re.DOTALL)
-            
-            # Detect CREATE statements
-            create_matches = re.finditer(r'CREATE\s+(TABLE|VIEW|PROCEDURE|FUNCTION|INDEX)\s+(?:\[?(\w+)\]?\.)?(?:\[?(\w+)\]?)', sql_content, re.IGNORECASE)
-            for match in create_matches:
-                object_type = match.group(1).upper()
-                object_name = match.group(3) or match.group(2)
-                changes.append({
-                    'object_type': object_type,
-                    'object_name': object_name,
-                    'change_type': 'CREATE',
-                    'script_content': match.group(0)[:200] + '...' if len(match.group(0)) > 200 else match.group(0)
-                })
-                
-                # Store in comparison table
-                self._store_comparison_result(comparison_id, object_name, object_type, 'CREATE', match.group(0))
-            
-            # Detect ALTER statements
-            alter_matches = re.finditer(r'ALTER\s+(TABLE|VIEW|PROCEDURE|FUNCTION)\s+(?:\[?(\w+)\]?\.)?(?:\[?(\w+)\]?)', sql_content, re.IGNORECASE)
-            for match in alter_matches:
-                object_type = match.group(1).upper()
-                object_name = match.group(3) or match.group(2)
-                changes.append({
-                    'object_type': object_type,
-                    'object_name': object_name,
-                    'change_type': 'ALTER',
-                    'script_content': match.group(0)[:200] + '...' if len(match.group(0)) > 200 else match.group(0)
-                })
-                
-                self._store_comparison_result(comparison_id, object_name, object_type, 'ALTER', match.group(0))
-            
-            # Detect DROP statements
-            drop_matches = re.finditer(r'DROP\s+(TABLE|VIEW|PROCEDURE|FUNCTION|INDEX)\s+(?:\[?(\w+)\]?\.)?(?:\[?(\w+)\]?)', sql_content, re.IGNORECASE)
-            for match in drop_matches:
-                object_type = match.group(1).upper()
-                object_name = match.group(3) or match.group(2)
-                changes.append({
-                    'object_type': object_type,
-                    'object_name': object_name,
-                    'change_type': 'DROP',
-                    'script_content': match.group(0)[:200] + '...' if len(match.group(0)) > 200 else match.group(0)
-                })
-                
-                self._store_comparison_result(comparison_id, object_name, object_type, 'DROP', match.group(0))
-            
+            targets = load_targets(targets_file, self._connection_settings())
         except Exception as e:
-            # Continue even if analysis fails
-            pass
-        
-        return changes
-    
-    def _store_comparison_result(self, comparison_id, object_name, object_type, change_type, script_content):
-        """Store comparison result in tracking table"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO redgate_schema_comparison 
-                (comparison_id, object_name, object_type, change_type, script_content) 
-                VALUES (%s, %s, %s, %s, %s)
-            """, (comparison_id, object_name, object_type, change_type, script_content[:1000]))  # Limit script content
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-        except Exception:
-            # Continue even if storage fails
-            pass
-    
-    def _generate_deployment_plan(self, sql_files, migrations_path):
-        """Generate Redgate-style deployment plan"""
-        import random
-        
-        results = []
-        deployment_id = f"RG-DEPLOY-{random.randint(1000, 9999)}"
-        
-        results.append(f"  Deployment plan: {len(sql_files)} files to deploy")
+            messagebox.showerror("Fan-out Error", str(e))
+            return
         
-        return results
-    
-    def _execute_redgate_deployment(self, sql_files, migrations_path):
-        """Execute Redgate-style deployment with proper tracking"""
-        import time
-        import random
-        import hashlib
+        tools = [tool for tool, enabled in (('redgate', self.redgate_enabled),
+                                            ('liquibase', self.liquibase_enabled),
+                                            ('bytebase', self.bytebase_enabled)) if enabled.get()]
+        if not tools:
+            self.update_status("⚠️ No migration tools are enabled in settings")
+            return
         
-        results = []
-        deployment_id = f"RG-DEPLOY-{random.randint(1000, 9999)}"
+        if not messagebox.askyesno("Confirm Fan-out",
+                                   f"Apply {', '.join(tools)} migrations to {len(targets)} targets?"):
+            return
         
-        total_changes = 0
-        executed_files = 0
-        skipped_files = 0
+        self.update_status(f"🌍 Fan-out deployment to {len(targets)} targets...")
+        self.log_to_console("\n" + "="*60)
+        self.log_to_console(f"🌍 FAN-OUT DEPLOYMENT: {os.path.basename(targets_file)}")
+        self.log_to_console("="*60)
         
-        for sql_file in sql_files:
-            file_path = os.path.join(migrations_path, sql_file)
-            
+        def run_fanout():
             try:
-                # Check if already deployed
-                if self._is_redgate_deployment_applied(sql_file):
-                    results.append(f"  Skipped: {sql_file} (already deployed)")
-                    skipped_files += 1
-                    continue
-                
-                # Read file and calculate hash
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    sql_content = f.read()
-                
-                schema_hash = hashlib.md5(sql_content.encode()).hexdigest()
-                
-                # Record deployment start
-                self._record_deployment_start(deployment_id, sql_file, schema_hash)
-                
-                # Execute deployment
-                deployment_result = self._execute_redgate_file(file_path, sql_content)
-                
-                if deployment_result['success']:
-                    # Record successful deployment
-                    self._record_deployment_completion(deployment_id, deployment_result['changes'], 0)
-                    
-                    results.append(f"  Deployed: {sql_file} ({deployment_result['changes']} changes)")
-                    total_changes += deployment_result['changes']
-                    executed_files += 1
+                deployment = FanoutDeployment(
+                    targets,
+                    tools=tools,
+                    workers=max(4, self._parallel_workers()),
+                    log=self.log_to_console,
+                    parse_cache=self.parse_cache,
+                    cancel=self.cancel_token
+                )
+                summary = deployment.run()
+                self.log_to_console("")
+                for line in format_matrix(summary):
+                    self.log_to_console(line)
+                
+                if summary['failed'] or summary['halted']:
+                    self.update_status(f"❌ Fan-out finished with {summary['failed']} failed targets "
+                                       f"(Run Time: {summary['duration']:.1f}s)")
                 else:
-                    # Record failed deployment
-                    self._record_deployment_failure(deployment_id, deployment_result['error'])
-                    results.append(f"  Failed: {sql_file} - {deployment_result['error']}")
-                    break
-                    
+                    self.update_status(f"✅ Fan-out completed on {summary['succeeded']} targets "
+                                       f"(Run Time: {summary['duration']:.1f}s)")
             except Exception as e:
-                results.append(f"  Error: Failed to deploy {sql_file}")
-                break
+                self.log_to_console(f"❌ Fan-out deployment failed: {str(e)}")
+                self.update_status("Fan-out deployment failed")
         
-        results.append(f"Redgate: Complete - {executed_files} deployed, {skipped_files} skipped, {total_changes} changes")
-        
-        return results
-    
-    def _is_redgate_deployment_applied(self, filename):
-        """Check if deployment has already been applied"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                "SELECT COUNT(*) FROM redgate_deployment_history WHERE filename = %s AND deployment_status = 'COMPLETED'",
-                (filename,)
-            )
-            
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
-            
-            return result[0] > 0
-            
-        except Exception:
-            # If table doesn't exist or query fails, assume not applied
-            return False
-    
-    def _record_deployment_start(self, deployment_id, filename, schema_hash):
-        """Record deployment start"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO redgate_deployment_history 
-                (deployment_id, filename, schema_hash, deployment_status) 
-                VALUES (%s, %s, %s, 'DEPLOYING')
-            """, (deployment_id, filename, schema_hash))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-        except Exception:
-            # Continue even if tracking fails
-            pass
-    
-    def _record_deployment_completion(self, deployment_id, changes_applied, deployment_time_ms):
-        """Record successful deployment completion"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                UPDATE redgate_deployment_history 
-                SET deployment_status = 'COMPLETED', changes_applied = %s, deployment_time_ms = %s
-                WHERE deployment_id = %s
-            """, (changes_applied, deployment_time_ms, deployment_id))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-        except Exception:
-            # Continue even if tracking fails
-            pass
-    
-    def _record_deployment_failure(self, deployment_id, error_message):
-        """Record deployment failure"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                UPDATE redgate_deployment_history 
-                SET deployment_status = 'FAILED', deployment_notes = %s
-                WHERE deployment_id = %s
-            """, (error_message, deployment_id))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-        except Exception:
-            # Continue even if tracking fails
-            pass
-    
-    def _execute_redgate_file(self, file_path, sql_content):
-        """Execute individual SQL file with Redgate-style error handling"""
-        try:
-            # Execute migration
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Split and execute statements
-            db_type = self.db_type_var.get()
-            if db_type == "mysql":
-                statements = self._split_mysql_statements(sql_content)
-            else:
-                statements = self._split_sql_statements(sql_content)
-            
-            executed_statements = 0
-            for statement in statements:
-                if statement.strip():
-                    try:
-                        if db_type == "mysql":
-                            # For MySQL, create fresh cursor for each statement
-                            cursor.close()
-                            cursor = conn.cursor()
-                        cursor.execute(statement)
-                        if db_type == "mysql":
-                            cursor.fetchall()  # Consume results
-                        executed_statements += 1
-                    except Exception as stmt_error:
-                        # Log statement errors but continue for non-critical errors
-                        error_msg = str(stmt_error).lower()
-                        if not any(warning in error_msg for warning in ['already exists', 'duplicate']):
-                            raise stmt_error
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            return {
-                'success': True,
-                'changes': executed_statements,
-                'error': None
-            }
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'changes': 0,
-                'error': str(e)
-            }
+        thread = threading.Thread(target=run_fanout)
+        thread.daemon = True
+        thread.start()
     
-    def _execute_sql_files_directly_for_liquibase(self, liquibase_sql_path):
-        """Execute Liquibase SQL via updateSQL command and then run the generated SQL using GUI's ODBC connection"""
-        try:
-            # Use database-specific directory structure
-            db_type = self.db_type_var.get()
-            project_root = os.path.dirname(os.path.abspath(__file__))
-            
-            if db_type == "sqlserver":
-                liquibase_dir = os.path.join(project_root, "liquibase", "microsoft_sql")
-            else:  # mysql
-                liquibase_dir = os.path.join(project_root, "liquibase", "mysql")
-            
-            # Generate SQL using Liquibase's updateSQL command
-            self.log_to_console("🔄 Generating SQL from Liquibase changelogs...")
-            
-            # Create a temporary SQL file to capture the generated SQL
-            temp_sql_file = os.path.join(liquibase_dir, "temp_generated_migration.sql")
-            
-            # Use updateSQL command to generate the SQL without executing it
+    def estimate_migrations(self):
+        """Estimate the duration of every pending migration of the enabled tools"""
+        tools = [tool for tool, enabled in (('redgate', self.redgate_enabled),
+                                            ('liquibase', self.liquibase_enabled),
+                                            ('bytebase', self.bytebase_enabled)) if enabled.get()]
+        engine = self._create_engine()
+        self.estimate_total_label.config(text="Estimating...", fg='#ffc107')
+        
+        def run_estimate():
             try:
-                # Since the properties file approach has directory issues, try direct parameters
-                self.log_to_console("🔄 Attempting updateSQL with direct parameters...")
-                
-                # Get connection details for direct command line parameters
-                host = self.host_var.get()
-                database = self.db_var.get()
-                
-                # Build connection URL for command line
-                # Only use port detection for named instances (with backslash)
-                if "\\" in host:
-                    # Named instance - use port detection
-                    detected_port = self._detect_sqlserver_port()
-                    if detected_port and detected_port != "1433":
-                        base_host = host.split("\\")[0]
-                        jdbc_url = f"jdbc:sqlserver://{base_host}:{detected_port};databaseName={database};integratedSecurity=true;encrypt=false;trustServerCertificate=true"
-                    else:
-                        # Fallback to named instance format
-                        base_host = host.split("\\")[0]
-                        instance_name = host.split("\\")[1]
-                        jdbc_url = f"jdbc:sqlserver://{base_host};instanceName={instance_name};databaseName={database};integratedSecurity=true;encrypt=false"
-                else:
-                    # Default instance - detect the actual SQL Server port
-                    detected_port = self._detect_sqlserver_port()
-                    if detected_port:
-                        jdbc_url = f"jdbc:sqlserver://{host}:{detected_port};databaseName={database};integratedSecurity=true;encrypt=false;trustServerCertificate=true"
-                    else:
-                        # Fallback to standard port if detection fails
-                        jdbc_url = f"jdbc:sqlserver://{host}:1433;databaseName={database};integratedSecurity=true;encrypt=false;trustServerCertificate=true"
-                
-                # Determine JDBC driver path
-                project_root = os.path.dirname(os.path.abspath(__file__))
-                liquibase_lib_dir = os.path.join(project_root, "liquibase", "lib")
-                jdbc_driver_path = os.path.join(liquibase_lib_dir, "mssql-jdbc-12.4.2.jre11.jar")
-                
-                # Debug: Log the actual path being used
-                self.log_to_console(f"🔧 Using JDBC driver path (FIXED VERSION): {jdbc_driver_path}")
-                
-                # Run updateSQL with direct command line parameters and proper classpath
-                cmd = [
-                    "liquibase",
-                    "--classpath", jdbc_driver_path,
-                    "updateSQL",
-                    f"--url={jdbc_url}",
-                    "--driver=com.microsoft.sqlserver.jdbc.SQLServerDriver",
-                    "--changeLogFile=changelog/db.changelog-master.xml"
-                ]
-                
-                self.log_to_console(f"🚀 Running: {' '.join(cmd)}")
-                
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    shell=True,
-                    timeout=60,
-                    cwd=liquibase_dir
-                )
-                
-                if result.returncode == 0 and result.stdout:
-                    # Save the generated SQL to a file
-                    with open(temp_sql_file, 'w', encoding='utf-8') as f:
-                        f.write(result.stdout)
-                    
-                    self.log_to_console("✅ SQL generated successfully from Liquibase changelogs")
-                    
-                    # Now execute the generated SQL using GUI's ODBC connection
-                    return self._execute_generated_sql_via_odbc(temp_sql_file)
-                    
-                else:
-                    self.log_to_console(f"❌ Failed to generate SQL: {result.stderr}")
-                    return False
-                    
-            except subprocess.TimeoutExpired:
-                self.log_to_console("⏰ Liquibase updateSQL command timed out")
-                return False
+                estimate = engine.estimate(tools)
+                self.root.after(0, lambda: self._show_estimate(estimate))
             except Exception as e:
-                self.log_to_console(f"❌ Error running updateSQL command: {str(e)}")
-                return False
-            
-        except Exception as e:
-            self.log_to_console(f"❌ Error in _execute_sql_files_directly_for_liquibase: {str(e)}")
-            return False
+                message = f"❌ Estimate failed: {str(e)}"
+                self.root.after(0, lambda: self.estimate_total_label.config(text=message, fg='#dc3545'))
+        
+        thread = threading.Thread(target=run_estimate)
+        thread.daemon = True
+        thread.start()
     
-    def _execute_generated_sql_via_odbc(self, sql_file_path):
-        """Execute the generated SQL file using GUI's ODBC connection"""
-        try:
-            if not os.path.exists(sql_file_path):
-                self.log_to_console(f"❌ SQL file not found: {sql_file_path}")
-                return False
-            
-            self.log_to_console(f"� Executing generated SQL via ODBC connection...")
-            
-            # Use the GUI's database connection to execute SQL
-            conn = None
-            cursor = None
-            try:
-                # Use the same connection approach as the GUI
-                conn_str = self._get_sql_server_connection_string()
-                conn = pyodbc.connect(conn_str)
-                cursor = conn.cursor()
-                
-                # Read the generated SQL file
-                with open(sql_file_path, 'r', encoding='utf-8') as f:
-                    sql_content = f.read()
-                
-                # Clean up the SQL content (remove Liquibase comments and formatting)
-                sql_lines = []
-                for line in sql_content.split('\n'):
-                    line = line.strip()
-                    if line and not line.startswith('--') and not line.startswith('/*') and not line.startswith('*'):
-                        sql_lines.append(line)
-                
-                cleaned_sql = '\n'.join(sql_lines)
-                
-                # Split into individual statements
-                statements = [stmt.strip() for stmt in cleaned_sql.split(';') if stmt.strip()]
-                
-                executed_count = 0
-                for statement in statements:
-                    if statement.strip():
-                        try:
-                            cursor.execute(statement)
-                            conn.commit()
-                            executed_count += 1
-                        except Exception as stmt_error:
-                            # Log warning but continue with other statements
-                            self.log_to_console(f"⚠️ Statement warning: {str(stmt_error)}")
-                
-                self.log_to_console(f"✅ Successfully executed {executed_count} SQL statements via ODBC")
-                
-                # Clean up the temporary file
-                try:
-                    os.remove(sql_file_path)
-                except:
-                    pass
-                
-                return True
-                
-            except Exception as e:
-                self.log_to_console(f"❌ Error executing SQL via ODBC: {str(e)}")
-                return False
-            finally:
-                if cursor:
-                    cursor.close()
-                if conn:
-                    conn.close()
-                    
-        except Exception as e:
-            self.log_to_console(f"❌ Error in _execute_generated_sql_via_odbc: {str(e)}")
-            return False
-
-    def run_all_migrations(self):
-        """Run all enabled migrations sequentially"""
-        # Check if connection is active
-        if not self.connection_active:
-            messagebox.showwarning("No Connection", 
-                                 "Please test and establish a database connection first in the Settings tab.")
-            self.update_status("⚠️ No database connection - migrations cannot run")
+    def _show_estimate(self, estimate):
+        """Fill the estimate table and total ETA in the Migrations tab"""
+        self.estimate_tree.delete(*self.estimate_tree.get_children())
+        for entry in estimate['files']:
+            self.estimate_tree.insert('', 'end', values=(
+                entry['tool'].capitalize(), entry['file'], entry['statements'],
+                f"~{format_duration(entry['seconds'])}", entry['heaviest'] or ""
+            ))
+        
+        if not estimate['files']:
+            self.estimate_total_label.config(text="✅ Nothing pending", fg='#28a745')
             return
-        
-        self.update_status("🚀 Starting all migrations...")
-        self.log_to_console("\n" + "="*60)
-        self.log_to_console("🚀 COMPREHENSIVE MIGRATION TEST")
-        self.log_to_console(f"🗄️ Target Database: {self.active_connection['type'].upper()}")
-        self.log_to_console(f"📍 Connection: {self.active_connection['host']}/{self.active_connection['database']}")
-        self.log_to_console("="*60)
-        
-        def run_all():
-            if self.redgate_enabled.get():
-                self.run_redgate_migration()
-                time.sleep(2)
-            
-            if self.liquibase_enabled.get():
-                time.sleep(3)
-                self.run_liquibase_migration()
-                time.sleep(2)
-            else:
-                # Show skip message for disabled Liquibase
-                db_type = self.db_type_var.get()
-                if db_type == "sqlserver":
-                    self.log_to_console("⏭️ Skipping Liquibase (SQL Server TCP/IP limitation)")
-            
-            if self.bytebase_enabled.get():
-                time.sleep(3)
-                self.run_bytebase_migration()
-            
-            time.sleep(2)
-            self.update_status("✅ All migrations completed")
-        
-        thread = threading.Thread(target=run_all)
+        calibration = (f"calibrated on {estimate['calibration_files']} earlier runs"
+                       if estimate['calibration_files'] else "built-in rates - no earlier runs to calibrate on")
+        self.estimate_total_label.config(
+            text=f"Total ETA: ~{format_duration(estimate['total_seconds'])} for {len(estimate['files'])} files ({calibration})",
+            fg='#2c3e50'
+        )
+    
+    def cancel_migrations(self):
+        """Stop running migrations: their statements are cancelled on the server and rolled back"""
+        cancel = self.cancel_token
+        if cancel.cancelled:
+            return
+        # Migrations started from now on get a fresh token
+        self.cancel_token = CancelToken()
+        self.update_status("⏹️ Cancelling running migrations...")
+        self.log_to_console("⏹️ Cancel requested - stopping running statements on the server")
+        # Cancelling opens a connection to KILL QUERY, so keep it off the UI thread
+        thread = threading.Thread(target=cancel.cancel)
         thread.daemon = True
         thread.start()
     
@@ -4431,6 +2694,37 @@ logLevel=INFO
         thread.daemon = True
         thread.start()
     
+    def clone_template(self):
+        """Replace the database with a clone of the migrated template for the enabled tools"""
+        tools = [tool for tool, enabled in (('redgate', self.redgate_enabled),
+                                            ('liquibase', self.liquibase_enabled),
+                                            ('bytebase', self.bytebase_enabled)) if enabled.get()]
+        if not tools:
+            messagebox.showwarning("No Tools", "Enable at least one migration tool first.")
+            return
+        if not messagebox.askyesno("Confirm Clone",
+                                   "Replace the database with a freshly migrated copy of its template?\n"
+                                   "The template is built on first use and whenever a migration file changes."):
+            return
+        engine = self._create_engine()
+        self.update_status("🧬 Cloning template database...")
+        
+        def run_clone():
+            try:
+                clone = engine.clone_template(tools)
+                if clone['built']:
+                    self.log_to_console(f"🏗️ Template {clone['template']} built in {format_duration(clone['build_seconds'])}")
+                self.update_status(f"✅ Database cloned from template in {clone['clone_seconds']:.1f}s")
+                self.refresh_tables()
+            except Exception as e:
+                error_msg = f"❌ Template clone failed: {str(e)}"
+                self.update_status(error_msg)
+                self.log_to_console(error_msg)
+        
+        thread = threading.Thread(target=run_clone)
+        thread.daemon = True
+        thread.start()
+    
     def reset_database(self):
         """Reset database to clean state"""
         if messagebox.askyesno("Confirm Reset", "Are you sure you want to reset the database? This will clear all data."):
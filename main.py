@@ -4,23 +4,18 @@ Professional Database Migration Tools POC - Main Entry Point
 EY Enterprise Tools Comparison
 
 This is the main entry point for the Professional Database Migration Tools POC.
-Run this file to start the application.
+Run this file to start the application. For headless runs (CI, cron) use
+`python -m migration_engine` instead, which never starts Tk.
 """
 
 import sys
-import os
 import tkinter as tk
-from pathlib import Path
-
-# Add src directory to Python path
-src_path = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_path))
 
 def main():
     """Main entry point for the application"""
     try:
         # Import the main GUI class
-        from gui.main_window import ProfessionalMigrationGUI
+        from gui import ProfessionalMigrationGUI
         
         # Create and configure the root window
         root = tk.Tk()
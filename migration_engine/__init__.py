@@ -0,0 +1,45 @@
+"""
+Headless database migration engine
+
+Shared by the Tk GUI (gui.py) and the command line (python -m migration_engine).
+Nothing here imports tkinter, and database drivers are only loaded on first connect.
+The names below are imported from their modules on first use, so `python -m
+migration_engine --help` loads none of the engine modules.
+"""
+
+import importlib
+
+
+# Public name -> module it is defined in
+_EXPORTS = {
+    'SQLStatementSplitter': 'sql',
+    'SQLStatementStream': 'sql',
+    'ParsedMigrationCache': 'sql',
+    'ConnectionSettings': 'settings',
+    'connect': 'connection',
+    'BytebaseAPI': 'bytebase',
+    'MigrationEngine': 'engine',
+    'MigrationResults': 'engine',
+    'MIGRATION_TOOLS': 'settings',
+    'CancelToken': 'cancel',
+    'MigrationCancelled': 'cancel',
+    'FanoutDeployment': 'fanout',
+    'FanoutTarget': 'fanout',
+    'load_targets': 'fanout',
+    'format_matrix': 'fanout',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    # Later lookups find the name directly
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,404 @@
+"""
+Chunked backfills for large MySQL data changes
+
+An UPDATE, DELETE or INSERT ... SELECT over a whole table runs as one huge transaction:
+undo logs balloon, locks are held for its full length and replicas fall behind by just
+as long. Statements of that shape are rewritten into ranges of the driving table's
+primary key and run one committed chunk at a time:
+
+    UPDATE orders SET total = net + tax WHERE total IS NULL
+    -> UPDATE orders SET total = net + tax WHERE (total IS NULL) AND (orders.`id`) > (%s) AND (orders.`id`) <= (%s)
+
+Between chunks the backfill yields to the server, longer the busier it is. Load is the
+highest of Threads_running on the primary and replica lag over their limits; lag is read
+from a replica (Seconds_Behind_Source, or a pt-heartbeat table written with --utc). At
+or above the limit the backfill waits, backing off, until the server has recovered.
+
+Only single-table statements without ORDER BY/LIMIT/GROUP BY/JOIN are chunked, and only
+when EXPLAIN expects them to touch more than two chunks of rows; anything else runs
+as written. Each chunk commits on its own, so a failed backfill leaves earlier chunks
+applied - statements should be safe to rerun (idempotent SET, INSERT IGNORE).
+"""
+
+import re
+import time
+
+from .online import quote, primary_key, estimated_rows
+
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 10
+
+# Waits while the server is over its limits double from BACKOFF_START up to BACKOFF_MAX
+BACKOFF_START = 0.5
+BACKOFF_MAX = 30.0
+
+NAME = r"(?:`_*`|[\w$]+)(?:\s*\.\s*(?:`_*`|[\w$]+))?"
+ALIAS = r"(?:\s+(?:AS\s+)?(?!(?:SET|WHERE|ON|PARTITION)\b)(`_*`|[\w$]+))?"
+
+# Cheap prefilters on the raw SQL, so large INSERT ... VALUES statements are never scanned
+CANDIDATE_PATTERN = re.compile(
+    r"^\s*(?:UPDATE\b|DELETE\b|(?:INSERT|REPLACE)\s+(?:(?:LOW_PRIORITY|HIGH_PRIORITY|IGNORE)\s+)*(?:INTO\s+)?"
+    r"(?:`[^`]+`|[\w$]+)(?:\s*\.\s*(?:`[^`]+`|[\w$]+))?\s*(?:\([^)]*\))?\s*SELECT\b)",
+    re.IGNORECASE
+)
+
+# The patterns below run on masked SQL (see _mask), where only top-level text remains
+UPDATE_PATTERN = re.compile(rf"^\s*UPDATE\s+(?:(?:LOW_PRIORITY|IGNORE)\s+)*({NAME}){ALIAS}\s+SET\b", re.IGNORECASE)
+DELETE_PATTERN = re.compile(
+    rf"^\s*DELETE\s+(?:(?:LOW_PRIORITY|QUICK|IGNORE)\s+)*FROM\s+({NAME}){ALIAS}\s*(?=\bWHERE\b|$)", re.IGNORECASE
+)
+INSERT_PATTERN = re.compile(
+    rf"^\s*(?:INSERT|REPLACE)\s+(?:(?:LOW_PRIORITY|HIGH_PRIORITY|IGNORE)\s+)*(?:INTO\s+)?({NAME})", re.IGNORECASE
+)
+SOURCE_PATTERN = re.compile(rf"FROM\s+({NAME}){ALIAS}\s*(?=\bWHERE\b|\bON\s+DUPLICATE\b|$)", re.IGNORECASE)
+UNCHUNKABLE_PATTERN = re.compile(
+    r"\b(?:JOIN|STRAIGHT_JOIN|LIMIT|ORDER\s+BY|GROUP\s+BY|HAVING|UNION|DISTINCT|USING|WINDOW|INTO\s+OUTFILE|"
+    r"FOR\s+UPDATE|LOCK\s+IN\s+SHARE\s+MODE)\b",
+    re.IGNORECASE
+)
+TOKEN_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`(?:[^`]|``)*`|--[^\n]*|#[^\n]*|/\*.*?\*/|[()]",
+                           re.DOTALL)
+
+
+def _mask(sql):
+    """sql with literals, comments and parenthesised text blanked out (same length)
+
+    Keywords found in the result are top-level clauses; quoted names keep their
+    backticks with the name replaced by underscores so positions still line up.
+    """
+    parts = []
+    depth = 0
+    position = 0
+    for match in TOKEN_PATTERN.finditer(sql):
+        text = sql[position:match.start()]
+        parts.append(text if depth == 0 else " " * len(text))
+        token = match.group()
+        if token == "(":
+            parts.append("(" if depth == 0 else " ")
+            depth += 1
+        elif token == ")":
+            depth = max(depth - 1, 0)
+            parts.append(")" if depth == 0 else " ")
+        elif token.startswith("`") and depth == 0:
+            parts.append("`" + "_" * (len(token) - 2) + "`")
+        else:
+            parts.append(" " * len(token))
+        position = match.end()
+    text = sql[position:]
+    parts.append(text if depth == 0 else " " * len(text))
+    return "".join(parts)
+
+
+def _split_name(name):
+    parts = [part.strip().strip('`') for part in name.split('.')]
+    return (parts[0], parts[1]) if len(parts) == 2 else (None, parts[0])
+
+
+class Backfill:
+    """A data change statement split around its WHERE clause, ready to be run in key ranges"""
+
+    def __init__(self, kind, schema, table, qualifier, head, condition, tail, set_clause=None):
+        self.kind = kind
+        self.schema = schema
+        self.table = table
+        self.qualifier = qualifier
+        self.head = head
+        self.condition = condition
+        self.tail = tail
+        self.set_clause = set_clause
+
+    def chunk_sql(self, key_range):
+        """The statement restricted to key_range (a condition with %s parameters)"""
+        condition = f"({self.condition}) AND {key_range}" if self.condition else key_range
+        sql = f"{self.escaped(self.head)} WHERE {self.escaped(condition, key_range)}"
+        return f"{sql} {self.escaped(self.tail)}" if self.tail else sql
+
+    @staticmethod
+    def escaped(text, key_range=None):
+        # Literal % signs must survive parameter substitution; the range's own %s must not be escaped
+        if key_range and text.endswith(key_range):
+            return text[:-len(key_range)].replace("%", "%%") + key_range
+        return text.replace("%", "%%")
+
+
+def parse_backfill(sql):
+    """Backfill for a single-table UPDATE, DELETE or INSERT ... SELECT that can be chunked, else None"""
+    if not CANDIDATE_PATTERN.match(sql):
+        return None
+    sql = sql.strip().rstrip(';').rstrip()
+    masked = _mask(sql)
+    if UNCHUNKABLE_PATTERN.search(masked):
+        return None
+
+    kind = masked.lstrip()[:6].upper()
+    set_clause = None
+    if kind == "UPDATE":
+        match = UPDATE_PATTERN.match(masked)
+        clause_start = match.end() if match else 0
+    elif kind == "DELETE":
+        match = DELETE_PATTERN.match(masked)
+        clause_start = match.end() if match else 0
+    else:
+        kind = "INSERT"
+        target = INSERT_PATTERN.match(masked)
+        select = re.search(r"\bSELECT\b", masked, re.IGNORECASE)
+        source = re.search(r"\bFROM\b", masked[select.end():], re.IGNORECASE) if target and select else None
+        match = SOURCE_PATTERN.match(masked, select.end() + source.start()) if source else None
+        if match and _split_name(sql[match.start(1):match.end(1)]) == _split_name(sql[target.start(1):target.end(1)]):
+            # Reading the table being filled would chase its own new rows
+            return None
+        clause_start = match.end() if match else 0
+    if not match:
+        return None
+
+    where = re.compile(r"\bWHERE\b", re.IGNORECASE).search(masked, clause_start)
+    tail = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE).search(masked, clause_start)
+    tail_start = tail.start() if tail else len(sql)
+    if where and where.start() > tail_start:
+        where = None
+
+    if kind == "UPDATE":
+        set_clause = sql[clause_start:where.start() if where else tail_start]
+    schema, table = _split_name(sql[match.start(1):match.end(1)])
+    qualifier = sql[match.start(2):match.end(2)] if match.group(2) else sql[match.start(1):match.end(1)]
+    if where:
+        head, condition = sql[:where.start()].rstrip(), sql[where.end():tail_start].strip()
+    else:
+        head, condition = sql[:tail_start].rstrip(), None
+    return Backfill(kind, schema, table, qualifier, head, condition, sql[tail_start:].strip(), set_clause)
+
+
+class LoadThrottle:
+    """Measures server load between chunks and pauses the backfill accordingly
+
+    load() is the highest of Threads_running / max_threads_running and replica lag /
+    max_replica_lag (limits of 0 are not checked). replica_connect opens a connection to
+    the replica; with heartbeat_table the lag is the age of the newest heartbeat row there.
+    """
+
+    def __init__(self, conn, max_threads_running=0, replica_connect=None, max_replica_lag=0,
+                 heartbeat_table=None, log=None):
+        self.conn = conn
+        self.max_threads_running = max_threads_running
+        self.replica_connect = replica_connect if max_replica_lag else None
+        self.max_replica_lag = max_replica_lag
+        self.heartbeat_table = heartbeat_table
+        self.log = log or (lambda message: None)
+        self.waited = 0.0
+        self._replica = None
+
+    def load(self):
+        """Fraction of the tightest limit currently in use (1.0 or more: over the limit)"""
+        loads = [0.0]
+        if self.max_threads_running:
+            rows = self._query(self.conn, "SHOW GLOBAL STATUS LIKE 'Threads_running'")
+            if rows:
+                loads.append(int(rows[0][1]) / self.max_threads_running)
+        if self.replica_connect:
+            lag = self.replica_lag()
+            # A replica that is not replicating counts as infinitely behind
+            loads.append(float('inf') if lag is None else lag / self.max_replica_lag)
+        return max(loads)
+
+    def replica_lag(self):
+        """Seconds the replica is behind, or None when it is not replicating"""
+        if self._replica is None:
+            self._replica = self.replica_connect()
+        if self.heartbeat_table:
+            name = ".".join(quote(part.strip().strip('`')) for part in self.heartbeat_table.split('.'))
+            rows = self._query(self._replica, f"SELECT TIMESTAMPDIFF(MICROSECOND, MAX(ts), UTC_TIMESTAMP(6)) FROM {name}")
+            return rows[0][0] / 1000000 if rows and rows[0][0] is not None else None
+        for query, column in (("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+                              ("SHOW SLAVE STATUS", "Seconds_Behind_Master")):
+            try:
+                rows, names = self._query(self._replica, query, with_names=True)
+            except Exception:
+                # SHOW REPLICA STATUS needs MySQL 8.0.22+
+                continue
+            if not rows:
+                return None
+            value = rows[0][names.index(column)]
+            return None if value is None else float(value)
+        return None
+
+    def pause(self, chunk_seconds):
+        """Wait out an overloaded server, then yield in proportion to the load"""
+        delay = BACKOFF_START
+        load = self.load()
+        if load >= 1:
+            self.log(f"  ⏸️ Backfill paused: server load at {self._describe(load)} of its limit")
+            while load >= 1:
+                time.sleep(delay)
+                self.waited += delay
+                delay = min(delay * 2, BACKOFF_MAX)
+                load = self.load()
+            self.log("  ▶️ Backfill resumed")
+        if load:
+            time.sleep(chunk_seconds * load)
+            self.waited += chunk_seconds * load
+
+    def close(self):
+        if self._replica is not None:
+            try:
+                self._replica.close()
+            except Exception:
+                pass
+            self._replica = None
+
+    def _describe(self, load):
+        return "∞" if load == float('inf') else f"{load:.0%}"
+
+    def _query(self, conn, query, with_names=False):
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            if with_names:
+                return rows, [column[0] for column in cursor.description or ()]
+            return rows
+        finally:
+            cursor.close()
+
+
+class ChunkedBackfill:
+    """Run a Backfill in committed primary-key chunks of chunk_size rows"""
+
+    def __init__(self, conn, backfill, sql, chunk_size=5000, throttle=None, log=None, cancel=None):
+        self.conn = conn
+        self.backfill = backfill
+        self.sql = sql
+        self.chunk_size = max(1, int(chunk_size))
+        self.throttle = throttle
+        self.log = log or (lambda message: None)
+        self.cancel = cancel
+        self.key_columns = []
+
+    def run(self):
+        """Apply the statement; returns (method, rows changed) with method chunked or direct"""
+        backfill = self.backfill
+        reason = self._direct_reason()
+        if reason:
+            if reason != "small":
+                self.log(f"  ⚠️ {backfill.table}: backfill not chunked ({reason}) - running it as one statement")
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute(self.sql)
+                return "direct", max(cursor.rowcount, 0)
+            finally:
+                cursor.close()
+        return "chunked", self._run_chunks(self.key_columns)
+
+    def _direct_reason(self):
+        """Why the statement runs unchunked ("small" when it does not need chunking), or None"""
+        backfill = self.backfill
+        self.key_columns = primary_key(self.conn, backfill.schema, backfill.table)
+        if not self.key_columns:
+            return "no primary key"
+        if backfill.set_clause and any(
+                re.search(rf"(?:^|[\s,.])`?{re.escape(column)}`?\s*=", backfill.set_clause, re.IGNORECASE)
+                for column in self.key_columns):
+            return "it changes the primary key"
+        if self._explain_rows() <= 2 * self.chunk_size:
+            return "small"
+        return None
+
+    def _explain_rows(self):
+        """Rows MySQL expects the statement to examine (largest table in the plan)"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"EXPLAIN {self.sql}")
+            rows = cursor.fetchall()
+            names = [column[0].lower() for column in cursor.description or ()]
+        finally:
+            cursor.close()
+        if 'rows' not in names:
+            return 0
+        index = names.index('rows')
+        return max((int(row[index] or 0) for row in rows), default=0)
+
+    def _run_chunks(self, key_columns):
+        backfill = self.backfill
+        start_time = time.time()
+        total = estimated_rows(self.conn, backfill.schema, backfill.table)
+        self.log(f"  🧮 {backfill.table}: {backfill.kind} backfill over ~{total:,} rows in chunks of {self.chunk_size:,}")
+
+        key = ", ".join(quote(column) for column in key_columns)
+        qualified = ", ".join(f"{backfill.qualifier}.{quote(column)}" for column in key_columns)
+        placeholders = ", ".join(['%s'] * len(key_columns))
+        source = f"{quote(backfill.schema) + '.' if backfill.schema else ''}{quote(backfill.table)} FORCE INDEX (PRIMARY)"
+
+        changed = 0
+        scanned = 0
+        last = None
+        next_report = time.time() + PROGRESS_INTERVAL
+        try:
+            while True:
+                if self.cancel:
+                    self.cancel.check()
+                chunk_start = time.time()
+                # Upper key of this chunk: the chunk_size-th key after the previous chunk
+                where = f"WHERE ({key}) > ({placeholders})" if last else ""
+                boundary = self._fetchone(
+                    f"SELECT {key} FROM {source} {where} ORDER BY {key} LIMIT 1 OFFSET {self.chunk_size - 1}",
+                    last or ()
+                )
+
+                conditions = ([f"({qualified}) > ({placeholders})"] if last else []) + \
+                             ([f"({qualified}) <= ({placeholders})"] if boundary else [])
+                cursor = self.conn.cursor()
+                try:
+                    if conditions:
+                        cursor.execute(backfill.chunk_sql(" AND ".join(conditions)),
+                                       tuple(last or ()) + tuple(boundary or ()))
+                    else:
+                        cursor.execute(self.sql)
+                    changed += max(cursor.rowcount, 0)
+                finally:
+                    cursor.close()
+                self.conn.commit()
+
+                if not boundary:
+                    break
+                last = boundary
+                scanned += self.chunk_size
+
+                if time.time() >= next_report:
+                    self.log(f"  🧮 {backfill.table}: {self._progress(scanned, total, changed, start_time)}")
+                    next_report = time.time() + PROGRESS_INTERVAL
+                if self.throttle:
+                    self.throttle.pause(time.time() - chunk_start)
+        except Exception as e:
+            if last:
+                raise Exception(f"{str(e)} (chunks through key {last} are committed)")
+            raise
+
+        waited = f", {self.throttle.waited:.1f}s throttled" if self.throttle and self.throttle.waited else ""
+        self.log(f"  ✓ {backfill.table}: {changed:,} rows changed in {time.time() - start_time:.1f}s{waited}")
+        return changed
+
+    def _progress(self, scanned, total, changed, start_time):
+        elapsed = time.time() - start_time
+        if total and scanned < total:
+            eta = elapsed / scanned * (total - scanned)
+            return (f"{scanned:,} / ~{total:,} rows ({scanned / total:.0%}), {changed:,} changed, "
+                    f"ETA {_format_duration(eta)}")
+        return f"{scanned:,} rows, {changed:,} changed, {_format_duration(elapsed)} elapsed"
+
+    def _fetchone(self, query, params=()):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            return tuple(rows[0]) if rows else None
+        finally:
+            cursor.close()
+
+
+def _format_duration(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds}s"
@@ -0,0 +1,551 @@
+"""
+Baseline squashing of long migration histories
+
+squash(tool, N) replays a tool's migration files up to version N into a scratch database
+and dumps what they built from the catalog - tables, seeded rows, indexes, foreign keys,
+views, routines and triggers - as one script, <tool>/<db>/baseline/V<N>__baseline.sql.
+Its header lists the files it covers with their checksums.
+
+A target whose history holds no applied migration for the tool runs the newest baseline
+instead of those files, records each covered file as applied by the baseline and then
+deploys the remaining tail as usual. A baseline whose covered files have since changed
+on disk is ignored and the full chain is replayed.
+
+Liquibase keeps changeSet checksums of its own in DATABASECHANGELOG, so its changelogs
+are not squashed here (Liquibase's changelogSync marks a pre-built schema as deployed).
+"""
+
+import os
+import re
+import time
+import datetime
+import decimal
+import uuid
+
+from .checksum import file_checksum, checksum_files
+from .connection import create_database, drop_database
+
+
+BASELINE_FOLDER = "baseline"
+BASELINE_PATTERN = re.compile(r'^V(\d+)__baseline\.sql$')
+# Header line per covered migration: "--   <file> <checksum>"
+SOURCE_PATTERN = re.compile(r'^--\s+(\S+\.sql)\s+([0-9a-fA-F]{32,})\s*$')
+
+# Rows per INSERT when dumping seeded data (SQL Server accepts at most 1000)
+INSERT_BATCH_ROWS = 100
+
+# Tools whose history tables the baseline can be recorded in
+SQUASH_TOOLS = ('bytebase', 'redgate')
+
+# MySQL views and routines carry the account that created them; the baseline runs as anyone
+DEFINER_PATTERN = re.compile(r"\s+DEFINER\s*=\s*(?:`[^`]*`|'[^']*'|\S+?)@(?:`[^`]*`|'[^']*'|\S+?)(?=\s)", re.IGNORECASE)
+
+
+def migration_version(filename):
+    """Numeric version of a migration file (its leading digits), or None"""
+    match = re.match(r'^(\d+)', filename)
+    return int(match.group(1)) if match else None
+
+
+def baseline_path(tool_dir, version):
+    return os.path.join(tool_dir, BASELINE_FOLDER, f"V{version:03d}__baseline.sql")
+
+
+def find_baseline(tool_dir):
+    """The newest Baseline in a tool's baseline folder, or None"""
+    folder = os.path.join(tool_dir, BASELINE_FOLDER)
+    if not os.path.isdir(folder):
+        return None
+    candidates = [(int(match.group(1)), name) for name in os.listdir(folder)
+                  for match in [BASELINE_PATTERN.match(name)] if match]
+    if not candidates:
+        return None
+    version, name = max(candidates)
+    return Baseline(os.path.join(folder, name), version)
+
+
+class Baseline:
+    """A squashed script covering every migration file up to version"""
+
+    def __init__(self, path, version):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.version = version
+        self.sources = {}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.startswith('--'):
+                    break
+                match = SOURCE_PATTERN.match(line.strip())
+                if match:
+                    self.sources[match.group(1)] = match.group(2).lower()
+
+    def covers(self, filename):
+        version = migration_version(filename)
+        return version is not None and version <= self.version
+
+    def stale_files(self, files):
+        """Covered (filename, path) files that were added or edited since the squash"""
+        covered = [(filename, path) for filename, path in files if self.covers(filename)]
+        digests = checksum_files([path for _, path in covered])
+        stale = [filename for filename, path in covered if self.sources.get(filename) != digests[path]]
+        stale.extend(sorted(set(self.sources) - {filename for filename, _ in covered}))
+        return stale
+
+
+class BaselineBuilder:
+    """Squashes a tool's migration files into a baseline script through a scratch database"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.settings = engine.settings
+        self.log = engine.log
+
+    def squash(self, tool, version=None):
+        """Write the baseline for files up to version (default: all); returns a summary dict"""
+        if tool not in SQUASH_TOOLS:
+            raise Exception(f"Cannot squash {tool} migrations: only {', '.join(SQUASH_TOOLS)} histories are supported")
+
+        files = [(filename, path) for filename, path in self.engine.migration_files(tool)
+                 if migration_version(filename) is not None]
+        if version is None:
+            version = max((migration_version(filename) for filename, _ in files), default=0)
+        covered = [(filename, path) for filename, path in files if migration_version(filename) <= version]
+        if not covered:
+            raise Exception(f"No {tool} migrations up to version {version} to squash")
+
+        scratch = f"{self.settings.database}_baseline_{os.getpid()}"
+        self.log(f"📦 Squashing {len(covered)} {tool} migrations into a baseline via scratch database {scratch}")
+        start_time = time.time()
+        create_database(self.settings, scratch)
+        try:
+            scratch_engine = self.engine.for_database(scratch, parallel_workers=1, online_schema_change=False,
+                                                      chunked_backfill=False)
+            for filename, path in covered:
+                self.engine.cancel.check()
+                conn = scratch_engine.connect()
+                try:
+                    scratch_engine._execute_sql_file(conn, path, self.settings.db_type,
+                                                     scratch_engine._raise_unless_already_applied)
+                except Exception as e:
+                    raise Exception(f"{filename} failed in the scratch database: {str(e)}")
+                finally:
+                    conn.close()
+                self.log(f"  ✓ Replayed {filename}")
+
+            target = baseline_path(self.engine.tool_dir(tool), version)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            conn = scratch_engine.connect()
+            try:
+                with open(target + ".tmp", 'w', encoding='utf-8') as out:
+                    self._write_header(out, tool, version, covered)
+                    if self.settings.db_type == "sqlserver":
+                        counts = SQLServerSchemaDump(conn).write(out)
+                    else:
+                        counts = MySQLSchemaDump(conn, scratch).write(out)
+                os.replace(target + ".tmp", target)
+            finally:
+                conn.close()
+                if os.path.exists(target + ".tmp"):
+                    os.remove(target + ".tmp")
+        finally:
+            self._drop_scratch(scratch)
+
+        self.log(f"✓ Baseline written to {target} ({counts['objects']} objects, {counts['rows']} rows, "
+                 f"{time.time() - start_time:.1f}s)")
+        return {
+            'path': target,
+            'version': version,
+            'files': [filename for filename, _ in covered],
+            'objects': counts['objects'],
+            'rows': counts['rows']
+        }
+
+    def _write_header(self, out, tool, version, covered):
+        out.write(f"-- Baseline: {tool} migrations up to version {version}\n")
+        out.write(f"-- Database: {self.settings.db_type.upper()}\n")
+        out.write(f"-- Generated: {time.strftime('%Y-%m-%d %H:%M:%S')} from a scratch database migrated with:\n")
+        for filename, path in covered:
+            out.write(f"--   {filename} {file_checksum(path)}\n")
+        out.write("\n")
+
+    def _drop_scratch(self, database):
+        try:
+            drop_database(self.settings, database)
+        except Exception as e:
+            self.log(f"⚠️ Warning: Could not drop scratch database {database}: {str(e)}")
+
+
+class MySQLSchemaDump:
+    """Writes a MySQL database's tables, rows, views, routines and triggers as a script
+
+    The definitions come from SHOW CREATE with the database name and DEFINER clause removed,
+    so they can be replayed into any database (template clones reuse them directly).
+    """
+
+    def __init__(self, conn, database):
+        self.conn = conn
+        self.database = database
+
+    def write(self, out):
+        counts = {'objects': 0, 'rows': 0}
+        tables, views = self.objects()
+
+        # Tables are written alphabetically, so foreign keys may point forward
+        out.write("SET FOREIGN_KEY_CHECKS = 0;\n\n")
+        for table in tables:
+            out.write(f"-- Table {table}\n{self.table_definition(table)};\n\n")
+            counts['rows'] += self._write_rows(out, table)
+            counts['objects'] += 1
+        out.write("SET FOREIGN_KEY_CHECKS = 1;\n\n")
+
+        for view, definition in self.view_definitions(views):
+            out.write(f"-- View {view}\n{definition};\n\n")
+            counts['objects'] += 1
+
+        programs = self.program_definitions()
+        if programs:
+            out.write("DELIMITER $$\n\n")
+            for kind, name, definition in programs:
+                out.write(f"-- {kind.capitalize()} {name}\n{definition}$$\n\n")
+                counts['objects'] += 1
+            out.write("DELIMITER ;\n")
+        return counts
+
+    def objects(self):
+        """(base tables, views) of the database, by name"""
+        objects = self._rows("SELECT TABLE_NAME, TABLE_TYPE FROM INFORMATION_SCHEMA.TABLES "
+                             "WHERE TABLE_SCHEMA = DATABASE() ORDER BY TABLE_NAME")
+        return ([name for name, kind in objects if kind == 'BASE TABLE'],
+                [name for name, kind in objects if kind == 'VIEW'])
+
+    def table_definition(self, table):
+        return self._unqualify(self._rows(f"SHOW CREATE TABLE {mysql_quote(table)}")[0][1])
+
+    def row_columns(self, table):
+        """(name, data type) of the columns that hold stored values (not generated ones)"""
+        table_name = table.replace("'", "''")
+        return [(name, data_type) for name, data_type, extra in self._rows(
+            "SELECT COLUMN_NAME, DATA_TYPE, EXTRA FROM INFORMATION_SCHEMA.COLUMNS "
+            f"WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = '{table_name}' ORDER BY ORDINAL_POSITION")
+            if not re.search(r'\b(?:VIRTUAL|STORED) GENERATED\b', str(extra), re.IGNORECASE)]
+
+    def view_definitions(self, views):
+        """(view, definition) ordered so views that use other views come after them"""
+        definitions = {view: self._unqualify(self._rows(f"SHOW CREATE VIEW {mysql_quote(view)}")[0][1])
+                       for view in views}
+        return [(view, definitions[view]) for view in dependency_order(definitions)]
+
+    def program_definitions(self):
+        """(kind, name, definition) of the stored routines, then the triggers"""
+        routines = self._rows("SELECT ROUTINE_TYPE, ROUTINE_NAME FROM INFORMATION_SCHEMA.ROUTINES "
+                              "WHERE ROUTINE_SCHEMA = DATABASE() ORDER BY ROUTINE_NAME")
+        triggers = self._rows("SELECT 'TRIGGER', TRIGGER_NAME FROM INFORMATION_SCHEMA.TRIGGERS "
+                              "WHERE TRIGGER_SCHEMA = DATABASE() ORDER BY EVENT_OBJECT_TABLE, ACTION_ORDER")
+        return [(kind, name, self._unqualify(self._rows(f"SHOW CREATE {kind} {mysql_quote(name)}")[0][2]))
+                for kind, name in routines + triggers]
+
+    def _write_rows(self, out, table):
+        columns = self.row_columns(table)
+        if not columns:
+            return 0
+        column_list = ", ".join(mysql_quote(name) for name, _ in columns)
+        # JSON may come back as bytes, which MySQL will not take as JSON text
+        selected = ", ".join(f"CAST({mysql_quote(name)} AS CHAR)" if str(data_type).lower() == 'json'
+                             else mysql_quote(name) for name, data_type in columns)
+        select = f"SELECT {selected} FROM {mysql_quote(table)}"
+        head = f"INSERT INTO {mysql_quote(table)} ({column_list}) VALUES\n"
+        return write_inserts(out, self.conn, select, head, lambda value: sql_literal(value, "mysql"))
+
+    def _unqualify(self, definition):
+        """Drop the database name and the DEFINER clause from a definition"""
+        definition = definition.replace(f"{mysql_quote(self.database)}.", "")
+        return DEFINER_PATTERN.sub("", definition)
+
+    def _rows(self, query):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query)
+            return [tuple(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+
+class SQLServerSchemaDump:
+    """Writes a SQL Server database's schemas, tables, rows, indexes, keys and modules as a script
+
+    Tables are built from sys.columns and the constraint catalogs; views, procedures,
+    functions and triggers are written from sys.sql_modules in creation order.
+    """
+
+    TABLES = """
+        SELECT t.object_id, s.name, t.name FROM sys.tables t
+        JOIN sys.schemas s ON s.schema_id = t.schema_id
+        WHERE t.is_ms_shipped = 0 ORDER BY t.create_date, t.object_id
+    """
+    COLUMNS = """
+        SELECT c.object_id, c.name, ty.name, c.max_length, c.precision, c.scale, c.is_nullable,
+               c.is_identity, ic.seed_value, ic.increment_value, dc.name, dc.definition,
+               cc.definition, cc.is_persisted
+        FROM sys.columns c
+        JOIN sys.tables t ON t.object_id = c.object_id
+        JOIN sys.types ty ON ty.user_type_id = c.user_type_id
+        LEFT JOIN sys.identity_columns ic ON ic.object_id = c.object_id AND ic.column_id = c.column_id
+        LEFT JOIN sys.default_constraints dc ON dc.object_id = c.default_object_id
+        LEFT JOIN sys.computed_columns cc ON cc.object_id = c.object_id AND cc.column_id = c.column_id
+        WHERE t.is_ms_shipped = 0 ORDER BY c.object_id, c.column_id
+    """
+    INDEXES = """
+        SELECT i.object_id, i.index_id, i.name, i.is_primary_key, i.is_unique_constraint, i.is_unique,
+               i.type_desc, i.filter_definition, c.name, ic.is_descending_key, ic.is_included_column
+        FROM sys.indexes i
+        JOIN sys.tables t ON t.object_id = i.object_id
+        JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+        JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+        WHERE t.is_ms_shipped = 0 AND i.type > 0
+        ORDER BY i.object_id, i.index_id, ic.is_included_column, ic.key_ordinal, ic.index_column_id
+    """
+    CHECKS = """
+        SELECT cc.parent_object_id, cc.name, cc.definition FROM sys.check_constraints cc
+        JOIN sys.tables t ON t.object_id = cc.parent_object_id
+        WHERE t.is_ms_shipped = 0 ORDER BY cc.parent_object_id, cc.name
+    """
+    FOREIGN_KEYS = """
+        SELECT fk.object_id, fk.name, fk.parent_object_id, rs.name, rt.name,
+               fk.delete_referential_action_desc, fk.update_referential_action_desc, pc.name, rc.name
+        FROM sys.foreign_keys fk
+        JOIN sys.foreign_key_columns fkc ON fkc.constraint_object_id = fk.object_id
+        JOIN sys.columns pc ON pc.object_id = fkc.parent_object_id AND pc.column_id = fkc.parent_column_id
+        JOIN sys.columns rc ON rc.object_id = fkc.referenced_object_id AND rc.column_id = fkc.referenced_column_id
+        JOIN sys.tables rt ON rt.object_id = fk.referenced_object_id
+        JOIN sys.schemas rs ON rs.schema_id = rt.schema_id
+        WHERE fk.is_ms_shipped = 0 ORDER BY fk.object_id, fkc.constraint_column_id
+    """
+    MODULES = """
+        SELECT s.name, o.name, o.type_desc, m.definition FROM sys.sql_modules m
+        JOIN sys.objects o ON o.object_id = m.object_id
+        JOIN sys.schemas s ON s.schema_id = o.schema_id
+        WHERE o.is_ms_shipped = 0 ORDER BY o.create_date, o.object_id
+    """
+    SCHEMAS = """
+        SELECT name FROM sys.schemas
+        WHERE schema_id IN (SELECT schema_id FROM sys.objects WHERE is_ms_shipped = 0) AND name <> 'dbo'
+        ORDER BY name
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def write(self, out):
+        counts = {'objects': 0, 'rows': 0}
+        for (schema,) in self._rows(self.SCHEMAS):
+            out.write(f"CREATE SCHEMA {mssql_quote(schema)}\nGO\n\n")
+
+        tables = self._rows(self.TABLES)
+        names = {object_id: f"{mssql_quote(schema)}.{mssql_quote(name)}" for object_id, schema, name in tables}
+        columns = self._group(self._rows(self.COLUMNS))
+        checks = self._group(self._rows(self.CHECKS))
+        indexes = {}
+        for row in self._rows(self.INDEXES):
+            indexes.setdefault(row[0], {}).setdefault(row[1], []).append(row)
+
+        # Keys that are part of the table definition, then data, then the remaining indexes and
+        # foreign keys, so the rows load without index maintenance or reference checks
+        for object_id, _, _ in tables:
+            table_indexes = list(indexes.get(object_id, {}).values())
+            definitions = [self._column(row) for row in columns.get(object_id, [])]
+            definitions.extend(self._key_constraint(rows) for rows in table_indexes
+                               if rows[0][3] or rows[0][4])
+            definitions.extend(f"CONSTRAINT {mssql_quote(name)} CHECK {definition}"
+                               for _, name, definition in checks.get(object_id, []))
+            out.write(f"-- Table {names[object_id]}\n")
+            out.write(f"CREATE TABLE {names[object_id]} (\n    " + ",\n    ".join(definitions) + "\n);\n\n")
+            counts['rows'] += self._write_rows(out, names[object_id], columns.get(object_id, []))
+            counts['objects'] += 1
+
+        for object_id, _, _ in tables:
+            for rows in indexes.get(object_id, {}).values():
+                if not (rows[0][3] or rows[0][4]):
+                    out.write(self._index(names[object_id], rows))
+
+        foreign_keys = {}
+        for row in self._rows(self.FOREIGN_KEYS):
+            foreign_keys.setdefault(row[0], []).append(row)
+        for rows in foreign_keys.values():
+            _, name, parent, ref_schema, ref_table, on_delete, on_update = rows[0][:7]
+            out.write(f"ALTER TABLE {names[parent]} ADD CONSTRAINT {mssql_quote(name)} FOREIGN KEY "
+                      f"({', '.join(mssql_quote(row[7]) for row in rows)}) REFERENCES "
+                      f"{mssql_quote(ref_schema)}.{mssql_quote(ref_table)} "
+                      f"({', '.join(mssql_quote(row[8]) for row in rows)})")
+            for action, rule in (('DELETE', on_delete), ('UPDATE', on_update)):
+                if rule and rule != 'NO_ACTION':
+                    out.write(f" ON {action} {rule.replace('_', ' ')}")
+            out.write(";\n")
+        out.write("GO\n\n")
+
+        # Each module must start its own batch
+        for schema, name, kind, definition in self._rows(self.MODULES):
+            if definition is None:
+                # WITH ENCRYPTION hides the definition
+                out.write(f"-- Skipped {kind.lower()} {schema}.{name}: definition is encrypted\n\n")
+                continue
+            out.write(f"-- {kind.replace('_', ' ').title()} {schema}.{name}\n{definition.strip()}\nGO\n\n")
+            counts['objects'] += 1
+        return counts
+
+    def _column(self, row):
+        (_, name, type_name, max_length, precision, scale, nullable, identity, seed, increment,
+         default_name, default, computed, persisted) = row
+        if computed is not None:
+            return f"{mssql_quote(name)} AS {computed}" + (" PERSISTED" if persisted else "")
+        definition = f"{mssql_quote(name)} {mssql_type(type_name, max_length, precision, scale)}"
+        if identity:
+            definition += f" IDENTITY({seed}, {increment})"
+        definition += " NULL" if nullable else " NOT NULL"
+        if default is not None:
+            definition += f" CONSTRAINT {mssql_quote(default_name)} DEFAULT {default}"
+        return definition
+
+    def _key_constraint(self, rows):
+        _, _, name, is_primary, _, _, type_desc = rows[0][:7]
+        kind = "PRIMARY KEY" if is_primary else "UNIQUE"
+        return f"CONSTRAINT {mssql_quote(name)} {kind} {type_desc} ({self._key_columns(rows)})"
+
+    def _index(self, table, rows):
+        _, _, name, _, _, unique, type_desc, filter_definition = rows[0][:8]
+        if type_desc not in ('CLUSTERED', 'NONCLUSTERED'):
+            return f"-- Skipped {type_desc.lower()} index {name} on {table}\n"
+        sql = (f"CREATE {'UNIQUE ' if unique else ''}{type_desc} INDEX {mssql_quote(name)} "
+               f"ON {table} ({self._key_columns(rows)})")
+        included = [mssql_quote(row[8]) for row in rows if row[10]]
+        if included:
+            sql += f" INCLUDE ({', '.join(included)})"
+        if filter_definition:
+            sql += f" WHERE {filter_definition}"
+        return sql + ";\n"
+
+    def _key_columns(self, rows):
+        return ", ".join(f"{mssql_quote(row[8])} {'DESC' if row[9] else 'ASC'}" for row in rows if not row[10])
+
+    def _write_rows(self, out, table, columns):
+        # Computed and rowversion columns cannot be inserted
+        insertable = [row for row in columns if row[12] is None and row[2] not in ('timestamp', 'rowversion')]
+        if not insertable:
+            return 0
+        column_list = ", ".join(mssql_quote(row[1]) for row in insertable)
+        identity = any(row[7] for row in insertable)
+        head = f"INSERT INTO {table} ({column_list}) VALUES\n"
+        if identity:
+            head = f"SET IDENTITY_INSERT {table} ON;\n" + head
+        tail = f"SET IDENTITY_INSERT {table} OFF;\n" if identity else ""
+        return write_inserts(out, self.conn, f"SELECT {column_list} FROM {table}", head,
+                             lambda value: sql_literal(value, "sqlserver"), tail)
+
+    def _group(self, rows):
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row[0], []).append(row)
+        return grouped
+
+    def _rows(self, query):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query)
+            return [tuple(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+
+def write_inserts(out, conn, select, head, literal, tail=""):
+    """Write a table's rows as multi-row INSERTs; returns the row count"""
+    cursor = conn.cursor()
+    count = 0
+    try:
+        cursor.execute(select)
+        while True:
+            rows = cursor.fetchmany(INSERT_BATCH_ROWS)
+            if not rows:
+                break
+            values = ",\n".join("(" + ", ".join(literal(value) for value in row) + ")" for row in rows)
+            out.write(head + values + ";\n" + tail)
+            count += len(rows)
+    finally:
+        cursor.close()
+    if count:
+        out.write("\n")
+    return count
+
+
+def sql_literal(value, db_type):
+    """A Python value from a driver as a SQL literal for db_type"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        hex_value = bytes(value).hex()
+        if db_type == "sqlserver":
+            return "0x" + hex_value
+        return f"X'{hex_value}'" if hex_value else "''"
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat(' ')
+    elif isinstance(value, (datetime.date, datetime.time, uuid.UUID)):
+        value = str(value)
+    elif isinstance(value, datetime.timedelta):
+        # MySQL TIME columns come back as timedelta
+        seconds = int(value.total_seconds())
+        sign = "-" if seconds < 0 else ""
+        seconds = abs(seconds)
+        value = f"{sign}{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    elif isinstance(value, (set, frozenset)):
+        value = ",".join(sorted(value))
+    text = str(value).replace("'", "''")
+    if db_type == "sqlserver":
+        return f"N'{text}'"
+    return "'" + text.replace("\\", "\\\\") + "'"
+
+
+def dependency_order(definitions):
+    """Names of definitions ordered so each comes after the others its text mentions"""
+    patterns = {name: re.compile(r'(?<![\w$])`?' + re.escape(name) + r'`?(?![\w$])', re.IGNORECASE)
+                for name in definitions}
+    ordered = []
+    visiting = set()
+
+    def visit(name):
+        if name in ordered or name in visiting:
+            return
+        visiting.add(name)
+        body = definitions[name].split(" AS ", 1)[-1]
+        for other in definitions:
+            if other != name and patterns[other].search(body):
+                visit(other)
+        visiting.discard(name)
+        ordered.append(name)
+
+    for name in sorted(definitions):
+        visit(name)
+    return ordered
+
+
+def mysql_quote(name):
+    return "`" + str(name).replace("`", "``") + "`"
+
+
+def mssql_quote(name):
+    return "[" + str(name).replace("]", "]]") + "]"
+
+
+def mssql_type(type_name, max_length, precision, scale):
+    """Column type as written in CREATE TABLE"""
+    if type_name in ('varchar', 'char', 'varbinary', 'binary'):
+        return f"{type_name}({'MAX' if max_length == -1 else max_length})"
+    if type_name in ('nvarchar', 'nchar'):
+        return f"{type_name}({'MAX' if max_length == -1 else max_length // 2})"
+    if type_name in ('decimal', 'numeric'):
+        return f"{type_name}({precision}, {scale})"
+    if type_name in ('datetime2', 'time', 'datetimeoffset'):
+        return f"{type_name}({scale})"
+    return type_name
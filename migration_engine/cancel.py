@@ -0,0 +1,84 @@
+"""
+Cancellation and statement timeouts for running migrations
+
+Every statement the engine sends is watched by a CancelToken. The watch knows how to
+interrupt that statement on the server - KILL QUERY from a second MySQL connection, or
+an ODBC cancel on the SQL Server cursor - so cancel() stops work that is blocking inside
+the driver, and a watch with a timeout does the same once the statement overruns.
+Interrupted statements fail like any other error, so their transaction is rolled back
+and the migration is recorded as FAILED (and can be resumed from its checkpoint).
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class MigrationCancelled(Exception):
+    """The migration was cancelled while it was running"""
+
+
+class CancelToken:
+    """Shared by the engines of one run and whoever may cancel it (the GUI, Ctrl+C)"""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._interrupts = []
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check(self):
+        """Raise MigrationCancelled once the run has been cancelled"""
+        if self._cancelled.is_set():
+            raise MigrationCancelled("Migration cancelled by user")
+
+    def cancel(self):
+        """Stop the run: interrupt every watched statement; no new statements will start"""
+        self._cancelled.set()
+        with self._lock:
+            interrupts = list(self._interrupts)
+        for interrupt in interrupts:
+            self._interrupt(interrupt)
+
+    @contextmanager
+    def watch(self, interrupt, timeout=0):
+        """Run the enclosed statement so that cancel() or an overrun of timeout seconds interrupts it
+
+        interrupt() must stop the statement from another thread. Errors caused by the
+        interruption come out as MigrationCancelled or a timeout error.
+        """
+        self.check()
+        timed_out = threading.Event()
+        timer = None
+        if timeout:
+            def expire():
+                timed_out.set()
+                self._interrupt(interrupt)
+            timer = threading.Timer(timeout, expire)
+            timer.daemon = True
+            timer.start()
+
+        with self._lock:
+            self._interrupts.append(interrupt)
+        try:
+            yield
+        except Exception as e:
+            if self._cancelled.is_set():
+                raise MigrationCancelled(f"Migration cancelled by user ({str(e)})")
+            if timed_out.is_set():
+                raise Exception(f"Statement timed out after {timeout:g}s and was cancelled on the server ({str(e)})")
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            with self._lock:
+                self._interrupts.remove(interrupt)
+
+    def _interrupt(self, interrupt):
+        try:
+            interrupt()
+        except Exception:
+            # The statement may have finished (and its session gone) in the meantime
+            pass
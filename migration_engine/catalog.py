@@ -0,0 +1,488 @@
+"""
+Catalog-snapshot preconditions for idempotent migrations
+
+Re-running migrations relies on guards the server evaluates - CREATE TABLE IF NOT EXISTS,
+IF NOT EXISTS (SELECT * FROM sys.objects ...) blocks - or on ignoring "already exists"
+errors. CatalogSnapshot reads the target's tables, views, columns, indexes, constraints,
+routines and triggers in one query when a tool run starts and answers those checks in
+memory, so statements that would change nothing are skipped before they reach the server.
+
+Only certain no-ops are skipped. Anything the run itself has touched since the snapshot
+is no longer trusted (its statements run as before), and a statement the snapshot cannot
+follow - CALL/EXEC of a procedure, USE, RENAME - stops all skipping for the rest of the run.
+"""
+
+import re
+
+
+SNAPSHOT_QUERIES = {
+    'mysql': """
+        SELECT CASE TABLE_TYPE WHEN 'VIEW' THEN 'VIEW' ELSE 'TABLE' END, TABLE_SCHEMA, NULL, TABLE_NAME
+        FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE()
+        UNION ALL SELECT 'COLUMN', TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME
+        FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = DATABASE()
+        UNION ALL SELECT 'INDEX', TABLE_SCHEMA, TABLE_NAME, INDEX_NAME
+        FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE()
+        UNION ALL SELECT 'CONSTRAINT', CONSTRAINT_SCHEMA, TABLE_NAME, CONSTRAINT_NAME
+        FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS WHERE CONSTRAINT_SCHEMA = DATABASE()
+        UNION ALL SELECT ROUTINE_TYPE, ROUTINE_SCHEMA, NULL, ROUTINE_NAME
+        FROM INFORMATION_SCHEMA.ROUTINES WHERE ROUTINE_SCHEMA = DATABASE()
+        UNION ALL SELECT 'TRIGGER', TRIGGER_SCHEMA, EVENT_OBJECT_TABLE, TRIGGER_NAME
+        FROM INFORMATION_SCHEMA.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()
+    """,
+    'sqlserver': """
+        SELECT CASE o.type WHEN 'U' THEN 'TABLE' WHEN 'V' THEN 'VIEW' WHEN 'P' THEN 'PROCEDURE'
+                           WHEN 'PC' THEN 'PROCEDURE' WHEN 'TR' THEN 'TRIGGER' WHEN 'SO' THEN 'SEQUENCE'
+                           ELSE 'FUNCTION' END, s.name, NULL, o.name
+        FROM sys.objects o JOIN sys.schemas s ON s.schema_id = o.schema_id
+        WHERE o.type IN ('U', 'V', 'P', 'PC', 'FN', 'IF', 'TF', 'FS', 'FT', 'TR', 'SO') AND o.is_ms_shipped = 0
+        UNION ALL SELECT 'COLUMN', s.name, t.name, c.name FROM sys.columns c
+        JOIN sys.tables t ON t.object_id = c.object_id JOIN sys.schemas s ON s.schema_id = t.schema_id
+        UNION ALL SELECT 'INDEX', s.name, t.name, i.name FROM sys.indexes i
+        JOIN sys.tables t ON t.object_id = i.object_id JOIN sys.schemas s ON s.schema_id = t.schema_id
+        WHERE i.name IS NOT NULL
+        UNION ALL SELECT 'CONSTRAINT', s.name, OBJECT_NAME(o.parent_object_id), o.name FROM sys.objects o
+        JOIN sys.schemas s ON s.schema_id = o.schema_id WHERE o.type IN ('F', 'PK', 'UQ', 'C', 'D')
+    """
+}
+
+# Current schema, and whether table names (MySQL) or all identifiers (SQL Server) are case-sensitive
+SETTINGS_QUERIES = {
+    'mysql': "SELECT DATABASE(), @@lower_case_table_names = 0",
+    'sqlserver': "SELECT SCHEMA_NAME(), CASE WHEN CONVERT(NVARCHAR(128), DATABASEPROPERTYEX(DB_NAME(), 'Collation')) "
+                 "LIKE '%[_]CS[_]%' THEN 1 ELSE 0 END"
+}
+
+# sys.objects type codes used in T-SQL guards
+SQLSERVER_TYPE_CODES = {
+    'U': 'TABLE', 'V': 'VIEW', 'P': 'PROCEDURE', 'PC': 'PROCEDURE', 'FN': 'FUNCTION', 'IF': 'FUNCTION',
+    'TF': 'FUNCTION', 'FS': 'FUNCTION', 'FT': 'FUNCTION', 'TR': 'TRIGGER', 'SO': 'SEQUENCE'
+}
+CATALOG_VIEW_TYPES = {
+    'sys.tables': 'TABLE', 'sys.views': 'VIEW', 'sys.procedures': 'PROCEDURE', 'sys.triggers': 'TRIGGER',
+    'sys.objects': None, 'sysobjects': None, 'information_schema.tables': None
+}
+NAMED_OBJECT_TYPES = ('TABLE', 'VIEW', 'PROCEDURE', 'FUNCTION', 'TRIGGER', 'SEQUENCE')
+
+NAME = r"(?:`[^`]+`|\[[^\]]+\]|\"[^\"]+\"|[\w$#@]+)"
+QUALIFIED_NAME = rf"{NAME}(?:\s*\.\s*{NAME}){{0,2}}"
+LITERAL = r"N?'((?:[^']|'')*)'"
+LITERAL_OR_NAME = rf"(?:{LITERAL}|({QUALIFIED_NAME}))"
+
+CREATE_PATTERN = re.compile(
+    rf"^\s*CREATE\s+(OR\s+(?:REPLACE|ALTER)\s+)?(?:(?:UNIQUE|FULLTEXT|SPATIAL|CLUSTERED|NONCLUSTERED|TEMPORARY|"
+    rf"ALGORITHM\s*=\s*\w+|DEFINER\s*=\s*\S+|SQL\s+SECURITY\s+\w+)\s+)*"
+    rf"(TABLE|VIEW|PROCEDURE|PROC|FUNCTION|TRIGGER|SEQUENCE|INDEX)\s+(IF\s+NOT\s+EXISTS\s+)?({QUALIFIED_NAME})"
+    rf"(?:\s+ON\s+({QUALIFIED_NAME}))?",
+    re.IGNORECASE
+)
+DROP_PATTERN = re.compile(
+    rf"^\s*DROP\s+(TABLE|VIEW|PROCEDURE|PROC|FUNCTION|TRIGGER|SEQUENCE|INDEX)\s+IF\s+EXISTS\s+({QUALIFIED_NAME})"
+    rf"(?:\s+ON\s+({QUALIFIED_NAME}))?\s*;?\s*$",
+    re.IGNORECASE
+)
+ALTER_TABLE_PATTERN = re.compile(rf"^\s*ALTER\s+TABLE\s+({QUALIFIED_NAME})\s+(.+?)\s*;?\s*$", re.IGNORECASE | re.DOTALL)
+ADD_INDEX_PATTERN = re.compile(
+    rf"^ADD\s+(?:UNIQUE\s+|FULLTEXT\s+|SPATIAL\s+)?(?:INDEX|KEY)\s+(?:IF\s+NOT\s+EXISTS\s+)?({NAME})\s*\(",
+    re.IGNORECASE
+)
+ADD_CONSTRAINT_PATTERN = re.compile(rf"^ADD\s+CONSTRAINT\s+({NAME})\s", re.IGNORECASE)
+ADD_COLUMN_PATTERN = re.compile(rf"^ADD\s+(?:COLUMN\s+)?(?:IF\s+NOT\s+EXISTS\s+)?({NAME})\s+\w", re.IGNORECASE)
+# ADD clauses that are not columns even though a name follows
+NOT_COLUMN_WORDS = ('INDEX', 'KEY', 'UNIQUE', 'FULLTEXT', 'SPATIAL', 'CONSTRAINT', 'PRIMARY', 'FOREIGN',
+                    'CHECK', 'PARTITION', 'COLUMN', 'DEFAULT', 'PERIOD')
+
+# T-SQL guards: IF [NOT] EXISTS (SELECT ... FROM <catalog> WHERE ...), OBJECT_ID(...) IS [NOT] NULL, COL_LENGTH(...)
+EXISTS_GUARD_PATTERN = re.compile(
+    r"^\s*IF\s+(NOT\s+)?EXISTS\s*\(\s*SELECT\s+(?:\*|1|TOP\s+1\s+\*|TOP\s+1\s+1|\w+)\s+FROM\s+"
+    r"((?:\[?\w+\]?\.)?\[?\w+\]?)\s+WHERE\s+",
+    re.IGNORECASE
+)
+OBJECT_ID_GUARD_PATTERN = re.compile(
+    rf"^\s*IF\s+OBJECT_ID\s*\(\s*{LITERAL}(?:\s*,\s*{LITERAL})?\s*\)\s+IS\s+(NOT\s+)?NULL\s+", re.IGNORECASE
+)
+COL_LENGTH_GUARD_PATTERN = re.compile(
+    rf"^\s*IF\s+COL_LENGTH\s*\(\s*{LITERAL}\s*,\s*{LITERAL}\s*\)\s+IS\s+(NOT\s+)?NULL\s+", re.IGNORECASE
+)
+# Predicates understood inside an EXISTS guard's WHERE clause
+GUARD_PREDICATES = (
+    ('object', re.compile(rf"^\s*(?:\w+\.)?(?:object_id|id)\s*=\s*OBJECT_ID\s*\(\s*{LITERAL}\s*(?:,\s*{LITERAL}\s*)?\)",
+                          re.IGNORECASE)),
+    ('name', re.compile(rf"^\s*(?:\w+\.)?(?:name|TABLE_NAME)\s*=\s*{LITERAL}", re.IGNORECASE)),
+    ('schema', re.compile(rf"^\s*(?:\w+\.)?(?:TABLE_SCHEMA)\s*=\s*{LITERAL}", re.IGNORECASE)),
+    ('schema_id', re.compile(rf"^\s*(?:\w+\.)?schema_id\s*=\s*SCHEMA_ID\s*\(\s*{LITERAL}\s*\)", re.IGNORECASE)),
+    ('type', re.compile(rf"^\s*(?:\w+\.)?(?:x?type)\s*(?:=\s*{LITERAL}|IN\s*\(((?:\s*N?'\w+'\s*,?)+)\))",
+                        re.IGNORECASE)),
+    ('table_type', re.compile(rf"^\s*(?:\w+\.)?TABLE_TYPE\s*=\s*{LITERAL}", re.IGNORECASE)),
+)
+
+# Statements that can follow a guard on their own
+GUARDED_VERBS = ('CREATE', 'ALTER', 'DROP', 'INSERT', 'UPDATE', 'DELETE', 'EXEC', 'EXECUTE', 'PRINT', 'SET',
+                 'SELECT', 'DECLARE', 'IF', 'MERGE', 'TRUNCATE', 'GRANT', 'WITH')
+
+# Statements whose effect on the catalog the snapshot cannot follow
+OPAQUE_PATTERN = re.compile(
+    r"^\s*(?:USE|RENAME|SOURCE|IMPORT)\b|\b(?:CALL|EXEC|EXECUTE)\s+(?!\(|sp_executesql\b|IMMEDIATE\b)[\w\[`@]",
+    re.IGNORECASE
+)
+# Objects named anywhere in a statement, dynamic SQL strings included, are treated as changed
+DDL_NAME_PATTERN = re.compile(
+    rf"\b(?:CREATE|ALTER|DROP)\s+(?:OR\s+\w+\s+)?(?:\w+\s+){{0,3}}?"
+    rf"(?:TABLE|VIEW|PROCEDURE|PROC|FUNCTION|TRIGGER|SEQUENCE|INDEX)\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?"
+    rf"({QUALIFIED_NAME})(?:\s+ON\s+({QUALIFIED_NAME}))?|\bINTO\s+({QUALIFIED_NAME})",
+    re.IGNORECASE
+)
+CODE_PATTERN = re.compile(r"N?'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+class CatalogSnapshot:
+    """In-memory view of the target's catalog, answering existence checks for statements"""
+
+    def __init__(self, db_type, default_schema, case_sensitive=False):
+        self.db_type = db_type
+        self.default_schema = default_schema
+        self.case_sensitive = case_sensitive
+        self.objects = {}
+        self.children = {}
+        self.changed = set()
+        self.opaque = False
+
+    @classmethod
+    def load(cls, conn, db_type):
+        """Snapshot of the connection's current database"""
+        cursor = conn.cursor()
+        try:
+            cursor.execute(SETTINGS_QUERIES[db_type])
+            default_schema, case_sensitive = cursor.fetchone()
+            snapshot = cls(db_type, str(default_schema), bool(case_sensitive))
+            cursor.execute(SNAPSHOT_QUERIES[db_type])
+            for kind, schema, table, name in cursor.fetchall():
+                snapshot.add(str(kind).upper(), str(schema), table and str(table), str(name))
+        finally:
+            cursor.close()
+        return snapshot
+
+    def add(self, kind, schema, table, name):
+        if kind in NAMED_OBJECT_TYPES:
+            self.objects.setdefault(self._key(name), {}).setdefault(self._key(schema), set()).add(kind)
+        else:
+            tables = self.children.setdefault(kind, {}).setdefault(self._key(table), {})
+            tables.setdefault(self._key(schema), set()).add(self._key(name, False))
+
+    def noop_reason(self, statement):
+        """Why the statement cannot change anything, or None when it has to run"""
+        if self.opaque:
+            return None
+        sql = statement['sql']
+        verb = statement['classification']['verb']
+        if verb == 'IF' and self.db_type == "sqlserver":
+            return self._guard_reason(sql)
+        if verb == 'CREATE':
+            return self._create_reason(sql)
+        if verb == 'DROP':
+            return self._drop_reason(sql)
+        if verb == 'ALTER':
+            return self._alter_reason(sql)
+        return None
+
+    def touch(self, statement):
+        """Forget what the snapshot knows about objects a statement that will run can change"""
+        sql = statement['sql']
+        if OPAQUE_PATTERN.search(CODE_PATTERN.sub(" ", sql)):
+            self.opaque = True
+            return
+        for change in statement['classification']['objects']:
+            self.changed.add(self._key(change['object_name']))
+            if change.get('table'):
+                self.changed.add(self._key(change['table']))
+        # Guarded blocks and dynamic SQL name their objects inside the text
+        for match in DDL_NAME_PATTERN.finditer(sql):
+            for name in match.groups():
+                if name:
+                    self.changed.add(self._key(_split(name)[1]))
+
+    def _create_reason(self, sql):
+        match = CREATE_PATTERN.match(sql)
+        if not match or match.group(1):
+            # CREATE OR REPLACE / CREATE OR ALTER always changes the object
+            return None
+        object_type = 'PROCEDURE' if match.group(2).upper() == 'PROC' else match.group(2).upper()
+        if object_type == 'INDEX':
+            if not match.group(5):
+                return None
+            schema, table = _split(match.group(5))
+            name = _split(match.group(4))[1]
+            if self._has_child('INDEX', schema, table, name):
+                return f"index {name} on {table} already exists"
+            return None
+        schema, name = _split(match.group(4))
+        if self._exists(object_type, schema, name):
+            return f"{object_type.lower()} {name} already exists"
+        return None
+
+    def _drop_reason(self, sql):
+        match = DROP_PATTERN.match(sql)
+        if not match:
+            return None
+        object_type = 'PROCEDURE' if match.group(1).upper() == 'PROC' else match.group(1).upper()
+        if object_type == 'INDEX':
+            if not match.group(3):
+                return None
+            schema, table = _split(match.group(3))
+            name = _split(match.group(2))[1]
+            if self._missing_child('INDEX', table, name):
+                return f"index {name} on {table} does not exist"
+            return None
+        if ',' in match.group(2):
+            return None
+        _, name = _split(match.group(2))
+        if self._missing(name):
+            return f"{object_type.lower()} {name} does not exist"
+        return None
+
+    def _alter_reason(self, sql):
+        """ALTER TABLE whose every clause adds a column, index or constraint that is already there"""
+        match = ALTER_TABLE_PATTERN.match(sql)
+        if not match:
+            return None
+        schema, table = _split(match.group(1))
+        clauses = _split_clauses(match.group(2))
+        if self.db_type == "sqlserver":
+            # T-SQL adds several columns with one ADD: ALTER TABLE t ADD a INT, b INT
+            clauses = clauses[:1] + ["ADD " + clause for clause in clauses[1:]]
+
+        present = []
+        for clause in clauses:
+            index_match = ADD_INDEX_PATTERN.match(clause)
+            constraint_match = ADD_CONSTRAINT_PATTERN.match(clause)
+            column_match = ADD_COLUMN_PATTERN.match(clause)
+            if index_match:
+                name = _unquote(index_match.group(1))
+                found = self._has_child('INDEX', schema, table, name)
+            elif constraint_match:
+                name = _unquote(constraint_match.group(1))
+                # MySQL keeps UNIQUE constraints as indexes; SQL Server keeps every constraint as an object
+                found = (self._has_child('CONSTRAINT', schema, table, name)
+                         or self._has_child('INDEX', schema, table, name))
+            elif column_match and _unquote(column_match.group(1)).upper() not in NOT_COLUMN_WORDS:
+                name = _unquote(column_match.group(1))
+                found = self._has_child('COLUMN', schema, table, name)
+            else:
+                return None
+            if not found:
+                return None
+            present.append(name)
+        return f"{', '.join(present)} already on {table}" if present else None
+
+    def _guard_reason(self, sql):
+        """T-SQL IF guard that the snapshot shows to be false, so its block would do nothing"""
+        code = CODE_PATTERN.sub(" ", sql)
+        if re.search(r"\bELSE\b", code, re.IGNORECASE):
+            return None
+
+        match = OBJECT_ID_GUARD_PATTERN.match(sql)
+        if match:
+            if not _single_body(sql[match.end():]):
+                return None
+            schema, name = _split(match.group(1).replace("''", "'"))
+            object_type = SQLSERVER_TYPE_CODES.get((match.group(2) or '').strip().upper())
+            return self._guard_verdict(bool(match.group(3)), object_type, schema, name)
+
+        match = COL_LENGTH_GUARD_PATTERN.match(sql)
+        if match:
+            if not _single_body(sql[match.end():]):
+                return None
+            schema, table = _split(match.group(1).replace("''", "'"))
+            column = match.group(2).replace("''", "'")
+            if match.group(3):
+                if self._missing_child('COLUMN', table, column):
+                    return f"column {column} is not on {table}"
+            elif self._has_child('COLUMN', schema, table, column):
+                return f"column {column} already on {table}"
+            return None
+
+        match = EXISTS_GUARD_PATTERN.match(sql)
+        if not match:
+            return None
+        source = match.group(2).replace('[', '').replace(']', '').lower()
+        predicates, end = _guard_predicates(sql, match.end())
+        if predicates is None or not _single_body(sql[end:]):
+            return None
+        wanted_missing = not match.group(1)
+
+        if source in ('sys.indexes', 'sys.columns', 'sys.foreign_keys', 'sys.check_constraints',
+                      'sys.default_constraints', 'sys.key_constraints'):
+            kind = {'sys.indexes': 'INDEX', 'sys.columns': 'COLUMN'}.get(source, 'CONSTRAINT')
+            if 'object' not in predicates or 'name' not in predicates or set(predicates) - {'object', 'name', 'type'}:
+                return None
+            schema, table = _split(predicates['object'][0])
+            name = predicates['name']
+            if wanted_missing:
+                if self._missing_child(kind, table, name):
+                    return f"{kind.lower()} {name} is not on {table}"
+            elif self._has_child(kind, schema, table, name):
+                return f"{kind.lower()} {name} already on {table}"
+            return None
+
+        if source not in CATALOG_VIEW_TYPES:
+            return None
+        if 'object' in predicates:
+            schema, name = _split(predicates['object'][0])
+        elif 'name' in predicates:
+            schema, name = predicates.get('schema'), predicates['name']
+        else:
+            return None
+        if 'object' in predicates and 'name' in predicates:
+            return None
+        object_type = CATALOG_VIEW_TYPES[source]
+        if 'type' in predicates:
+            types = {SQLSERVER_TYPE_CODES.get(code.upper()) for code in predicates['type']}
+            if None in types or len(types) != 1 or (object_type and types != {object_type}):
+                return None
+            object_type = types.pop()
+        if 'table_type' in predicates:
+            object_type = 'VIEW' if predicates['table_type'].upper() == 'VIEW' else 'TABLE'
+        return self._guard_verdict(wanted_missing, object_type, schema, name)
+
+    def _guard_verdict(self, wanted_missing, object_type, schema, name):
+        """Reason when a guard on object existence is known to be false"""
+        if wanted_missing:
+            if self._missing(name):
+                return f"{name} does not exist"
+            return None
+        if object_type and self._exists(object_type, schema, name):
+            return f"{object_type.lower()} {name} already exists"
+        if not object_type and self._exists(None, schema, name):
+            return f"{name} already exists"
+        return None
+
+    def _exists(self, object_type, schema, name):
+        """Certain that the object exists in the schema the statement would use"""
+        key = self._key(name)
+        if key in self.changed:
+            return False
+        schemas = self.objects.get(key, {})
+        kinds = schemas.get(self._key(schema or self.default_schema), set())
+        return bool(kinds) and (object_type is None or object_type in kinds)
+
+    def _missing(self, name):
+        """Certain that no object of that name exists in any schema"""
+        key = self._key(name)
+        return key not in self.changed and key not in self.objects
+
+    def _has_child(self, kind, schema, table, name):
+        """Certain that the table has the column, index or constraint"""
+        table_key = self._key(table)
+        if table_key in self.changed:
+            return False
+        tables = self.children.get(kind, {}).get(table_key, {})
+        names = tables.get(self._key(schema or self.default_schema), set())
+        return self._key(name, False) in names
+
+    def _missing_child(self, kind, table, name):
+        """Certain that no table of that name has the column, index or constraint"""
+        table_key = self._key(table)
+        if table_key in self.changed or table_key not in self.objects:
+            return False
+        key = self._key(name, False)
+        return all(key not in names for names in self.children.get(kind, {}).get(table_key, {}).values())
+
+    def _key(self, name, object_level=True):
+        """Lookup key for a name; MySQL only treats schema and object names case-sensitively"""
+        name = _unquote(str(name))
+        if self.case_sensitive and (object_level or self.db_type == "sqlserver"):
+            return name
+        return name.lower()
+
+
+def _guard_predicates(sql, start):
+    """({predicate: value} or None if the WHERE clause holds anything else, end of the EXISTS guard)"""
+    depth = 1
+    position = start
+    while position < len(sql) and depth:
+        if sql[position] == "'":
+            position = sql.index("'", position + 1) if "'" in sql[position + 1:] else len(sql)
+        elif sql[position] == '(':
+            depth += 1
+        elif sql[position] == ')':
+            depth -= 1
+        position += 1
+    where = sql[start:position - 1]
+
+    predicates = {}
+    remaining = where
+    while remaining.strip():
+        for name, pattern in GUARD_PREDICATES:
+            match = pattern.match(remaining)
+            if match:
+                break
+        else:
+            return None, position
+        if name == 'object':
+            predicates['object'] = (match.group(1).replace("''", "'"), match.group(2))
+            if match.group(2):
+                predicates['type'] = [match.group(2)]
+        elif name == 'type':
+            codes = [match.group(1)] if match.group(1) is not None else re.findall(r"'(\w+)'", match.group(2))
+            predicates['type'] = [code.strip() for code in codes]
+        else:
+            predicates[name] = match.group(1).replace("''", "'")
+        remaining = remaining[match.end():]
+        remaining = re.sub(r"^\s*AND\b", "", remaining, flags=re.IGNORECASE)
+    return predicates, position
+
+
+def _single_body(body):
+    """Whether the rest of a guarded statement is only the guard's own block
+
+    Without BEGIN ... END a T-SQL IF guards just the next statement, and the splitter may have
+    kept statements after it in the same chunk; those would run whatever the guard says.
+    """
+    code = CODE_PATTERN.sub(" ", body).strip().rstrip(';').strip()
+    words = re.findall(r"\b(BEGIN|CASE|END)\b", code, re.IGNORECASE)
+    if re.match(r"^BEGIN\b", code, re.IGNORECASE):
+        if not re.search(r"\bEND$", code, re.IGNORECASE):
+            return False
+        depth = 0
+        for index, word in enumerate(words):
+            depth += -1 if word.upper() == 'END' else 1
+            if depth == 0 and index < len(words) - 1:
+                return False
+        return depth == 0
+    if not re.match(rf"^(?:{'|'.join(GUARDED_VERBS)})\b", code, re.IGNORECASE) or ';' in code:
+        return False
+    return len(re.findall(rf"^\s*(?:{'|'.join(GUARDED_VERBS)})\b", code, re.IGNORECASE | re.MULTILINE)) == 1
+
+
+def _split_clauses(text):
+    """Top-level comma-separated clauses of an ALTER TABLE specification"""
+    clauses = []
+    depth = 0
+    current = []
+    for token in re.findall(r"'(?:[^']|'')*'|`[^`]*`|\[[^\]]*\]|[(),]|[^'`\[(),]+", text):
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        elif token == ',' and depth == 0:
+            clauses.append("".join(current).strip())
+            current = []
+            continue
+        current.append(token)
+    clauses.append("".join(current).strip())
+    return [clause for clause in clauses if clause]
+
+
+def _split(name):
+    """(schema or None, object) of a possibly qualified, quoted name"""
+    parts = [_unquote(part) for part in re.findall(NAME, name)]
+    if not parts:
+        return None, name
+    return (parts[-2] if len(parts) > 1 else None), parts[-1]
+
+
+def _unquote(name):
+    name = name.strip()
+    if len(name) > 1 and name[0] in '`["' and name[-1] in '`]"':
+        return name[1:-1]
+    return name
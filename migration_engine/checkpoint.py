@@ -0,0 +1,72 @@
+"""
+Statement-level checkpoints for resuming failed migrations
+
+While a file runs, the engine reports the last statement whose work is committed. The
+checkpoint (statement index and source byte offset) is stored on the migration's history
+row, so a rerun of a FAILED migration can skip straight past it instead of replaying
+hours of data changes.
+"""
+
+import time
+
+
+# Checkpoint writes are throttled to one per this many seconds; flush() always writes
+CHECKPOINT_MIN_INTERVAL = 2.0
+
+
+class CheckpointWriter:
+    """Records the last committed statement of a running migration in its history row
+
+    update_query takes (last_statement, last_offset, key) parameters. Writes use a
+    connection of their own so they never join the migration's transaction, and a failed
+    write never fails the migration.
+    """
+
+    def __init__(self, connect, update_query, key, min_interval=CHECKPOINT_MIN_INTERVAL):
+        self.connect = connect
+        self.update_query = update_query
+        self.key = key
+        self.min_interval = min_interval
+        self.pending = None
+        self.written = None
+        self._last_write = 0
+        self._conn = None
+
+    def record(self, statement):
+        """Note that statement and everything before it are committed"""
+        self.pending = (statement['index'], statement.get('offset'))
+        if time.monotonic() - self._last_write >= self.min_interval:
+            self.flush()
+
+    def reset(self):
+        """Clear a checkpoint left by an earlier run before replaying from the start"""
+        self.pending = (None, None)
+        self.written = None
+        self.flush()
+
+    def flush(self):
+        """Write the latest checkpoint if it has not been written yet"""
+        if self.pending is None or self.pending == self.written:
+            return
+        try:
+            if self._conn is None:
+                self._conn = self.connect()
+            cursor = self._conn.cursor()
+            cursor.execute(self.update_query, (self.pending[0], self.pending[1], self.key))
+            cursor.close()
+            self._conn.commit()
+            self.written = self.pending
+            self._last_write = time.monotonic()
+        except Exception:
+            # Checkpoints are an optimisation only - a rerun then replays from further back
+            pass
+
+    def close(self):
+        """Flush and release the tracking connection"""
+        self.flush()
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
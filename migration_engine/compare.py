@@ -0,0 +1,471 @@
+"""
+Native schema comparison and synchronization
+
+SchemaSnapshot reads a database's tables, columns, indexes, foreign keys, views and
+routines with one catalog query per kind, so even large schemas are read in a few round
+trips. SchemaDiff compares a source snapshot - a shadow database the migrations were
+applied to - with the target and writes the script that brings the target in line,
+ordered so every object exists before anything that depends on it:
+
+1. foreign keys, views, routines and indexes whose definition changed are dropped
+2. missing tables are created (without their foreign keys)
+3. missing columns are added and changed columns altered
+4. indexes and keys, then foreign keys, are created
+5. functions, views (each after the views it uses) and procedures are created
+
+The sync is additive: objects that only exist in the target - other tools' tables, the
+history tables, hand-made indexes - are reported but never dropped. The target may share
+tables with tools the shadow knows nothing about, so objects whose definition differs are
+only listed as comments; dropping and altering them (steps 1 and 3) needs alter=True.
+"""
+
+import re
+
+from .baseline import MySQLSchemaDump, SQLServerSchemaDump, dependency_order, mysql_quote, mssql_quote, mssql_type
+
+
+# Names SQL Server generates for unnamed constraints differ per database (PK__users__3213E83F...)
+SYSTEM_CONSTRAINT_NAME = re.compile(r'^(?:PK|UQ|DF|FK|CK)__.+__[0-9A-F]{8,16}$')
+
+# A FOREIGN KEY line of SHOW CREATE TABLE
+FOREIGN_KEY_LINE = re.compile(r'^\s*CONSTRAINT\s+`(?:[^`]|``)*`\s+FOREIGN KEY\b', re.IGNORECASE)
+
+# Module kinds in creation order; anything else (triggers) is left alone
+MODULE_ORDER = ('FUNCTION', 'VIEW', 'PROCEDURE')
+
+MYSQL_QUERIES = {
+    'columns': """
+        SELECT c.TABLE_NAME, c.COLUMN_NAME, c.COLUMN_TYPE, c.IS_NULLABLE, c.COLUMN_DEFAULT, c.EXTRA,
+               c.GENERATION_EXPRESSION, c.DATA_TYPE
+        FROM INFORMATION_SCHEMA.COLUMNS c
+        JOIN INFORMATION_SCHEMA.TABLES t ON t.TABLE_SCHEMA = c.TABLE_SCHEMA AND t.TABLE_NAME = c.TABLE_NAME
+        WHERE c.TABLE_SCHEMA = DATABASE() AND t.TABLE_TYPE = 'BASE TABLE'
+        ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION
+    """,
+    'indexes': """
+        SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SUB_PART, INDEX_TYPE
+        FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE()
+        ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+    """,
+    'foreign_keys': """
+        SELECT k.TABLE_NAME, k.CONSTRAINT_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME,
+               r.DELETE_RULE, r.UPDATE_RULE
+        FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE k
+        JOIN INFORMATION_SCHEMA.REFERENTIAL_CONSTRAINTS r
+          ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME
+         AND r.TABLE_NAME = k.TABLE_NAME
+        WHERE k.TABLE_SCHEMA = DATABASE() AND k.REFERENCED_TABLE_NAME IS NOT NULL
+        ORDER BY k.TABLE_NAME, k.CONSTRAINT_NAME, k.ORDINAL_POSITION
+    """,
+    'views': """
+        SELECT TABLE_NAME, VIEW_DEFINITION FROM INFORMATION_SCHEMA.VIEWS WHERE TABLE_SCHEMA = DATABASE()
+    """,
+    'routines': """
+        SELECT r.ROUTINE_TYPE, r.ROUTINE_NAME, r.ROUTINE_DEFINITION, r.DTD_IDENTIFIER,
+               (SELECT GROUP_CONCAT(CONCAT_WS(' ', p.PARAMETER_MODE, p.PARAMETER_NAME, p.DTD_IDENTIFIER)
+                                    ORDER BY p.ORDINAL_POSITION SEPARATOR ', ')
+                FROM INFORMATION_SCHEMA.PARAMETERS p
+                WHERE p.SPECIFIC_SCHEMA = r.ROUTINE_SCHEMA AND p.SPECIFIC_NAME = r.SPECIFIC_NAME
+                  AND p.ORDINAL_POSITION > 0)
+        FROM INFORMATION_SCHEMA.ROUTINES r WHERE r.ROUTINE_SCHEMA = DATABASE()
+    """
+}
+
+
+class SchemaSnapshot:
+    """One database's schema objects, keyed so the same object matches across databases
+
+    tables: {table key: {'name', 'columns': {column key: column}, 'order': [column keys]}}
+    indexes / foreign_keys: {(table key, key): {'name', 'table', 'definition', 'create', 'drop'}}
+    modules: {(kind, key): {'name', 'kind', 'definition', 'create', 'drop'}}
+
+    'definition' is what gets compared - database names and generated constraint names
+    are left out of it.
+    """
+
+    def __init__(self, conn, db_type, database, exclude=()):
+        self.conn = conn
+        self.db_type = db_type
+        self.database = database
+        # Tables (by name, without schema) that are not part of the compared schema
+        self.exclude = {self._key(name) for name in exclude}
+        self.tables = {}
+        self.indexes = {}
+        self.foreign_keys = {}
+        self.modules = {}
+
+    @classmethod
+    def load(cls, conn, db_type, database, exclude=()):
+        snapshot = cls(conn, db_type, database, exclude)
+        if db_type == "sqlserver":
+            snapshot._load_sqlserver()
+        else:
+            snapshot._load_mysql()
+        return snapshot
+
+    def object_count(self):
+        return len(self.tables) + len(self.indexes) + len(self.foreign_keys) + len(self.modules)
+
+    def create_table(self, key):
+        """CREATE TABLE for a table of this snapshot, without its foreign keys
+
+        SQL Server tables get their keys and indexes afterwards. MySQL takes them from
+        SHOW CREATE TABLE, since an AUTO_INCREMENT column must be a key from the start.
+        """
+        table = self.tables[key]
+        if self.db_type == "sqlserver":
+            columns = ",\n    ".join(column['create'] for column in self._columns(table))
+            return f"CREATE TABLE {table['name']} (\n    {columns}\n)"
+        definition = MySQLSchemaDump(self.conn, self.database).table_definition(key)
+        lines = [line for line in definition.split('\n') if not FOREIGN_KEY_LINE.match(line)]
+        return re.sub(r'\s+AUTO_INCREMENT=\d+', '', re.sub(r',\n\)', '\n)', '\n'.join(lines)))
+
+    def add_column(self, table_key, column_key):
+        table = self.tables[table_key]
+        column = table['columns'][column_key]
+        if self.db_type == "sqlserver":
+            return [f"ALTER TABLE {table['name']} ADD {column['create']}"]
+        position = table['order'].index(column_key)
+        after = f" AFTER {mysql_quote(table['columns'][table['order'][position - 1]]['name'])}" if position else " FIRST"
+        return [f"ALTER TABLE {table['name']} ADD COLUMN {column['create']}{after}"]
+
+    def alter_column(self, table_key, column_key, current):
+        """Statements turning the target's column (current) into this snapshot's column"""
+        table = self.tables[table_key]
+        column = table['columns'][column_key]
+        if self.db_type != "sqlserver":
+            return [f"ALTER TABLE {table['name']} MODIFY COLUMN {column['create']}"]
+        if column['fixed'] or current['fixed']:
+            return [f"-- {table['name']}.{mssql_quote(column['name'])} differs but identity and computed "
+                    f"columns cannot be altered in place"]
+        statements = []
+        if current['default_name'] and current['default'] != column['default']:
+            statements.append(f"ALTER TABLE {table['name']} DROP CONSTRAINT {mssql_quote(current['default_name'])}")
+        if (column['type'], column['nullable']) != (current['type'], current['nullable']):
+            statements.append(f"ALTER TABLE {table['name']} ALTER COLUMN {mssql_quote(column['name'])} "
+                              f"{column['type']} {'NULL' if column['nullable'] else 'NOT NULL'}")
+        if column['default'] is not None and current['default'] != column['default']:
+            name = f"CONSTRAINT {mssql_quote(column['default_name'])} " if column['named_default'] else ""
+            statements.append(f"ALTER TABLE {table['name']} ADD {name}DEFAULT {column['default']} "
+                              f"FOR {mssql_quote(column['name'])}")
+        return statements
+
+    def module_definition(self, module):
+        """CREATE statement of a module (MySQL reads it with SHOW CREATE only when needed)"""
+        if module['create'] is None:
+            dump = MySQLSchemaDump(self.conn, self.database)
+            if module['kind'] == 'VIEW':
+                module['create'] = dump.table_definition(module['name'])
+            else:
+                row = self._rows(f"SHOW CREATE {module['kind']} {mysql_quote(module['name'])}")[0]
+                module['create'] = dump._unqualify(str(row[2]))
+        return module['create']
+
+    def _columns(self, table):
+        return [table['columns'][key] for key in table['order']]
+
+    def _key(self, name):
+        # SQL Server identifiers follow the (normally case-insensitive) database collation
+        return str(name).lower() if self.db_type == "sqlserver" else str(name)
+
+    def _load_mysql(self):
+        rows = {kind: [row for row in self._rows(query) if kind in ('views', 'routines') or row[0] not in self.exclude]
+                for kind, query in MYSQL_QUERIES.items()}
+
+        for table, name, column_type, nullable, default, extra, expression, data_type in rows['columns']:
+            definition = _mysql_column(name, column_type, nullable, default, extra, expression, data_type)
+            entry = self.tables.setdefault(table, {'name': mysql_quote(table), 'columns': {}, 'order': []})
+            entry['columns'][name] = {'name': name, 'definition': definition, 'create': definition}
+            entry['order'].append(name)
+
+        grouped = {}
+        for table, name, non_unique, column, sub_part, index_type in rows['indexes']:
+            grouped.setdefault((table, name), []).append((non_unique, column, sub_part, index_type))
+        for (table, name), parts in grouped.items():
+            columns = ", ".join(mysql_quote(column) + (f"({sub_part})" if sub_part else "")
+                                for _, column, sub_part, _ in parts if column is not None)
+            if any(column is None for _, column, _, _ in parts):
+                # Functional index parts (MySQL 8.0.13+) are not in STATISTICS.COLUMN_NAME
+                continue
+            if name == 'PRIMARY':
+                create = f"ALTER TABLE {mysql_quote(table)} ADD PRIMARY KEY ({columns})"
+                drop = f"ALTER TABLE {mysql_quote(table)} DROP PRIMARY KEY"
+            else:
+                kind = {'FULLTEXT': 'FULLTEXT ', 'SPATIAL': 'SPATIAL '}.get(parts[0][3], '' if parts[0][0] else 'UNIQUE ')
+                create = f"CREATE {kind}INDEX {mysql_quote(name)} ON {mysql_quote(table)} ({columns})"
+                drop = f"DROP INDEX {mysql_quote(name)} ON {mysql_quote(table)}"
+            self.indexes[(table, name)] = {'name': name, 'table': table, 'definition': create,
+                                           'create': create, 'drop': drop}
+
+        grouped = {}
+        for table, name, column, ref_table, ref_column, on_delete, on_update in rows['foreign_keys']:
+            grouped.setdefault((table, name), []).append((column, ref_table, ref_column, on_delete, on_update))
+        for (table, name), parts in grouped.items():
+            create = (f"ALTER TABLE {mysql_quote(table)} ADD CONSTRAINT {mysql_quote(name)} FOREIGN KEY "
+                      f"({', '.join(mysql_quote(part[0]) for part in parts)}) REFERENCES {mysql_quote(parts[0][1])} "
+                      f"({', '.join(mysql_quote(part[2]) for part in parts)}) "
+                      f"ON DELETE {parts[0][3]} ON UPDATE {parts[0][4]}")
+            self.foreign_keys[(table, name)] = {
+                'name': name, 'table': table, 'definition': create, 'create': create,
+                'drop': f"ALTER TABLE {mysql_quote(table)} DROP FOREIGN KEY {mysql_quote(name)}"}
+
+        qualifier = f"{mysql_quote(self.database)}."
+        for name, body in rows['views']:
+            self.modules[('VIEW', name)] = {
+                'name': name, 'kind': 'VIEW', 'definition': _normalize(str(body or '').replace(qualifier, '')),
+                'create': None, 'drop': f"DROP VIEW IF EXISTS {mysql_quote(name)}"}
+        for kind, name, body, returns, parameters in rows['routines']:
+            self.modules[(kind, name)] = {
+                'name': name, 'kind': kind, 'definition': _normalize(f"({parameters or ''}) {returns or ''} {body or ''}"),
+                'create': None, 'drop': f"DROP {kind} IF EXISTS {mysql_quote(name)}"}
+
+    def _load_sqlserver(self):
+        dump = SQLServerSchemaDump(self.conn)
+        tables = {object_id: (schema, name) for object_id, schema, name in self._rows(dump.TABLES)
+                  if self._key(name) not in self.exclude}
+        names = {object_id: f"{mssql_quote(schema)}.{mssql_quote(name)}" for object_id, (schema, name) in tables.items()}
+        keys = {object_id: self._key(f"{schema}.{name}") for object_id, (schema, name) in tables.items()}
+        for object_id in tables:
+            self.tables[keys[object_id]] = {'name': names[object_id], 'columns': {}, 'order': []}
+
+        for row in self._rows(dump.COLUMNS):
+            (object_id, name, type_name, max_length, precision, scale, nullable, identity, _, _,
+             default_name, default, computed, _) = row
+            if object_id not in tables:
+                continue
+            create = dump._column(row)
+            named_default = bool(default_name) and not SYSTEM_CONSTRAINT_NAME.match(default_name)
+            if default_name and not named_default:
+                # Let the server name it again rather than reuse another database's generated name
+                create = create.replace(f" CONSTRAINT {mssql_quote(default_name)}", "")
+            definition = re.sub(r" CONSTRAINT \[(?:[^\]]|\]\])*\] DEFAULT ", " DEFAULT ", create)
+            table = self.tables[keys[object_id]]
+            table['columns'][self._key(name)] = {
+                'name': name, 'definition': definition, 'create': create,
+                'type': mssql_type(type_name, max_length, precision, scale), 'nullable': bool(nullable),
+                'default': default, 'default_name': default_name, 'named_default': named_default,
+                'fixed': bool(identity) or computed is not None}
+            table['order'].append(self._key(name))
+
+        grouped = {}
+        for row in self._rows(dump.INDEXES):
+            if row[0] in tables:
+                grouped.setdefault((row[0], row[1]), []).append(row)
+        for (object_id, _), rows in grouped.items():
+            name, is_primary, is_unique_constraint = rows[0][2], rows[0][3], rows[0][4]
+            table = names[object_id]
+            generated = bool(SYSTEM_CONSTRAINT_NAME.match(name))
+            if is_primary or is_unique_constraint:
+                constraint = dump._key_constraint(rows)
+                if generated:
+                    constraint = constraint.replace(f"CONSTRAINT {mssql_quote(name)} ", "")
+                create = f"ALTER TABLE {table} ADD {constraint}"
+                drop = f"ALTER TABLE {table} DROP CONSTRAINT {mssql_quote(name)}"
+            else:
+                create = dump._index(table, rows).strip().rstrip(';')
+                if create.startswith('--'):
+                    continue
+                drop = f"DROP INDEX {mssql_quote(name)} ON {table}"
+            definition = create.replace(mssql_quote(name), "") if generated else create
+            key = ('PRIMARY KEY' if is_primary else definition) if generated else self._key(name)
+            self.indexes[(keys[object_id], key)] = {'name': name, 'table': keys[object_id],
+                                                    'definition': definition, 'create': create, 'drop': drop}
+
+        grouped = {}
+        for row in self._rows(dump.FOREIGN_KEYS):
+            if row[2] in tables:
+                grouped.setdefault(row[0], []).append(row)
+        for rows in grouped.values():
+            _, name, parent, ref_schema, ref_table, on_delete, on_update = rows[0][:7]
+            generated = bool(SYSTEM_CONSTRAINT_NAME.match(name))
+            create = (f"ALTER TABLE {names[parent]} ADD {'' if generated else f'CONSTRAINT {mssql_quote(name)} '}"
+                      f"FOREIGN KEY ({', '.join(mssql_quote(row[7]) for row in rows)}) "
+                      f"REFERENCES {mssql_quote(ref_schema)}.{mssql_quote(ref_table)} "
+                      f"({', '.join(mssql_quote(row[8]) for row in rows)})")
+            for action, rule in (('DELETE', on_delete), ('UPDATE', on_update)):
+                if rule and rule != 'NO_ACTION':
+                    create += f" ON {action} {rule.replace('_', ' ')}"
+            key = create if generated else self._key(name)
+            self.foreign_keys[(keys[parent], key)] = {
+                'name': name, 'table': keys[parent], 'definition': create, 'create': create,
+                'drop': f"ALTER TABLE {names[parent]} DROP CONSTRAINT {mssql_quote(name)}"}
+
+        for schema, name, type_desc, definition in self._rows(dump.MODULES):
+            kind = 'VIEW' if type_desc == 'VIEW' else 'PROCEDURE' if 'PROCEDURE' in type_desc else \
+                'FUNCTION' if 'FUNCTION' in type_desc else None
+            if kind is None or definition is None:
+                continue
+            qualified = f"{mssql_quote(schema)}.{mssql_quote(name)}"
+            self.modules[(kind, self._key(f"{schema}.{name}"))] = {
+                'name': qualified, 'kind': kind, 'definition': _normalize(definition),
+                'create': definition.strip(), 'drop': f"DROP {kind} {qualified}"}
+
+    def _rows(self, query):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query)
+            return [tuple(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+
+class SchemaDiff:
+    """Differences between a source and a target snapshot, and the script that syncs the target
+
+    differences: [(change, object type, object name)] with change 'add', 'change' or
+    'extra' (only in the target, left in place). statements: [(sql, is_program)] in the
+    order they must run; is_program marks MySQL routines, which need their own delimiter.
+    Changed objects are altered, or dropped and recreated, only with alter=True.
+    """
+
+    def __init__(self, source, target, alter=False):
+        self.source = source
+        self.target = target
+        self.alter = alter
+        self.db_type = source.db_type
+        self.differences = []
+        self.statements = []
+        self._compare()
+
+    def write_script(self, out):
+        """Write the sync script: GO batches on SQL Server, DELIMITER blocks for MySQL routines"""
+        for sql, is_program in self.statements:
+            if sql.startswith('--'):
+                out.write(f"{sql}\n\n")
+            elif self.db_type == "sqlserver":
+                out.write(f"{sql}\nGO\n\n")
+            elif is_program:
+                out.write(f"DELIMITER $$\n{sql}$$\nDELIMITER ;\n\n")
+            else:
+                out.write(f"{sql};\n\n")
+
+    def _compare(self):
+        source, target = self.source, self.target
+        new_tables = [key for key in source.tables if key not in target.tables]
+        changed_columns = []
+        new_columns = []
+        for key, table in source.tables.items():
+            if key not in target.tables:
+                continue
+            current = target.tables[key]['columns']
+            for column_key in table['order']:
+                if column_key not in current:
+                    new_columns.append((key, column_key))
+                elif current[column_key]['definition'] != table['columns'][column_key]['definition']:
+                    changed_columns.append((key, column_key))
+            self._extra('COLUMN', [f"{table['name']}.{current[column_key]['name']}"
+                                   for column_key in target.tables[key]['order'] if column_key not in table['columns']])
+        self._extra('TABLE', [target.tables[key]['name'] for key in target.tables if key not in source.tables])
+
+        indexes = self._changes('indexes', 'INDEX')
+        foreign_keys = self._changes('foreign_keys', 'FOREIGN KEY')
+        modules = {kind: self._changes('modules', kind, lambda key: key[0] == kind) for kind in MODULE_ORDER}
+
+        if not self.alter:
+            # Listed for review only - the target's definition is left as it is
+            for table_key, column_key in changed_columns:
+                self.differences.append(('change', 'COLUMN', self._column_name(table_key, column_key)))
+            for change, object_type, name in self.differences:
+                if change == 'change':
+                    self._add(f"-- Left unchanged: {object_type.lower()} {name} differs from the migrations")
+            changed_columns = []
+            for changes in [indexes, foreign_keys] + list(modules.values()):
+                changes['changed'] = []
+
+        # Dependents go first: foreign keys, then views and routines, then indexes
+        for key in foreign_keys['changed']:
+            self._add(target.foreign_keys[key]['drop'])
+        for kind in reversed(MODULE_ORDER):
+            for key in modules[kind]['changed']:
+                self._add(target.modules[key]['drop'])
+        for key in indexes['changed']:
+            self._add(target.indexes[key]['drop'])
+
+        for key in new_tables:
+            self.differences.append(('add', 'TABLE', source.tables[key]['name']))
+            self._add(source.create_table(key))
+        for table_key, column_key in new_columns:
+            self.differences.append(('add', 'COLUMN', self._column_name(table_key, column_key)))
+            for sql in source.add_column(table_key, column_key):
+                self._add(sql)
+        for table_key, column_key in changed_columns:
+            self.differences.append(('change', 'COLUMN', self._column_name(table_key, column_key)))
+            for sql in source.alter_column(table_key, column_key, target.tables[table_key]['columns'][column_key]):
+                self._add(sql)
+
+        # MySQL tables are created with their indexes already
+        created = set(new_tables) if self.db_type != "sqlserver" else set()
+        for key in indexes['changed'] + indexes['added']:
+            if source.indexes[key]['table'] not in created:
+                self._add(source.indexes[key]['create'])
+        for key in foreign_keys['changed'] + foreign_keys['added']:
+            self._add(source.foreign_keys[key]['create'])
+
+        for kind in MODULE_ORDER:
+            keys = modules[kind]['changed'] + modules[kind]['added']
+            definitions = {key: source.module_definition(source.modules[key]) for key in keys}
+            # Views are matched against each other's text by name, without schema or quotes
+            by_name = {key[1].split('.')[-1] if self.db_type == "sqlserver" else key[1]: key for key in keys}
+            if kind == 'VIEW' and len(by_name) == len(keys):
+                keys = [by_name[name] for name in dependency_order(
+                    {name: definitions[key] for name, key in by_name.items()})]
+            for key in keys:
+                self._add(definitions[key], is_program=self.db_type != "sqlserver" and kind != 'VIEW')
+
+    def _changes(self, attribute, object_type, selected=lambda key: True):
+        """{'added': [keys], 'changed': [keys]} for one kind of object, recording the differences"""
+        source = {key: entry for key, entry in getattr(self.source, attribute).items() if selected(key)}
+        target = {key: entry for key, entry in getattr(self.target, attribute).items() if selected(key)}
+        added = [key for key in source if key not in target]
+        changed = [key for key in source if key in target and source[key]['definition'] != target[key]['definition']]
+        self.differences.extend(('add', object_type, self._label(self.source, source[key])) for key in added)
+        self.differences.extend(('change', object_type, self._label(self.source, source[key])) for key in changed)
+        # Indexes and keys of tables that are themselves extra are not listed again
+        self._extra(object_type, [self._label(self.target, entry) for key, entry in target.items() if key not in source
+                                  and ('table' not in entry or entry['table'] in self.source.tables)])
+        return {'added': added, 'changed': changed}
+
+    def _label(self, snapshot, entry):
+        """Object name for the differences; indexes and keys are named after their table"""
+        if 'table' not in entry:
+            return entry['name']
+        return f"{snapshot.tables[entry['table']]['name']}.{entry['name']}"
+
+    def _column_name(self, table_key, column_key):
+        table = self.source.tables[table_key]
+        return f"{table['name']}.{table['columns'][column_key]['name']}"
+
+    def _extra(self, object_type, names):
+        self.differences.extend(('extra', object_type, name) for name in names)
+
+    def _add(self, sql, is_program=False):
+        self.statements.append((sql, is_program))
+
+
+def _mysql_column(name, column_type, nullable, default, extra, expression, data_type):
+    """Column definition as MODIFY/ADD COLUMN takes it, from INFORMATION_SCHEMA.COLUMNS"""
+    extra = str(extra or '')
+    definition = f"{mysql_quote(name)} {column_type}"
+    generated = re.search(r'\b(VIRTUAL|STORED) GENERATED\b', extra, re.IGNORECASE)
+    if generated:
+        definition += f" GENERATED ALWAYS AS ({expression}) {generated.group(1).upper()}"
+    definition += " NULL" if nullable == 'YES' else " NOT NULL"
+    if default is not None and not generated:
+        if 'DEFAULT_GENERATED' in extra.upper():
+            expression_default = str(default)
+            definition += f" DEFAULT {expression_default}" if expression_default.upper().startswith('CURRENT_TIMESTAMP') \
+                else f" DEFAULT ({expression_default})"
+        elif str(data_type).lower() in ('tinyint', 'smallint', 'mediumint', 'int', 'bigint', 'decimal',
+                                        'float', 'double', 'bit'):
+            definition += f" DEFAULT {default}"
+        else:
+            definition += " DEFAULT '" + str(default).replace("\\", "\\\\").replace("'", "''") + "'"
+    extra = re.sub(r'\b(?:DEFAULT_GENERATED|VIRTUAL GENERATED|STORED GENERATED)\b', '', extra, flags=re.IGNORECASE)
+    if extra.strip():
+        definition += f" {extra.strip().upper() if 'on update' not in extra.lower() else extra.strip()}"
+    return definition
+
+
+def _normalize(definition):
+    """Module text compared without line ending and surrounding whitespace differences"""
+    return "\n".join(line.rstrip() for line in str(definition).replace('\r\n', '\n').strip().split('\n'))
@@ -0,0 +1,182 @@
+"""
+Database connections for MySQL (mysql-connector) and SQL Server (pyodbc)
+
+Drivers are imported on first use so the command line starts without loading them.
+"""
+
+
+def connect(settings):
+    """Open a database connection for ConnectionSettings"""
+    try:
+        db_type = settings.db_type
+
+        if db_type == "mysql":
+            # MySQL connection (multi-statement packets are used by batch mode)
+            import mysql.connector
+            from mysql.connector.constants import ClientFlag
+            connection = mysql.connector.connect(
+                host=settings.host,
+                port=int(settings.port),
+                user=settings.username,
+                password=settings.password,
+                database=settings.database,
+                client_flags=[ClientFlag.MULTI_STATEMENTS, ClientFlag.MULTI_RESULTS]
+            )
+            _apply_timeouts(connection, settings)
+            return connection
+
+        elif db_type == "sqlserver":
+            # SQL Server connection using pyodbc
+            import pyodbc
+            host = settings.host
+            port = settings.port
+            database = settings.database
+            driver = settings.driver
+
+            # Handle different SQL Server connection formats
+            if "\\" in host:
+                # Named instance format (e.g., localhost\SQLEXPRESS)
+                if "," in host:
+                    # Already has port specified (e.g., localhost\SQLEXPRESS,14766)
+                    server = host
+                else:
+                    # Try with dynamic port first, then standard port
+                    server = f"{host},14766"  # Use discovered dynamic port
+            else:
+                # Regular host format
+                server = f"{host},{port}"
+
+            try:
+                connection = pyodbc.connect(_sqlserver_connection_string(settings, driver, server, database))
+            except Exception as e:
+                connection = None
+                # If dynamic port fails, try standard connection formats
+                alternate_servers = [
+                    f"{host.split(',')[0]}",  # Just the host without port
+                    f"{host.split(',')[0]},1433",  # Standard port
+                    ".\\SQLEXPRESS",  # Named pipes format
+                    "(local)\\SQLEXPRESS"  # Local format
+                ]
+
+                for alt_server in alternate_servers:
+                    try:
+                        connection = pyodbc.connect(_sqlserver_connection_string(settings, driver, alt_server, database))
+                        break
+                    except:
+                        continue
+
+                # If all attempts fail, raise the original error
+                if connection is None:
+                    raise e
+
+            _apply_timeouts(connection, settings)
+            return connection
+
+        else:
+            raise Exception(f"Unsupported database type: {db_type}")
+
+    except Exception as e:
+        raise Exception(f"Database connection failed: {str(e)}")
+
+
+def connect_server(settings):
+    """Connection to the target's server rather than its database, for creating and dropping databases
+
+    SQL Server connects to master, which cannot be dropped or restored over while in use,
+    and runs in autocommit because CREATE/DROP/BACKUP/RESTORE DATABASE refuse transactions.
+    """
+    from .settings import ConnectionSettings
+    values = settings.to_dict()
+    values['database'] = "master" if settings.db_type == "sqlserver" else "information_schema"
+    connection = connect(ConnectionSettings.from_dict(values))
+    if settings.db_type == "sqlserver":
+        connection.autocommit = True
+        # Restores take as long as they take; statement_timeout is meant for migrations
+        connection.timeout = 0
+    return connection
+
+
+def create_database(settings, database):
+    """CREATE DATABASE on the server of settings (scratch, template and shadow databases)"""
+    from .baseline import mysql_quote, mssql_quote
+    conn = connect_server(settings)
+    try:
+        cursor = conn.cursor()
+        if settings.db_type == "sqlserver":
+            cursor.execute(f"CREATE DATABASE {mssql_quote(database)}")
+        else:
+            cursor.execute(f"CREATE DATABASE {mysql_quote(database)}")
+        cursor.close()
+    except Exception as e:
+        raise Exception(f"Failed to create database {database}: {str(e)}")
+    finally:
+        conn.close()
+
+
+def drop_database(settings, database):
+    """DROP DATABASE IF EXISTS on the server of settings"""
+    from .baseline import mysql_quote, mssql_quote
+    conn = connect_server(settings)
+    try:
+        cursor = conn.cursor()
+        if settings.db_type == "sqlserver":
+            # Sessions still using it (pooled connections included) are rolled back first
+            name = str(database).replace("'", "''")
+            cursor.execute(f"IF DB_ID(N'{name}') IS NOT NULL "
+                           f"ALTER DATABASE {mssql_quote(database)} SET SINGLE_USER WITH ROLLBACK IMMEDIATE")
+            cursor.execute(f"DROP DATABASE IF EXISTS {mssql_quote(database)}")
+        else:
+            cursor.execute(f"DROP DATABASE IF EXISTS {mysql_quote(database)}")
+        cursor.close()
+    except Exception as e:
+        raise Exception(f"Failed to drop database {database}: {str(e)}")
+    finally:
+        conn.close()
+
+
+def _apply_timeouts(connection, settings):
+    """Session limits for statement run time and lock waits (0 keeps the server defaults)
+
+    MySQL's max_execution_time only covers SELECT; the engine cancels other statements
+    that overrun with KILL QUERY. pyodbc's query timeout covers every SQL Server statement.
+    """
+    cursor = connection.cursor()
+    try:
+        if settings.db_type == "mysql":
+            limits = []
+            if settings.statement_timeout:
+                limits.append(f"max_execution_time = {settings.statement_timeout * 1000}")
+            if settings.lock_timeout:
+                limits.append(f"lock_wait_timeout = {settings.lock_timeout}")
+                limits.append(f"innodb_lock_wait_timeout = {settings.lock_timeout}")
+            if limits:
+                cursor.execute("SET SESSION " + ", ".join(limits))
+        else:
+            if settings.statement_timeout:
+                connection.timeout = settings.statement_timeout
+            if settings.lock_timeout:
+                cursor.execute(f"SET LOCK_TIMEOUT {settings.lock_timeout * 1000}")
+    finally:
+        cursor.close()
+
+
+def _sqlserver_connection_string(settings, driver, server, database):
+    """ODBC connection string using Windows or SQL Server authentication"""
+    if settings.trusted_connection:
+        # Windows Authentication - recommended for SQL Server Express
+        connection_string = f"""
+        DRIVER={{{driver}}};
+        SERVER={server};
+        DATABASE={database};
+        Trusted_Connection=yes;
+        """
+    else:
+        # SQL Server Authentication
+        connection_string = f"""
+        DRIVER={{{driver}}};
+        SERVER={server};
+        DATABASE={database};
+        UID={settings.username};
+        PWD={settings.password};
+        """
+    return connection_string.strip()
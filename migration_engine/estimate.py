@@ -0,0 +1,328 @@
+"""
+Pre-run duration estimates for pending migrations
+
+Each statement is costed from the target's catalog before anything runs:
+
+- every statement pays a round trip, plus transfer time for its text
+- ALTER TABLE costs nothing when it is predicted to run INSTANT, a scan of the table
+  when it builds an index, and a full copy when the table has to be rebuilt
+- CREATE INDEX scans its table
+- UPDATE/DELETE/INSERT ... SELECT on large tables cost the rows EXPLAIN (SHOWPLAN on
+  SQL Server) expects them to touch
+- Liquibase changeSets the native executor can run cost the statements it generates for
+  them; otherwise the CLI pays for starting its JVM, unless checksums show that
+  DATABASECHANGELOG is up to date and it would not be started at all
+
+The built-in rates describe an average server. They are scaled by how long recently
+applied files really took (execution_time_ms / deployment_time_ms in the history
+tables) compared with what the same model predicts for them today.
+"""
+
+import os
+import re
+import statistics
+
+from .liquibase import NativeLiquibase, LiquibaseChecksums, UnsupportedChangelog
+
+
+# Built-in cost model: per-statement round trip, statement text transfer, and rows per second
+STATEMENT_SECONDS = 0.002
+TEXT_BYTES_PER_SECOND = 20 * 1024 * 1024
+ROWS_PER_SECOND = {'index': 150000, 'rebuild': 80000, 'copy': 50000, 'dml': 100000}
+# Triggers and chunked copying make an online shadow-table copy slower than a direct one
+ONLINE_COPY_OVERHEAD = 1.5
+# Starting the Liquibase CLI's JVM, paid once per run that launches it
+LIQUIBASE_STARTUP_SECONDS = 10
+
+# DML on tables smaller than this is not worth an EXPLAIN round trip
+LARGE_TABLE_ROWS = 10000
+# Recently applied files used to calibrate the model, and the fewest that make it trustworthy
+CALIBRATION_FILES = 20
+MIN_CALIBRATION_FILES = 3
+CALIBRATION_RANGE = (0.2, 20.0)
+
+RECENT_RUNS_QUERIES = {
+    'bytebase': "SELECT filename, execution_time_ms FROM bytebase_migration_history "
+                "WHERE status = 'DONE' ORDER BY executed_at DESC",
+    'redgate': "SELECT filename, deployment_time_ms FROM redgate_deployment_history "
+               "WHERE deployment_status = 'COMPLETED' ORDER BY deployed_at DESC"
+}
+
+TABLE_ROWS_QUERIES = {
+    'mysql': "SELECT TABLE_NAME, TABLE_ROWS FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE()",
+    'sqlserver': "SELECT t.name, SUM(p.rows) FROM sys.tables t "
+                 "JOIN sys.partitions p ON p.object_id = t.object_id AND p.index_id IN (0, 1) GROUP BY t.name"
+}
+
+ALTER_HEAD_PATTERN = re.compile(r"^\s*ALTER\s+(?:ONLINE\s+|IGNORE\s+)*TABLE\s+(?:\[[^\]]+\]|`[^`]+`|[\w$.]+)+\s*",
+                                re.IGNORECASE)
+ALGORITHM_ORDER = ('instant', 'index', 'rebuild', 'copy')
+# First matching rule wins for each comma-separated ALTER clause
+ALTER_RULES = {
+    'mysql': [
+        (r"ADD\s+(?:CONSTRAINT\s+\S+\s+)?PRIMARY\s+KEY|DROP\s+PRIMARY\s+KEY|ENGINE\b|ROW_FORMAT\b|FORCE\b|ORDER\s+BY",
+         'rebuild'),
+        (r"ADD\s+(?:CONSTRAINT\s+\S+\s+)?(?:UNIQUE|FULLTEXT|SPATIAL|INDEX|KEY|FOREIGN\s+KEY)", 'index'),
+        (r"DROP\s+(?:INDEX|KEY|FOREIGN\s+KEY|CHECK|CONSTRAINT)|RENAME\b|ALTER\s+(?:COLUMN\s+)?\S+\s+(?:SET|DROP)\s+DEFAULT"
+         r"|ALTER\s+INDEX", 'instant'),
+        (r"ADD\b(?!\s+(?:CONSTRAINT|CHECK|PARTITION))|DROP\b(?!\s+PARTITION)", 'instant'),
+    ],
+    'sqlserver': [
+        (r"ADD\s+(?:CONSTRAINT\s+\S+\s+)?(?:PRIMARY\s+KEY|UNIQUE|FOREIGN\s+KEY|CHECK)|DROP\s+CONSTRAINT", 'index'),
+        (r"ALTER\s+COLUMN", 'copy'),
+        (r"ADD\b|DROP\s+COLUMN", 'instant'),
+    ],
+}
+
+
+def predict_alter(sql, db_type):
+    """Predicted cost class of an ALTER TABLE: instant, index, rebuild or copy"""
+    spec = ALTER_HEAD_PATTERN.sub("", sql, count=1)
+    predicted = 'instant'
+    for clause in _split_clauses(spec):
+        kind = next((kind for pattern, kind in ALTER_RULES.get(db_type, ALTER_RULES['mysql'])
+                     if re.match(pattern, clause, re.IGNORECASE)), 'copy')
+        if ALGORITHM_ORDER.index(kind) > ALGORITHM_ORDER.index(predicted):
+            predicted = kind
+    return predicted
+
+
+def _split_clauses(spec):
+    """Top-level comma-separated clauses of an ALTER TABLE specification"""
+    clauses = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(spec):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            clauses.append(spec[start:index].strip())
+            start = index + 1
+    clauses.append(spec[start:].strip().rstrip(';'))
+    return [clause for clause in clauses if clause]
+
+
+def format_duration(seconds):
+    """Short human duration: 45s, 12m 5s, 3h 20m"""
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds}s"
+
+
+class MigrationEstimator:
+    """Estimates how long the pending files of a MigrationEngine's plan will take"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.settings = engine.settings
+        self.db_type = engine.settings.db_type
+        self.table_rows = {}
+        # {changelog path: (seconds, heaviest)} of the native executor's pending changeSets, or None
+        self.liquibase_costs = None
+
+    def estimate(self, tools, plan=None):
+        """{'files': [...], 'total_seconds', 'factor', 'calibration_files'} for the pending files
+
+        Each file entry has tool, file, statements, seconds and heaviest (a description of
+        its most expensive statement, or None). plan is a MigrationEngine.plan() result to
+        reuse instead of reading the history again.
+        """
+        plan = plan or self.engine.plan(tools)
+        conn = self.engine.connect()
+        try:
+            self.table_rows = self._table_rows(conn)
+            startup = self._liquibase_startup(conn) if 'liquibase' in plan else 0.0
+            factor, calibrated = self._calibration(conn, plan)
+
+            files = []
+            for tool, entries in plan.items():
+                for entry in entries:
+                    if entry['state'] not in ('pending', 'unknown'):
+                        continue
+                    seconds, heaviest = self._file_cost(conn, tool, entry)
+                    if tool == "liquibase" and not any(f['tool'] == tool for f in files):
+                        seconds += startup
+                    files.append({
+                        'tool': tool,
+                        'file': entry['file'],
+                        'statements': entry['statements'],
+                        'seconds': seconds * factor,
+                        'heaviest': heaviest
+                    })
+        finally:
+            conn.close()
+
+        return {
+            'files': files,
+            'total_seconds': sum(entry['seconds'] for entry in files),
+            'factor': factor,
+            'calibration_files': calibrated
+        }
+
+    def _file_cost(self, conn, tool, entry):
+        """(seconds, heaviest statement description) with the built-in rates"""
+        if tool == "liquibase":
+            if self.liquibase_costs is not None:
+                return self.liquibase_costs.get(os.path.normpath(entry['path']), (0.0, None))
+            return entry['statements'] * STATEMENT_SECONDS, None
+        return self._statements_cost(conn, self.engine._stream_sql_file(entry['path'], self.db_type, report=False))
+
+    def _statements_cost(self, conn, statements):
+        """(seconds, heaviest statement description) of a sequence of statements"""
+        seconds = 0.0
+        heaviest = (0.0, None)
+        for statement in statements:
+            if not statement['sql']:
+                continue
+            cost, description = self._statement_cost(conn, statement)
+            seconds += STATEMENT_SECONDS + len(statement['sql']) / TEXT_BYTES_PER_SECOND + cost
+            if description and cost > heaviest[0]:
+                heaviest = (cost, description)
+        return seconds, heaviest[1]
+
+    def _liquibase_startup(self, conn):
+        """Seconds spent starting Liquibase, filling liquibase_costs when the native executor will run
+
+        The native executor costs each pending changeSet by the SQL it generates and starts
+        no JVM. For the CLI, matching checksums mean it is not started either; otherwise
+        changeSets keep the flat per-statement cost.
+        """
+        search_path = self.engine.tool_dir("liquibase")
+        if self.settings.native_liquibase:
+            native = NativeLiquibase(self.engine, search_path)
+            try:
+                pending = native.pending(conn)
+            except (UnsupportedChangelog, OSError):
+                # The run falls back to the CLI
+                pending = None
+            if pending is not None:
+                statements = {}
+                for changeset in pending:
+                    path = os.path.normpath(os.path.join(search_path, *changeset.path.split('/')))
+                    statements.setdefault(path, []).extend(native.statements(changeset))
+                self.liquibase_costs = {path: self._statements_cost(conn, file_statements)
+                                        for path, file_statements in statements.items()}
+                return 0.0
+        if self.settings.liquibase_checksums:
+            try:
+                if not LiquibaseChecksums(self.engine, search_path).pending():
+                    self.liquibase_costs = {}
+                    return 0.0
+            except Exception:
+                # Unknown - assume the CLI is started
+                pass
+        return LIQUIBASE_STARTUP_SECONDS
+
+    def _statement_cost(self, conn, statement):
+        """(seconds beyond the round trip, description) for one statement"""
+        classification = statement.get('classification', {})
+        verb = classification.get('verb')
+
+        for change in classification.get('objects', []):
+            if change['change_type'] == 'ALTER' and change['object_type'] == 'TABLE':
+                table = change['object_name']
+                algorithm = predict_alter(statement['sql'], self.db_type)
+                rows = self._rows(table)
+                if algorithm == 'instant' or not rows:
+                    return 0.0, None
+                seconds = rows / ROWS_PER_SECOND[algorithm]
+                if algorithm == 'copy' and self.db_type == "mysql" and self.settings.online_schema_change:
+                    chunks = rows / max(self.settings.online_chunk_size, 1)
+                    seconds = seconds * ONLINE_COPY_OVERHEAD + chunks * self.settings.online_throttle_ms / 1000
+                return seconds, f"ALTER TABLE {table} ({algorithm}, ~{rows:,} rows)"
+            if change['change_type'] == 'CREATE' and change['object_type'] == 'INDEX' and change.get('table'):
+                rows = self._rows(change['table'])
+                return rows / ROWS_PER_SECOND['index'], f"CREATE INDEX on {change['table']} (~{rows:,} rows)"
+
+        target = classification.get('target')
+        if verb in ('UPDATE', 'DELETE', 'INSERT', 'REPLACE', 'MERGE') and target:
+            # INSERT ... VALUES only costs its text; the others depend on the rows they touch
+            if verb in ('INSERT', 'REPLACE') and not re.search(r"\bSELECT\b", statement['sql'], re.IGNORECASE):
+                return 0.0, None
+            source = target
+            if verb in ('INSERT', 'REPLACE'):
+                match = re.search(r"\bFROM\s+[\[`\"]?([\w$]+)", statement['sql'], re.IGNORECASE)
+                source = match.group(1) if match else target
+            if self._rows(source) < LARGE_TABLE_ROWS and self._rows(target) < LARGE_TABLE_ROWS:
+                return 0.0, None
+            rows = self._explain_rows(conn, statement['sql'])
+            if rows is None:
+                # No plan (EXPLAIN not allowed for it) - assume the statement scans its table
+                rows = self._rows(source)
+            return rows / ROWS_PER_SECOND['dml'], f"{verb} {target} (~{rows:,} rows)"
+
+        return 0.0, None
+
+    def _rows(self, table):
+        return self.table_rows.get(str(table).lower(), 0)
+
+    def _table_rows(self, conn):
+        """{table name: row count estimate} from the catalog"""
+        try:
+            rows = self.engine._fetch_rows(conn, TABLE_ROWS_QUERIES[self.db_type])
+        except Exception as e:
+            self.engine.log(f"⚠️ Cannot read table sizes: {str(e)}")
+            return {}
+        return {str(name).lower(): int(count or 0) for name, count in rows}
+
+    def _explain_rows(self, conn, sql):
+        """Rows the optimizer expects a statement to touch, or None without a plan"""
+        cursor = conn.cursor()
+        try:
+            if self.db_type == "sqlserver":
+                cursor.execute("SET SHOWPLAN_ALL ON")
+                try:
+                    cursor.execute(sql)
+                    rows = cursor.fetchall()
+                    names = [column[0] for column in cursor.description or ()]
+                finally:
+                    cursor.execute("SET SHOWPLAN_ALL OFF")
+                column = 'EstimateRows'
+            else:
+                cursor.execute(f"EXPLAIN {sql}")
+                rows = cursor.fetchall()
+                names = [column[0] for column in cursor.description or ()]
+                column = 'rows'
+            if column not in names:
+                return None
+            index = names.index(column)
+            return int(max((float(row[index] or 0) for row in rows), default=0))
+        except Exception:
+            return None
+        finally:
+            cursor.close()
+
+    def _calibration(self, conn, plan):
+        """(factor, files used): recent real durations over what the built-in rates predict for them"""
+        ratios = []
+        for tool, query in RECENT_RUNS_QUERIES.items():
+            if tool not in plan:
+                continue
+            try:
+                recent = self.engine._fetch_rows(conn, query)
+            except Exception:
+                # History table not created yet
+                continue
+            paths = {entry['file']: entry for entry in plan[tool] if entry['state'] in ('applied', 'drifted')}
+            seen = set()
+            for filename, duration_ms in recent:
+                entry = paths.get(os.path.basename(str(filename)))
+                if entry is None or entry['file'] in seen or not duration_ms:
+                    continue
+                seen.add(entry['file'])
+                predicted, _ = self._file_cost(conn, tool, entry)
+                if predicted > 0:
+                    ratios.append(duration_ms / 1000 / predicted)
+                if len(seen) >= CALIBRATION_FILES:
+                    break
+
+        if len(ratios) < MIN_CALIBRATION_FILES:
+            return 1.0, 0
+        low, high = CALIBRATION_RANGE
+        # The median keeps one file that waited on a lock from skewing every estimate
+        return min(max(statistics.median(ratios), low), high), len(ratios)
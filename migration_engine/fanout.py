@@ -0,0 +1,314 @@
+"""
+Fan-out deployment of one migration set to many tenant databases
+
+Targets are listed in a file and run on a worker pool, at most per_server at a time
+against any one database server. Canary targets go first as their own wave; the rest
+follow in waves of wave_size. Once the failure threshold is reached no new targets are
+started, and a failing canary always stops the rollout.
+
+Targets file formats:
+
+    # text: one target per line, optional name after the address
+    db1.example.com:3306/tenant_001  tenant-001
+    db1.example.com/tenant_002
+
+    {"defaults": {"username": "deploy"},
+     "targets": [{"name": "tenant-001", "host": "db1", "database": "tenant_001", "canary": true},
+                 {"host": "db2", "port": "1433", "database": "tenant_002"}]}
+
+Text targets and JSON entries without a field inherit it from the base connection
+settings (the GUI's Settings tab or the CLI's options).
+"""
+
+import os
+import json
+import math
+import time
+import threading
+
+from .settings import ConnectionSettings
+from .engine import MigrationEngine, MIGRATION_TOOLS
+
+
+class FanoutTarget:
+    """One database the migration set is applied to"""
+
+    def __init__(self, name, settings, canary=False):
+        self.name = name
+        self.settings = settings
+        self.canary = canary
+        self.wave = None
+        self.status = 'pending'
+        self.duration = 0
+        self.error = None
+        self.tools = {}
+
+    @property
+    def server(self):
+        """Server key used for the per-server concurrency cap"""
+        host = self.settings.host.lower()
+        port = "" if "\\" in host else self.settings.port
+        return f"{self.settings.db_type}://{host}:{port}"
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'server': self.server,
+            'database': self.settings.database,
+            'canary': self.canary,
+            'wave': self.wave,
+            'status': self.status,
+            'duration': round(self.duration, 3),
+            'error': self.error,
+            'tools': self.tools
+        }
+
+
+def load_targets(path, base_settings):
+    """Read a targets file (JSON or host[:port]/database lines) into FanoutTargets"""
+    if not os.path.exists(path):
+        raise Exception(f"Targets file not found: {path}")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    if content.lstrip().startswith(('[', '{')):
+        try:
+            data = json.loads(content)
+        except ValueError as e:
+            raise Exception(f"Invalid targets file {path}: {str(e)}")
+        defaults = {}
+        if isinstance(data, dict):
+            defaults = data.get('defaults', {})
+            data = data.get('targets', [])
+        entries = [dict(defaults, **entry) for entry in data]
+    else:
+        entries = []
+        for line_number, line in enumerate(content.splitlines(), 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split()
+            address = parts[0]
+            if '/' not in address:
+                raise Exception(f"{path}:{line_number}: expected host[:port]/database, got '{address}'")
+            server, database = address.rsplit('/', 1)
+            entry = {'database': database, 'host': server}
+            if ':' in server:
+                entry['host'], entry['port'] = server.rsplit(':', 1)
+            if len(parts) > 1:
+                entry['name'] = parts[1]
+            entries.append(entry)
+
+    base = base_settings.to_dict()
+    targets = []
+    names = set()
+    for entry in entries:
+        values = dict(base)
+        values.update({key: value for key, value in entry.items() if key in ConnectionSettings.DEFAULTS})
+        # A different database type without a port means that type's default port
+        if 'port' not in entry and values['db_type'] != base['db_type']:
+            values['port'] = "1433" if values['db_type'] == "sqlserver" else "3306"
+        settings = ConnectionSettings(**values)
+
+        name = entry.get('name') or f"{settings.host}/{settings.database}"
+        if name in names:
+            raise Exception(f"Duplicate target in {path}: {name}")
+        names.add(name)
+        targets.append(FanoutTarget(name, settings, canary=bool(entry.get('canary'))))
+
+    if not targets:
+        raise Exception(f"No targets in {path}")
+    return targets
+
+
+def failure_threshold(max_failures, total):
+    """Failures that halt the rollout: a count, "N%" of the targets, or None for never"""
+    if max_failures in (None, '', 0, '0'):
+        return None
+    text = str(max_failures).strip()
+    try:
+        if text.endswith('%'):
+            return max(1, math.ceil(total * float(text[:-1]) / 100))
+        return int(text)
+    except ValueError:
+        raise Exception(f"Invalid failure threshold: {max_failures}")
+
+
+class FanoutDeployment:
+    """Apply migration tools to many targets in canary-first waves on a worker pool"""
+
+    def __init__(self, targets, tools=MIGRATION_TOOLS, workers=4, per_server=2, canary=1,
+                 wave_size=0, max_failures=1, log=None, verbose=False, project_root=None, parse_cache=None,
+                 cancel=None):
+        self.targets = targets
+        self.tools = list(tools)
+        self.workers = max(1, workers)
+        self.per_server = max(1, per_server)
+        self.wave_size = wave_size
+        self.threshold = failure_threshold(max_failures, len(targets))
+        self.log = log or (lambda message: None)
+        self.verbose = verbose
+        self.project_root = project_root
+        self.parse_cache = parse_cache
+        self.cancel = cancel
+        self.halted = None
+        self.failures = 0
+        self.completed = 0
+        self._lock = threading.Condition()
+
+        # Targets marked as canaries in the file win over the first-N default
+        if not any(target.canary for target in targets):
+            for target in targets[:max(0, canary)]:
+                target.canary = True
+
+    def waves(self):
+        """Targets grouped into the waves they run in"""
+        canaries = [target for target in self.targets if target.canary]
+        rest = [target for target in self.targets if not target.canary]
+        size = self.wave_size if self.wave_size and self.wave_size > 0 else max(len(rest), 1)
+        waves = [canaries] if canaries else []
+        waves.extend(rest[i:i + size] for i in range(0, len(rest), size))
+        for number, wave in enumerate(waves, 1):
+            for target in wave:
+                target.wave = number
+        return waves
+
+    def run(self):
+        """Run every wave; returns a summary dict with per-target results"""
+        start_time = time.time()
+        waves = self.waves()
+        servers = len({target.server for target in self.targets})
+        threshold = "never" if self.threshold is None else f"{self.threshold} failure(s)"
+        self.log(f"🌐 Fan-out: {len(self.targets)} targets on {servers} servers, {len(waves)} waves, "
+                 f"{self.workers} workers ({self.per_server} per server), halt after {threshold}")
+
+        for number, wave in enumerate(waves, 1):
+            if self.halted:
+                break
+            label = "canary" if wave[0].canary else f"{len(wave)} targets"
+            self.log(f"🌊 Wave {number}/{len(waves)} ({label})")
+            self._run_wave(wave)
+            if wave[0].canary and any(target.status == 'failed' for target in wave) and not self.halted:
+                self.halted = "canary wave failed"
+
+        for target in self.targets:
+            if target.status == 'pending':
+                target.status = 'skipped'
+                target.tools = {tool: {'status': 'skipped', 'duration': 0} for tool in self.tools}
+
+        if self.halted:
+            self.log(f"⛔ Fan-out halted: {self.halted}")
+        duration = time.time() - start_time
+        succeeded = sum(1 for target in self.targets if target.status == 'succeeded')
+        skipped = sum(1 for target in self.targets if target.status == 'skipped')
+        self.log(f"🌐 Fan-out finished in {duration:.1f}s: {succeeded} succeeded, "
+                 f"{self.failures} failed, {skipped} skipped")
+
+        return {
+            'tools': self.tools,
+            'halted': self.halted,
+            'duration': round(duration, 3),
+            'succeeded': succeeded,
+            'failed': self.failures,
+            'skipped': skipped,
+            'targets': [target.to_dict() for target in self.targets]
+        }
+
+    def _run_wave(self, wave):
+        pending = list(wave)
+        active = {}
+        threads = [
+            threading.Thread(target=self._worker, args=(pending, active), daemon=True)
+            for _ in range(min(self.workers, len(wave)))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _worker(self, pending, active):
+        while True:
+            with self._lock:
+                while True:
+                    if self.halted or not pending:
+                        self._lock.notify_all()
+                        return
+                    # First queued target whose server has a free slot
+                    target = next((t for t in pending if active.get(t.server, 0) < self.per_server), None)
+                    if target is not None:
+                        break
+                    self._lock.wait()
+                pending.remove(target)
+                active[target.server] = active.get(target.server, 0) + 1
+                target.status = 'running'
+
+            self._deploy(target)
+
+            with self._lock:
+                active[target.server] -= 1
+                self.completed += 1
+                if self.cancel and self.cancel.cancelled and not self.halted:
+                    self.halted = "cancelled by user"
+                if target.status == 'failed':
+                    self.failures += 1
+                    if self.threshold is not None and self.failures >= self.threshold and not self.halted:
+                        self.halted = f"{self.failures} failed target(s) reached the threshold of {self.threshold}"
+                icon = "✓" if target.status == 'succeeded' else "❌"
+                detail = f" - {target.error}" if target.error else ""
+                self.log(f"  [{self.completed}/{len(self.targets)}] {icon} {target.name} "
+                         f"{target.duration:.1f}s{detail}")
+                self._lock.notify_all()
+
+    def _deploy(self, target):
+        """Run each tool against one target, stopping at its first failure"""
+        if self.verbose:
+            log = lambda message: self.log(f"    [{target.name}] {message}")
+        else:
+            log = None
+        engine = MigrationEngine(target.settings, log=log, project_root=self.project_root,
+                                 parse_cache=self.parse_cache, cancel=self.cancel)
+
+        start_time = time.time()
+        failed = False
+        for tool in self.tools:
+            if failed:
+                target.tools[tool] = {'status': 'skipped', 'duration': 0}
+                continue
+            tool_start = time.time()
+            try:
+                results = engine.run(tool)
+                if results.failed:
+                    failed = True
+                    target.error = f"{tool}: {results.errors[0]}"
+            except Exception as e:
+                failed = True
+                target.error = f"{tool}: {str(e)}"
+            target.tools[tool] = {
+                'status': 'failed' if failed else 'succeeded',
+                'duration': round(time.time() - tool_start, 3)
+            }
+
+        target.duration = time.time() - start_time
+        target.status = 'failed' if failed else 'succeeded'
+
+
+def format_matrix(summary):
+    """Per-target x per-tool progress and timing matrix as text lines"""
+    icons = {'succeeded': '✓', 'failed': '❌', 'skipped': '-', 'pending': '·'}
+    tools = summary['tools']
+    name_width = max([len("Target")] + [len(target['name']) for target in summary['targets']])
+
+    header = f"{'Target':<{name_width}}  {'Wave':>4}  " + "  ".join(f"{tool:<10}" for tool in tools) + "  Total"
+    lines = [header, "-" * len(header)]
+    for target in summary['targets']:
+        cells = []
+        for tool in tools:
+            cell = target['tools'].get(tool, {'status': 'pending', 'duration': 0})
+            text = icons[cell['status']]
+            if cell['status'] in ('succeeded', 'failed'):
+                text += f" {cell['duration']:.1f}s"
+            cells.append(f"{text:<10}")
+        total = f"{target['duration']:.1f}s" if target['status'] != 'skipped' else "skipped"
+        lines.append(f"{target['name']:<{name_width}}  {target['wave'] or '':>4}  " + "  ".join(cells) + f"  {total}")
+    return lines
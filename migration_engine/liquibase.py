@@ -0,0 +1,1209 @@
+"""
+Native Liquibase changelog executor
+
+`liquibase update` starts a JVM, which costs seconds on every run - even when every
+changeSet has already been applied. NativeLiquibase parses db.changelog-master.xml and
+its includes in Python, generates MySQL or SQL Server DDL for the change types and
+preconditions these changelogs use, and keeps DATABASECHANGELOG and DATABASECHANGELOGLOCK
+the way Liquibase does. Runs with nothing pending cost one history query.
+
+A changelog with anything this module does not understand raises UnsupportedChangelog
+while it is parsed, before anything touches the database, and the engine falls back to
+the Liquibase CLI. Rows are written with a NULL MD5SUM, which Liquibase fills in on its
+next update without running the changeSet again. A ran changeSet whose recorded MD5SUM
+is neither its checksum as computed here nor the one Liquibase last recorded for the
+unchanged file is left to the CLI as well, which reruns it (runOnChange) or fails
+validation exactly as Liquibase would.
+
+When the CLI is used, LiquibaseChecksums decides first whether it has anything to do:
+it computes each changeSet's MD5SUM the way Liquibase does and compares it with
+DATABASECHANGELOG, so an up-to-date database does not cost a JVM launch. When it does,
+flow_file() puts the run's commands into one `liquibase flow` invocation and
+java_options() makes that JVM start quickly. Whether an install supports flow is
+remembered per Liquibase version (flow_support), so builds without it cost one probe.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import socket
+import shutil
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+
+from .sql import SQLStatementSplitter
+from .baseline import sql_literal, mysql_quote, mssql_quote
+
+
+# Changelog path as Liquibase is configured to find it in liquibase.properties
+MASTER_CHANGELOG = "changelog/db.changelog-master.xml"
+
+# Cached checksums per changelog file, kept next to the parse cache
+CHECKSUM_CACHE_FILE = "liquibase_checksums.json"
+
+# Version prefix of the checksums computed here, as Liquibase 4.0-4.23 writes them to
+# DATABASECHANGELOG.MD5SUM. 4.24+ writes version 9 checksums, which are only matched
+# through the MD5SUMs Liquibase itself recorded (LiquibaseChecksums.recorded)
+CHECKSUM_VERSION = 8
+
+# Commands of one CLI run, executed by a single JVM through a flow file
+FLOW_COMMANDS = (('validate', {}), ('status', {'verbose': True}), ('update', {}))
+# Whether each Liquibase version accepted `flow`, kept next to the parse cache
+FLOW_SUPPORT_FILE = "liquibase_flow.json"
+
+# Class-data sharing archive of Liquibase's classes, created by the first launch (JDK 19+)
+CDS_ARCHIVE_FILE = "liquibase-cds.jsa"
+
+# Waiting for a lock held by another update, as Liquibase does by default
+LOCK_WAIT_SECONDS = 300
+LOCK_POLL_SECONDS = 2
+
+# Written to DATABASECHANGELOG.LIQUIBASE, which records the tool version of each row
+EXECUTOR_VERSION = "native"
+
+# EXECTYPE values that mean a changeSet has run
+RAN_EXECTYPES = ('EXECUTED', 'RERAN', 'MARK_RAN')
+
+# Liquibase's dbms names for each database type
+DBMS_NAMES = {'mysql': ('mysql', 'mariadb'), 'sqlserver': ('mssql',)}
+
+HISTORY_TABLES = {
+    'mysql': [
+        """CREATE TABLE DATABASECHANGELOG (ID VARCHAR(255) NOT NULL, AUTHOR VARCHAR(255) NOT NULL,
+           FILENAME VARCHAR(255) NOT NULL, DATEEXECUTED datetime NOT NULL, ORDEREXECUTED INT NOT NULL,
+           EXECTYPE VARCHAR(10) NOT NULL, MD5SUM VARCHAR(35) NULL, DESCRIPTION VARCHAR(255) NULL,
+           COMMENTS VARCHAR(255) NULL, TAG VARCHAR(255) NULL, LIQUIBASE VARCHAR(20) NULL,
+           CONTEXTS VARCHAR(255) NULL, LABELS VARCHAR(255) NULL, DEPLOYMENT_ID VARCHAR(10) NULL)""",
+        """CREATE TABLE DATABASECHANGELOGLOCK (ID INT NOT NULL, `LOCKED` TINYINT NOT NULL,
+           LOCKGRANTED datetime NULL, LOCKEDBY VARCHAR(255) NULL,
+           CONSTRAINT PK_DATABASECHANGELOGLOCK PRIMARY KEY (ID))"""
+    ],
+    'sqlserver': [
+        """CREATE TABLE DATABASECHANGELOG (ID nvarchar(255) NOT NULL, AUTHOR nvarchar(255) NOT NULL,
+           FILENAME nvarchar(255) NOT NULL, DATEEXECUTED datetime2(3) NOT NULL, ORDEREXECUTED int NOT NULL,
+           EXECTYPE nvarchar(10) NOT NULL, MD5SUM nvarchar(35), DESCRIPTION nvarchar(255),
+           COMMENTS nvarchar(255), TAG nvarchar(255), LIQUIBASE nvarchar(20), CONTEXTS nvarchar(255),
+           LABELS nvarchar(255), DEPLOYMENT_ID nvarchar(10))""",
+        """CREATE TABLE DATABASECHANGELOGLOCK (ID int NOT NULL, LOCKED bit NOT NULL, LOCKGRANTED datetime2(3),
+           LOCKEDBY nvarchar(255), CONSTRAINT PK_DATABASECHANGELOGLOCK PRIMARY KEY (ID))"""
+    ]
+}
+
+# Liquibase type names that are spelled differently in the target dialect
+TYPE_ALIASES = {
+    'mysql': {'BOOLEAN': 'BIT(1)', 'CLOB': 'LONGTEXT', 'BLOB': 'LONGBLOB', 'UUID': 'CHAR(36)'},
+    'sqlserver': {'BOOLEAN': 'BIT', 'TIMESTAMP': 'DATETIME2', 'TEXT': 'VARCHAR(MAX)', 'CLOB': 'NVARCHAR(MAX)',
+                  'BLOB': 'VARBINARY(MAX)', 'UUID': 'UNIQUEIDENTIFIER'}
+}
+
+# Elements inside a changeSet that are not changes
+CHANGESET_METADATA = ('comment', 'preConditions', 'rollback', 'validCheckSum')
+
+# Precondition checks answered from INFORMATION_SCHEMA (MySQL) or the catalog views (SQL Server)
+PRECONDITION_QUERIES = {
+    'mysql': {
+        'tableExists': ("SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = COALESCE(%s, DATABASE()) "
+                        "AND TABLE_NAME = %s AND TABLE_TYPE = 'BASE TABLE'", ('schemaName', 'tableName')),
+        'viewExists': ("SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = COALESCE(%s, DATABASE()) "
+                       "AND TABLE_NAME = %s AND TABLE_TYPE = 'VIEW'", ('schemaName', 'viewName')),
+        'columnExists': ("SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = COALESCE(%s, DATABASE()) "
+                         "AND TABLE_NAME = %s AND COLUMN_NAME = %s", ('schemaName', 'tableName', 'columnName')),
+        'indexExists': ("SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = COALESCE(%s, DATABASE()) "
+                        "AND INDEX_NAME = %s AND TABLE_NAME = COALESCE(%s, TABLE_NAME)",
+                        ('schemaName', 'indexName', 'tableName')),
+        'foreignKeyConstraintExists': (
+            "SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS WHERE CONSTRAINT_SCHEMA = COALESCE(%s, DATABASE()) "
+            "AND CONSTRAINT_TYPE = 'FOREIGN KEY' AND CONSTRAINT_NAME = %s AND TABLE_NAME = COALESCE(%s, TABLE_NAME)",
+            ('schemaName', 'foreignKeyName', 'foreignKeyTableName')),
+        'primaryKeyExists': (
+            "SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS WHERE CONSTRAINT_SCHEMA = COALESCE(%s, DATABASE()) "
+            "AND CONSTRAINT_TYPE = 'PRIMARY KEY' AND TABLE_NAME = COALESCE(%s, TABLE_NAME)",
+            ('schemaName', 'tableName')),
+    },
+    'sqlserver': {
+        'tableExists': ("SELECT COUNT(*) FROM sys.tables WHERE schema_id = SCHEMA_ID(COALESCE(?, SCHEMA_NAME())) "
+                        "AND name = ?", ('schemaName', 'tableName')),
+        'viewExists': ("SELECT COUNT(*) FROM sys.views WHERE schema_id = SCHEMA_ID(COALESCE(?, SCHEMA_NAME())) "
+                       "AND name = ?", ('schemaName', 'viewName')),
+        'columnExists': ("SELECT COUNT(*) FROM sys.columns c JOIN sys.tables t ON t.object_id = c.object_id "
+                         "WHERE t.schema_id = SCHEMA_ID(COALESCE(?, SCHEMA_NAME())) AND t.name = ? AND c.name = ?",
+                         ('schemaName', 'tableName', 'columnName')),
+        'indexExists': ("SELECT COUNT(*) FROM sys.indexes i JOIN sys.tables t ON t.object_id = i.object_id "
+                        "WHERE t.schema_id = SCHEMA_ID(COALESCE(?, SCHEMA_NAME())) AND i.name = ? "
+                        "AND t.name = COALESCE(?, t.name)", ('schemaName', 'indexName', 'tableName')),
+        'foreignKeyConstraintExists': (
+            "SELECT COUNT(*) FROM sys.foreign_keys f WHERE f.schema_id = SCHEMA_ID(COALESCE(?, SCHEMA_NAME())) "
+            "AND f.name = ? AND OBJECT_NAME(f.parent_object_id) = COALESCE(?, OBJECT_NAME(f.parent_object_id))",
+            ('schemaName', 'foreignKeyName', 'foreignKeyTableName')),
+        'primaryKeyExists': (
+            "SELECT COUNT(*) FROM sys.key_constraints k WHERE k.type = 'PK' "
+            "AND k.schema_id = SCHEMA_ID(COALESCE(?, SCHEMA_NAME())) "
+            "AND OBJECT_NAME(k.parent_object_id) = COALESCE(?, OBJECT_NAME(k.parent_object_id))",
+            ('schemaName', 'tableName')),
+    }
+}
+PRECONDITION_TAGS = ('and', 'or', 'not', 'sqlCheck', 'dbms', 'changeSetExecuted') + tuple(PRECONDITION_QUERIES['mysql'])
+PRECONDITION_FAILURES = ('HALT', 'CONTINUE', 'MARK_RAN', 'WARN')
+
+
+class UnsupportedChangelog(Exception):
+    """The changelog uses something only the Liquibase CLI can run"""
+
+
+class PreconditionFailed(Exception):
+    """A precondition with onFail/onError="HALT" did not hold"""
+
+
+class ChangeSet:
+    """One <changeSet> of a changelog file"""
+
+    def __init__(self, element, path, search_path):
+        self.element = element
+        self.path = path
+        self.search_path = search_path
+        self.id = element.get('id')
+        self.author = element.get('author')
+        if not self.id or not self.author:
+            raise UnsupportedChangelog(f"{path}: changeSet without id or author")
+        self.run_always = _flag(element.get('runAlways'))
+        self.run_on_change = _flag(element.get('runOnChange'))
+        self.run_in_transaction = _flag(element.get('runInTransaction'), True)
+        self.fail_on_error = _flag(element.get('failOnError'), True)
+        self.dbms = element.get('dbms')
+        self.preconditions = None
+        self.comments = None
+        self.valid_checksums = []
+        self.changes = []
+        # Why only the Liquibase CLI can run this changeSet, or None
+        self.unsupported = None
+        for child in element:
+            tag = _tag(child)
+            if tag == 'preConditions':
+                self.unsupported = self.unsupported or _check_preconditions(child, self.location)
+                self.preconditions = child
+            elif tag == 'comment':
+                self.comments = (child.text or '').strip()
+            elif tag == 'validCheckSum':
+                self.valid_checksums.append((child.text or '').strip())
+            elif tag not in CHANGESET_METADATA:
+                if tag not in SQLGenerator.CHANGE_TYPES:
+                    self.unsupported = self.unsupported or f"{self.location}: <{tag}> is not supported natively"
+                self.unsupported = self.unsupported or _check_properties(child, self.location)
+                self.changes.append(child)
+
+    @property
+    def location(self):
+        return f"{self.path}::{self.id}::{self.author}"
+
+    @property
+    def key(self):
+        """Identity of the changeSet in DATABASECHANGELOG (file names compared without their folders)"""
+        return (self.id, self.author, _file_key(self.path))
+
+    @property
+    def description(self):
+        """Summary of the changes, in the form Liquibase writes to DATABASECHANGELOG.DESCRIPTION"""
+        parts = []
+        for change in self.changes:
+            names = [f"{name}={change.get(name)}" for name in ('indexName', 'constraintName', 'tableName',
+                                                                 'baseTableName', 'columnName', 'path')
+                     if change.get(name)]
+            parts.append(" ".join([_tag(change)] + ([", ".join(names)] if names else [])))
+        description = "; ".join(parts) or "empty"
+        return description if len(description) <= 255 else description[:252] + "..."
+
+    def applies_to(self, db_type):
+        return _dbms_matches(self.dbms, db_type)
+
+
+class LiquibaseChangelog:
+    """changeSets of a master changelog and its includes, in execution order
+
+    Paths are kept the way Liquibase records them in DATABASECHANGELOG.FILENAME: relative
+    to the search path (the Liquibase folder) with forward slashes.
+    """
+
+    def __init__(self, search_path, master=MASTER_CHANGELOG):
+        self.search_path = search_path
+        self.master = master
+        self.changesets = []
+        # Changelog-level preconditions as {file path: element}
+        self.preconditions = {}
+        # Why only the Liquibase CLI can run the changelog (empty when it can run natively)
+        self.unsupported = []
+
+    def load(self):
+        self._read(self.master, set())
+        self.unsupported.extend(changeset.unsupported for changeset in self.changesets if changeset.unsupported)
+        return self
+
+    def parse_file(self, path):
+        """One changelog file as [('include', path) | ('includeAll', folder) | ('changeSet', ChangeSet)]"""
+        full_path = os.path.join(self.search_path, *path.split('/'))
+        try:
+            root = ET.parse(full_path).getroot()
+        except (OSError, ET.ParseError) as e:
+            raise UnsupportedChangelog(f"Could not read {path}: {str(e)}")
+
+        entries = []
+        for element in root:
+            tag = _tag(element)
+            if tag in ('include', 'includeAll'):
+                if element.get('context') or element.get('labels'):
+                    self.unsupported.append(f"{path}: <{tag}> with contexts or labels is not supported natively")
+                target = self._included_path(path, element.get('file' if tag == 'include' else 'path'), element)
+                entries.append((tag, target.rstrip('/')))
+            elif tag == 'changeSet':
+                entries.append(('changeSet', ChangeSet(element, path, self.search_path)))
+            elif tag == 'preConditions':
+                reason = _check_preconditions(element, path)
+                if reason:
+                    self.unsupported.append(reason)
+                self.preconditions[path] = element
+            elif isinstance(element.tag, str):
+                self.unsupported.append(f"{path}: <{tag}> is not supported natively")
+        return entries
+
+    def included_files(self, folder):
+        """Changelog files an includeAll of folder runs, in Liquibase's (alphabetical) order"""
+        folder_path = os.path.join(self.search_path, *folder.split('/'))
+        return [f"{folder}/{filename}" for filename in sorted(os.listdir(folder_path)) if filename.endswith('.xml')]
+
+    def _read(self, path, seen):
+        if path in seen:
+            raise UnsupportedChangelog(f"{path} is included more than once")
+        seen.add(path)
+        for kind, value in self.parse_file(path):
+            if kind == 'include':
+                self._read(value, seen)
+            elif kind == 'includeAll':
+                for included in self.included_files(value):
+                    self._read(included, seen)
+            else:
+                self.changesets.append(value)
+
+    def _included_path(self, parent, file, element):
+        if not file:
+            raise UnsupportedChangelog(f"{parent}: <{_tag(element)}> without a file")
+        file = file.replace('\\', '/')
+        if _flag(element.get('relativeToChangelogFile')):
+            return posixpath.normpath(posixpath.join(posixpath.dirname(parent), file))
+        return posixpath.normpath(file.lstrip('/'))
+
+
+class SQLGenerator:
+    """Dialect SQL for Liquibase change elements"""
+
+    # Change element: method returning its SQL scripts as (sql, split statements) pairs
+    CHANGE_TYPES = {
+        'createTable': 'create_table',
+        'addColumn': 'add_column',
+        'createIndex': 'create_index',
+        'addForeignKeyConstraint': 'add_foreign_key',
+        'addPrimaryKey': 'add_primary_key',
+        'addUniqueConstraint': 'add_unique_constraint',
+        'dropTable': 'drop_table',
+        'dropColumn': 'drop_column',
+        'dropIndex': 'drop_index',
+        'dropForeignKeyConstraint': 'drop_foreign_key',
+        'sql': 'sql',
+        'sqlFile': 'sql_file'
+    }
+
+    def __init__(self, db_type):
+        self.db_type = db_type
+        self.quote = mssql_quote if db_type == "sqlserver" else mysql_quote
+
+    def generate(self, change, changeset):
+        return getattr(self, self.CHANGE_TYPES[_tag(change)])(change, changeset)
+
+    def create_table(self, change, changeset):
+        table = change.get('tableName')
+        definitions = []
+        primary_key = []
+        key_name = None
+        constraints = []
+        for column in _children(change, 'column'):
+            definitions.append(self._column(table, column))
+            name = column.get('name')
+            options = _child(column, 'constraints')
+            if options is None:
+                continue
+            if _flag(options.get('primaryKey')):
+                primary_key.append(name)
+                key_name = key_name or options.get('primaryKeyName')
+            if _flag(options.get('unique')):
+                unique_name = options.get('uniqueConstraintName')
+                constraints.append((f"CONSTRAINT {self.quote(unique_name)} " if unique_name else "")
+                                   + f"UNIQUE ({self.quote(name)})")
+            reference = self._inline_reference(options)
+            if reference:
+                foreign_key_name, referenced = reference
+                constraints.append(f"CONSTRAINT {self.quote(foreign_key_name)} FOREIGN KEY ({self.quote(name)}) "
+                                   f"REFERENCES {referenced}")
+            if options.get('checkConstraint'):
+                constraints.append(f"CHECK ({options.get('checkConstraint')})")
+        if primary_key:
+            key_name = key_name or f"PK_{table.upper()}"
+            constraints.insert(0, f"CONSTRAINT {self.quote(key_name)} PRIMARY KEY "
+                                  f"({', '.join(self.quote(name) for name in primary_key)})")
+        body = ",\n    ".join(definitions + constraints)
+        return [(f"CREATE TABLE {self._table(change)} (\n    {body}\n)", False)]
+
+    def add_column(self, change, changeset):
+        table = self._table(change)
+        scripts = []
+        for column in _children(change, 'column'):
+            position = ""
+            if self.db_type == "mysql" and column.get('afterColumn'):
+                position = f" AFTER {self.quote(column.get('afterColumn'))}"
+            add = "ADD" if self.db_type == "sqlserver" else "ADD COLUMN"
+            scripts.append((f"ALTER TABLE {table} {add} {self._column(change.get('tableName'), column)}{position}", False))
+
+            name = self.quote(column.get('name'))
+            options = _child(column, 'constraints')
+            if options is not None:
+                if _flag(options.get('primaryKey')):
+                    key_name = self.quote(self._primary_key_name(options, change.get('tableName')))
+                    scripts.append((f"ALTER TABLE {table} ADD CONSTRAINT {key_name} PRIMARY KEY ({name})", False))
+                if _flag(options.get('unique')):
+                    unique_name = options.get('uniqueConstraintName')
+                    constraint = f"CONSTRAINT {self.quote(unique_name)} " if unique_name else ""
+                    scripts.append((f"ALTER TABLE {table} ADD {constraint}UNIQUE ({name})", False))
+                reference = self._inline_reference(options)
+                if reference:
+                    foreign_key_name, referenced = reference
+                    scripts.append((f"ALTER TABLE {table} ADD CONSTRAINT {self.quote(foreign_key_name)} "
+                                    f"FOREIGN KEY ({name}) REFERENCES {referenced}", False))
+            value = self._value(column, 'value')
+            if value is not None:
+                scripts.append((f"UPDATE {table} SET {name} = {value}", False))
+        return scripts
+
+    def create_index(self, change, changeset):
+        columns = []
+        for column in _children(change, 'column'):
+            name = column.get('name') if _flag(column.get('computed')) else self.quote(column.get('name'))
+            columns.append(name + (" DESC" if _flag(column.get('descending')) else ""))
+        unique = "UNIQUE " if _flag(change.get('unique')) else ""
+        clustered = ""
+        if self.db_type == "sqlserver" and change.get('clustered') is not None:
+            clustered = "CLUSTERED " if _flag(change.get('clustered')) else "NONCLUSTERED "
+        return [(f"CREATE {unique}{clustered}INDEX {self.quote(change.get('indexName'))} "
+                 f"ON {self._table(change)} ({', '.join(columns)})", False)]
+
+    def add_foreign_key(self, change, changeset):
+        base = self._table(change, 'baseTableName', 'baseTableSchemaName')
+        referenced = self._table(change, 'referencedTableName', 'referencedTableSchemaName')
+        sql = (f"ALTER TABLE {base} ADD CONSTRAINT {self.quote(change.get('constraintName'))} "
+               f"FOREIGN KEY ({self._columns(change.get('baseColumnNames'))}) "
+               f"REFERENCES {referenced} ({self._columns(change.get('referencedColumnNames'))})")
+        for action in ('onDelete', 'onUpdate'):
+            if change.get(action):
+                rule = change.get(action).upper()
+                if self.db_type == "sqlserver" and rule == "RESTRICT":
+                    rule = "NO ACTION"
+                sql += f" ON {action[2:].upper()} {rule}"
+        return [(sql, False)]
+
+    def add_primary_key(self, change, changeset):
+        key_name = self._primary_key_name(change, change.get('tableName'))
+        return [(f"ALTER TABLE {self._table(change)} ADD CONSTRAINT {self.quote(key_name)} "
+                 f"PRIMARY KEY ({self._columns(change.get('columnNames'))})", False)]
+
+    def add_unique_constraint(self, change, changeset):
+        name = change.get('constraintName')
+        constraint = f"CONSTRAINT {self.quote(name)} " if name else ""
+        return [(f"ALTER TABLE {self._table(change)} ADD {constraint}"
+                 f"UNIQUE ({self._columns(change.get('columnNames'))})", False)]
+
+    def drop_table(self, change, changeset):
+        return [(f"DROP TABLE {self._table(change)}", False)]
+
+    def drop_column(self, change, changeset):
+        names = [column.get('name') for column in _children(change, 'column')] or [change.get('columnName')]
+        return [(f"ALTER TABLE {self._table(change)} DROP COLUMN {self.quote(name)}", False) for name in names]
+
+    def drop_index(self, change, changeset):
+        return [(f"DROP INDEX {self.quote(change.get('indexName'))} ON {self._table(change)}", False)]
+
+    def drop_foreign_key(self, change, changeset):
+        drop = "DROP CONSTRAINT" if self.db_type == "sqlserver" else "DROP FOREIGN KEY"
+        return [(f"ALTER TABLE {self._table(change, 'baseTableName', 'baseTableSchemaName')} "
+                 f"{drop} {self.quote(change.get('constraintName'))}", False)]
+
+    def sql(self, change, changeset):
+        if not _dbms_matches(change.get('dbms'), self.db_type):
+            return []
+        return [self._script(change.text or '', change, changeset)]
+
+    def sql_file(self, change, changeset):
+        if not _dbms_matches(change.get('dbms'), self.db_type):
+            return []
+        path = change.get('path').replace('\\', '/')
+        if _flag(change.get('relativeToChangelogFile')):
+            path = posixpath.join(posixpath.dirname(changeset.path), path)
+        full_path = os.path.join(changeset.search_path, *posixpath.normpath(path).split('/'))
+        with open(full_path, 'r', encoding=change.get('encoding') or 'utf-8') as f:
+            return [self._script(f.read(), change, changeset)]
+
+    def _script(self, text, change, changeset):
+        """(sql, split) for raw SQL; only the delimiters the statement splitter knows are supported"""
+        delimiter = (change.get('endDelimiter') or '').strip()
+        if delimiter and delimiter.rstrip(';').upper() not in ('', 'GO'):
+            raise UnsupportedChangelog(f"{changeset.location}: endDelimiter {delimiter!r} is not supported natively")
+        return (text.strip(), _flag(change.get('splitStatements'), True))
+
+    def _column(self, table, column):
+        """Column definition for CREATE TABLE / ADD COLUMN"""
+        name = column.get('name')
+        parts = [self.quote(name), self._type(column.get('type'))]
+        options = _child(column, 'constraints')
+        auto_increment = _flag(column.get('autoIncrement'))
+        if auto_increment and self.db_type == "sqlserver":
+            parts.append(f"IDENTITY ({column.get('startWith') or 1}, {column.get('incrementBy') or 1})")
+        if options is not None and (options.get('nullable') == 'false' or _flag(options.get('primaryKey'))):
+            parts.append("NOT NULL")
+        default = self._value(column, 'defaultValue')
+        if default is not None:
+            if self.db_type == "sqlserver":
+                parts.append(f"CONSTRAINT {self.quote(column.get('defaultValueConstraintName') or f'DF_{table}_{name}')} "
+                             f"DEFAULT {default}")
+            else:
+                parts.append(f"DEFAULT {default}")
+        if auto_increment and self.db_type == "mysql":
+            parts.append("AUTO_INCREMENT")
+        if column.get('remarks') and self.db_type == "mysql":
+            parts.append(f"COMMENT {sql_literal(column.get('remarks'), self.db_type)}")
+        return " ".join(parts)
+
+    def _value(self, column, prefix):
+        """SQL for a column's value or defaultValue* attributes, or None"""
+        if column.get(prefix) is not None:
+            return sql_literal(column.get(prefix), self.db_type)
+        if column.get(prefix + 'Numeric') is not None:
+            return column.get(prefix + 'Numeric')
+        if column.get(prefix + 'Boolean') is not None:
+            return "1" if _flag(column.get(prefix + 'Boolean')) else "0"
+        if column.get(prefix + 'Date') is not None:
+            return sql_literal(column.get(prefix + 'Date'), self.db_type)
+        if column.get(prefix + 'Computed') is not None:
+            return column.get(prefix + 'Computed')
+        return None
+
+    def _type(self, type_name):
+        type_name = re.sub(r"^java\.sql\.Types\.", "", (type_name or '').strip(), flags=re.IGNORECASE)
+        return TYPE_ALIASES[self.db_type].get(type_name.upper(), type_name)
+
+    def _inline_reference(self, options):
+        """(constraint name, referenced table and columns) for a column's foreign key, or None"""
+        if options.get('referencedTableName'):
+            referenced = (f"{self.quote(options.get('referencedTableName'))} "
+                          f"({self._columns(options.get('referencedColumnNames'))})")
+        elif options.get('references'):
+            referenced = options.get('references')
+        else:
+            return None
+        if not options.get('foreignKeyName'):
+            raise UnsupportedChangelog("Inline foreign keys need a foreignKeyName")
+        return options.get('foreignKeyName'), referenced
+
+    def _primary_key_name(self, element, table):
+        return element.get('primaryKeyName') or element.get('constraintName') or f"PK_{table.upper()}"
+
+    def _table(self, change, name='tableName', schema='schemaName'):
+        if change.get(schema):
+            return f"{self.quote(change.get(schema))}.{self.quote(change.get(name))}"
+        return self.quote(change.get(name))
+
+    def _columns(self, names):
+        return ", ".join(self.quote(name.strip()) for name in (names or '').split(','))
+
+
+class NativeLiquibase:
+    """Applies a changelog's pending changeSets and records them in DATABASECHANGELOG"""
+
+    def __init__(self, engine, search_path, master=MASTER_CHANGELOG):
+        self.engine = engine
+        self.settings = engine.settings
+        self.db_type = engine.settings.db_type
+        self.log = engine.log
+        self.search_path = search_path
+        self.master = master
+        self.generator = SQLGenerator(self.db_type)
+
+    def update(self):
+        """Run every pending changeSet; returns [(ChangeSet, EXECTYPE recorded)]
+
+        Raises UnsupportedChangelog (nothing has run) when the changelog needs the CLI.
+        """
+        changelog, changesets, checksums = self._load()
+
+        conn = self.engine.connect()
+        try:
+            ran = self._ran_changesets(conn)
+            if ran is not None and not self._pending(changesets, ran, checksums):
+                return []
+
+            self._ensure_history_tables(conn)
+            self._acquire_lock(conn)
+            try:
+                # Another update may have finished while we waited for the lock
+                ran = self._ran_changesets(conn) or {}
+                return self._apply(conn, changelog, self._pending(changesets, ran, checksums), ran)
+            finally:
+                self._release_lock(conn)
+        finally:
+            conn.close()
+
+    def pending(self, conn):
+        """ChangeSets the next update would run, in order (raises like update() before anything runs)"""
+        _, changesets, checksums = self._load()
+        return self._pending(changesets, self._ran_changesets(conn) or {}, checksums)
+
+    def statements(self, changeset):
+        """Statement dicts of the SQL a changeSet's changes generate"""
+        statements = []
+        for change in changeset.changes:
+            for sql, split in self.generator.generate(change, changeset):
+                if split:
+                    statements.extend(SQLStatementSplitter(self.db_type).split(sql))
+                elif sql:
+                    statements.append(_statement(sql, len(statements), self.db_type))
+        return statements
+
+    def _load(self):
+        """(changelog, changeSets for db_type, {key: [MD5SUMs it may be recorded with]})
+
+        Raises UnsupportedChangelog when the CLI is needed.
+        """
+        changelog = LiquibaseChangelog(self.search_path, self.master).load()
+        if changelog.unsupported:
+            raise UnsupportedChangelog(changelog.unsupported[0])
+        changesets = [changeset for changeset in changelog.changesets if changeset.applies_to(self.db_type)]
+        recorded = LiquibaseChecksums(self.engine, self.search_path, self.master).recorded()
+        checksums = {changeset.key: [checksum for checksum in (changeset_checksum(changeset),
+                                                               recorded.get(changeset.key)) if checksum]
+                     for changeset in changesets}
+        return changelog, changesets, checksums
+
+    def _pending(self, changesets, ran, checksums):
+        """ChangeSets to run: new or runAlways ones (a ran one without an MD5SUM stays ran)
+
+        Raises UnsupportedChangelog when a recorded MD5SUM does not match: whether the
+        changeSet runs again (runOnChange) or fails validation is Liquibase's to decide,
+        and a version 9 checksum cannot be computed here.
+        """
+        pending = []
+        for changeset in changesets:
+            row = ran.get(changeset.key)
+            if changeset.run_always or not row or row['exectype'] not in RAN_EXECTYPES:
+                pending.append(changeset)
+                continue
+            stored = row['checksum']
+            if stored is None or any(_checksum_matches(stored, checksum, changeset.valid_checksums)
+                                     for checksum in checksums[changeset.key] or [None]):
+                continue
+            raise UnsupportedChangelog(f"{changeset.location}: MD5SUM {stored} does not match the changelog")
+        return pending
+
+    def _apply(self, conn, changelog, pending, ran):
+        order = max([row['order'] for row in ran.values()] or [0])
+        deployment_id = str(int(time.time() * 1000))[-10:]
+        # Changelog-level preconditions that failed, as {file path: onFail}
+        file_outcomes = {}
+        applied = []
+        for changeset in pending:
+            self.engine.cancel.check()
+            if changeset.path not in file_outcomes:
+                file_outcomes[changeset.path] = self._precondition_outcome(
+                    conn, changelog.preconditions.get(changeset.path), changeset.path, ran)
+            outcome = file_outcomes[changeset.path]
+            if outcome is None and changeset.preconditions is not None:
+                outcome = self._precondition_outcome(conn, changeset.preconditions, changeset.location, ran)
+            if outcome == 'CONTINUE':
+                self.log(f"    ⏭️ {changeset.location}: preconditions failed, skipped until a later update")
+                continue
+
+            if outcome == 'MARK_RAN':
+                exectype = 'MARK_RAN'
+            else:
+                previous = ran.get(changeset.key, {}).get('exectype')
+                exectype = 'RERAN' if previous in RAN_EXECTYPES else 'EXECUTED'
+                if not self._run_changeset(conn, changeset):
+                    exectype = 'FAILED'
+            order += 1
+            self._record(conn, changeset, exectype, order, deployment_id, ran.get(changeset.key))
+            conn.commit()
+            ran[changeset.key] = {'exectype': exectype, 'order': order, 'filename': changeset.path, 'checksum': None}
+            applied.append((changeset, exectype))
+        return applied
+
+    def _run_changeset(self, conn, changeset):
+        """Execute a changeSet's changes; False when it failed with failOnError="false"."""
+        statements = self.statements(changeset)
+        on_batch = (lambda batch: conn.commit()) if not changeset.run_in_transaction else None
+        try:
+            self.engine._execute_statements(conn, statements, self.db_type, self.engine._raise_statement_error, on_batch)
+            return True
+        except Exception as e:
+            conn.rollback()
+            if changeset.fail_on_error or self.engine.cancel.cancelled:
+                raise Exception(f"{changeset.location}: {str(e)}")
+            self.log(f"    ⚠️ {changeset.location} failed, continuing (failOnError=false): {str(e)}")
+            return False
+
+    def _precondition_outcome(self, conn, preconditions, location, ran):
+        """None when the preconditions hold (or there are none), else their onFail/onError action"""
+        if preconditions is None:
+            return None
+        try:
+            holds = self._holds(conn, preconditions, ran)
+            action = (preconditions.get('onFail') or 'HALT').upper()
+            message = preconditions.get('onFailMessage') or "preconditions failed"
+        except Exception as e:
+            conn.rollback()
+            holds = False
+            action = (preconditions.get('onError') or 'HALT').upper()
+            message = preconditions.get('onErrorMessage') or f"preconditions could not be checked: {str(e)}"
+        if holds:
+            return None
+        if action == 'HALT':
+            raise PreconditionFailed(f"{location}: {message}")
+        if action == 'WARN':
+            self.log(f"    ⚠️ {location}: {message}")
+            return None
+        return action
+
+    def _holds(self, conn, element, ran):
+        tag = _tag(element)
+        children = [child for child in element if isinstance(child.tag, str)]
+        if tag in ('preConditions', 'and'):
+            return all(self._holds(conn, child, ran) for child in children)
+        if tag == 'or':
+            return any(self._holds(conn, child, ran) for child in children)
+        if tag == 'not':
+            return not all(self._holds(conn, child, ran) for child in children)
+        if tag == 'dbms':
+            return _dbms_matches(element.get('type'), self.db_type)
+        if tag == 'changeSetExecuted':
+            key = (element.get('id'), element.get('author'), _file_key(element.get('changeLogFile') or ''))
+            return ran.get(key, {}).get('exectype') in RAN_EXECTYPES
+        if tag == 'sqlCheck':
+            rows = self.engine._fetch_rows(conn, (element.text or '').strip())
+            value = rows[0][0] if rows and rows[0] else None
+            return str(value).strip() == (element.get('expectedResult') or '').strip()
+        query, attributes = PRECONDITION_QUERIES[self.db_type][tag]
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, tuple(element.get(attribute) for attribute in attributes))
+            return cursor.fetchone()[0] > 0
+        finally:
+            cursor.close()
+
+    def _ran_changesets(self, conn):
+        return ran_changesets(self.engine, conn)
+
+    def _record(self, conn, changeset, exectype, order, deployment_id, previous):
+        """Write the DATABASECHANGELOG row of a changeSet (updating the row of an earlier run)
+
+        MD5SUM is left NULL for Liquibase to fill in until the checksums computed here are
+        proven identical to the ones it writes.
+        """
+        now = "GETDATE()" if self.db_type == "sqlserver" else "NOW()"
+        cursor = conn.cursor()
+        try:
+            if previous:
+                cursor.execute(self.engine._adapt_params(
+                    f"UPDATE DATABASECHANGELOG SET DATEEXECUTED = {now}, ORDEREXECUTED = %s, EXECTYPE = %s, "
+                    f"MD5SUM = NULL, DEPLOYMENT_ID = %s WHERE ID = %s AND AUTHOR = %s AND FILENAME = %s"),
+                    (order, exectype, deployment_id, changeset.id, changeset.author, previous['filename']))
+            else:
+                cursor.execute(self.engine._adapt_params(
+                    f"INSERT INTO DATABASECHANGELOG (ID, AUTHOR, FILENAME, DATEEXECUTED, ORDEREXECUTED, EXECTYPE, "
+                    f"MD5SUM, DESCRIPTION, COMMENTS, LIQUIBASE, DEPLOYMENT_ID) "
+                    f"VALUES (%s, %s, %s, {now}, %s, %s, NULL, %s, %s, %s, %s)"),
+                    (changeset.id, changeset.author, changeset.path, order, exectype, changeset.description,
+                     (changeset.comments or '')[:255] or None, EXECUTOR_VERSION, deployment_id))
+        finally:
+            cursor.close()
+
+    def _ensure_history_tables(self, conn):
+        """Create DATABASECHANGELOG and DATABASECHANGELOGLOCK (with its lock row) if missing"""
+        for ddl in HISTORY_TABLES[self.db_type]:
+            table = ddl.split()[2]
+            if self._table_exists(conn, table):
+                continue
+            cursor = conn.cursor()
+            try:
+                cursor.execute(ddl)
+            finally:
+                cursor.close()
+            conn.commit()
+        if not self.engine._fetch_rows(conn, "SELECT ID FROM DATABASECHANGELOGLOCK WHERE ID = 1"):
+            cursor = conn.cursor()
+            try:
+                cursor.execute("INSERT INTO DATABASECHANGELOGLOCK (ID, LOCKED) VALUES (1, 0)")
+            finally:
+                cursor.close()
+            conn.commit()
+
+    def _table_exists(self, conn, table):
+        schema = "SCHEMA_NAME()" if self.db_type == "sqlserver" else "DATABASE()"
+        rows = self.engine._fetch_rows(conn, f"SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES "
+                                             f"WHERE TABLE_SCHEMA = {schema} AND TABLE_NAME = '{table}'")
+        return rows[0][0] > 0
+
+    def _acquire_lock(self, conn):
+        """Take the changelog lock, waiting for another update to release it"""
+        now = "GETDATE()" if self.db_type == "sqlserver" else "NOW()"
+        locked_by = f"{socket.gethostname()} (pid {os.getpid()}, native)"[:255]
+        deadline = time.time() + LOCK_WAIT_SECONDS
+        while True:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(self.engine._adapt_params(
+                    f"UPDATE DATABASECHANGELOGLOCK SET LOCKED = 1, LOCKGRANTED = {now}, LOCKEDBY = %s "
+                    f"WHERE ID = 1 AND LOCKED = 0"), (locked_by,))
+                acquired = cursor.rowcount == 1
+            finally:
+                cursor.close()
+            conn.commit()
+            if acquired:
+                return
+            if time.time() >= deadline:
+                rows = self.engine._fetch_rows(conn, "SELECT LOCKEDBY, LOCKGRANTED FROM DATABASECHANGELOGLOCK WHERE ID = 1")
+                holder, granted = rows[0] if rows else (None, None)
+                raise Exception(f"Could not acquire the Liquibase changelog lock (locked by {holder} since {granted})")
+            self.engine.cancel.check()
+            time.sleep(LOCK_POLL_SECONDS)
+
+    def _release_lock(self, conn):
+        try:
+            conn.rollback()
+            cursor = conn.cursor()
+            try:
+                cursor.execute("UPDATE DATABASECHANGELOGLOCK SET LOCKED = 0, LOCKGRANTED = NULL, LOCKEDBY = NULL WHERE ID = 1")
+            finally:
+                cursor.close()
+            conn.commit()
+        except Exception as e:
+            self.log(f"    ⚠️ Could not release the Liquibase changelog lock: {str(e)}")
+
+
+class LiquibaseChecksums:
+    """Tells whether `liquibase update` has anything to do, without starting it
+
+    Checksums are computed the way Liquibase 4.0-4.23 computes MD5SUM (version 8) and
+    cached per changelog file by size and mtime. Raw SQL changes and the version 9
+    checksums of Liquibase 4.24+ cannot be reproduced here, so the MD5SUMs Liquibase recorded after a successful update
+    are remembered as well and trusted for as long as the file is unchanged. Anything
+    that does not match is reported as pending - at worst Liquibase is started for nothing.
+    """
+
+    def __init__(self, engine, search_path, master=MASTER_CHANGELOG):
+        self.engine = engine
+        self.db_type = engine.settings.db_type
+        self.search_path = search_path
+        self.master = master
+        self.cache_path = os.path.join(engine.parse_cache.cache_dir, CHECKSUM_CACHE_FILE)
+        self._cache = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def pending(self):
+        """Why Liquibase has work to do - [] when every changeSet ran and is unchanged"""
+        try:
+            changesets = self._changesets()
+        except (UnsupportedChangelog, OSError) as e:
+            return [str(e)]
+
+        conn = self.engine.connect()
+        try:
+            ran = ran_changesets(self.engine, conn)
+        finally:
+            conn.close()
+        if ran is None:
+            return ["DATABASECHANGELOG does not exist yet"]
+
+        reasons = []
+        for changeset, recorded in changesets:
+            location = f"{changeset['path']}::{changeset['id']}::{changeset['author']}"
+            row = ran.get((changeset['id'], changeset['author'], _file_key(changeset['path'])))
+            if changeset['run_always']:
+                reasons.append(f"{location} runs always")
+            elif not row or row['exectype'] not in RAN_EXECTYPES:
+                reasons.append(f"{location} has not run")
+            elif row['checksum'] is None:
+                # Liquibase fills in a missing checksum without running the changeSet again
+                if changeset['run_on_change']:
+                    reasons.append(f"{location} has no checksum yet")
+            elif not self._matches(row['checksum'], changeset, recorded):
+                reasons.append(f"{location} changed since it ran")
+        return reasons
+
+    def remember(self):
+        """Record the MD5SUMs Liquibase stored, after an update it ran succeeded"""
+        try:
+            changesets = self._changesets()
+            conn = self.engine.connect()
+            try:
+                ran = ran_changesets(self.engine, conn) or {}
+            finally:
+                conn.close()
+        except Exception:
+            # The checksum cache is an optimisation only
+            return
+        for changeset, recorded in changesets:
+            row = ran.get((changeset['id'], changeset['author'], _file_key(changeset['path'])))
+            if row and row['checksum']:
+                recorded[f"{changeset['id']}::{changeset['author']}"] = row['checksum']
+        with self._lock:
+            self._write_cache()
+
+    def recorded(self):
+        """{(id, author, file key): MD5SUM} Liquibase recorded for changelog files unchanged since"""
+        try:
+            changesets = self._changesets()
+        except (UnsupportedChangelog, OSError):
+            return {}
+        return {(changeset['id'], changeset['author'], _file_key(changeset['path'])):
+                recorded[f"{changeset['id']}::{changeset['author']}"]
+                for changeset, recorded in changesets if f"{changeset['id']}::{changeset['author']}" in recorded}
+
+    def _matches(self, stored, changeset, recorded):
+        if _checksum_matches(stored, changeset['checksum'], changeset['valid']):
+            return True
+        return stored == recorded.get(f"{changeset['id']}::{changeset['author']}")
+
+    def _changesets(self):
+        """[(changeSet entry, recorded checksums of its file)] in changelog order, for db_type"""
+        changesets = []
+        self._walk(self.master, set(), changesets)
+        with self._lock:
+            if self._dirty:
+                self._write_cache()
+        return changesets
+
+    def _walk(self, path, seen, changesets):
+        if path in seen:
+            raise UnsupportedChangelog(f"{path} is included more than once")
+        seen.add(path)
+        cached = self._file(path)
+        for entry in cached['entries']:
+            if entry['kind'] == 'include':
+                self._walk(entry['path'], seen, changesets)
+            elif entry['kind'] == 'includeAll':
+                # Listed on every run - adding a file to the folder does not touch the includer
+                for included in LiquibaseChangelog(self.search_path).included_files(entry['path']):
+                    self._walk(included, seen, changesets)
+            elif _dbms_matches(entry['dbms'], self.db_type):
+                changesets.append((entry, cached['recorded']))
+
+    def _file(self, path):
+        """Parsed entries of a changelog file, from the cache while its size and mtime are unchanged"""
+        full_path = os.path.abspath(os.path.join(self.search_path, *path.split('/')))
+        stat = os.stat(full_path)
+        with self._lock:
+            cached = self._load_cache().get(full_path)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached
+
+        entries = []
+        for kind, value in LiquibaseChangelog(self.search_path).parse_file(path):
+            if kind != 'changeSet':
+                entries.append({'kind': kind, 'path': value})
+                continue
+            entries.append({'kind': kind, 'path': path, 'id': value.id, 'author': value.author,
+                            'dbms': value.dbms, 'run_always': value.run_always,
+                            'run_on_change': value.run_on_change, 'valid': value.valid_checksums,
+                            'checksum': changeset_checksum(value)})
+        # Checksums Liquibase recorded for the previous content no longer apply
+        cached = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'entries': entries, 'recorded': {}}
+        with self._lock:
+            self._cache[full_path] = cached
+            self._dirty = True
+        return cached
+
+    def _load_cache(self):
+        if self._cache is None:
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    self._cache = json.load(f)
+            except (OSError, ValueError):
+                self._cache = {}
+        return self._cache
+
+    def _write_cache(self):
+        self._cache = {path: entry for path, entry in self._cache.items() if os.path.exists(path)}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = f"{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f)
+            os.replace(temp_path, self.cache_path)
+            self._dirty = False
+        except OSError:
+            pass
+
+
+def flow_file(commands=FLOW_COMMANDS):
+    """Flow file YAML running [(command, {argument: value})] in order in one Liquibase JVM"""
+    lines = ["stages:", "  run:", "    actions:"]
+    for command, arguments in commands:
+        lines.append("      - type: liquibase")
+        lines.append(f"        command: {command}")
+        if arguments:
+            # JSON scalars are valid YAML
+            lines.append("        cmdArgs: {" + ", ".join(f"{name}: {json.dumps(value)}"
+                                                        for name, value in arguments.items()) + "}")
+    return "\n".join(lines) + "\n"
+
+
+def java_options(settings, cache_dir):
+    """JAVA_OPTS for a Liquibase launch: the configured options and the class-data sharing archive"""
+    options = settings.liquibase_jvm_options.split()
+    archive = os.path.join(os.path.abspath(cache_dir), CDS_ARCHIVE_FILE)
+    # The launcher word-splits JAVA_OPTS, so an archive path with spaces cannot be passed
+    if settings.liquibase_cds and ' ' not in archive:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Older JDKs ignore the flags they do not know instead of refusing to start
+        options = ["-XX:+IgnoreUnrecognizedVMOptions", "-Xshare:auto", "-XX:+AutoCreateSharedArchive",
+                   f"-XX:SharedArchiveFile={archive}"] + options
+    return " ".join(options)
+
+
+def liquibase_version(command):
+    """Version of the Liquibase install behind command, read from liquibase-core's manifest
+
+    Falls back to the launcher's path, size and mtime when the jar cannot be found, and
+    returns None when command does not resolve to a file at all.
+    """
+    launcher = command if os.path.isfile(command) else shutil.which(command)
+    if not launcher:
+        return None
+    launcher = os.path.realpath(launcher)
+    home = os.path.dirname(launcher)
+    for lib in (os.path.join(home, "internal", "lib"), os.path.join(home, "lib"), home):
+        try:
+            jars = sorted(name for name in os.listdir(lib) if re.match(r"liquibase-core.*\.jar$", name))
+        except OSError:
+            continue
+        for jar in jars:
+            try:
+                with zipfile.ZipFile(os.path.join(lib, jar)) as archive:
+                    manifest = archive.read("META-INF/MANIFEST.MF").decode('utf-8', 'replace')
+            except (OSError, KeyError, zipfile.BadZipFile):
+                continue
+            match = re.search(r"^(?:Implementation|Bundle)-Version:\s*(\S+)", manifest, re.MULTILINE)
+            if match:
+                return match.group(1)
+    stat = os.stat(launcher)
+    return f"{launcher}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def flow_support(cache_dir, version):
+    """True/False once a launch showed whether this Liquibase version has `flow`, else None"""
+    if version is None:
+        return None
+    try:
+        with open(os.path.join(cache_dir, FLOW_SUPPORT_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f).get(version)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def remember_flow_support(cache_dir, version, supported):
+    """Record whether this Liquibase version has `flow`, for every later process"""
+    if version is None:
+        return
+    path = os.path.join(cache_dir, FLOW_SUPPORT_FILE)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            known = json.load(f)
+        if not isinstance(known, dict):
+            known = {}
+    except (OSError, ValueError):
+        known = {}
+    known[version] = supported
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(known, f)
+        os.replace(temp_path, path)
+    except OSError:
+        # Only an optimisation - the next process probes again
+        pass
+
+
+def ran_changesets(engine, conn):
+    """{(id, author, file key): {'exectype', 'order', 'filename', 'checksum'}}, or None before the first update"""
+    try:
+        rows = engine._fetch_rows(
+            conn, "SELECT ID, AUTHOR, FILENAME, EXECTYPE, ORDEREXECUTED, MD5SUM FROM DATABASECHANGELOG")
+    except Exception:
+        conn.rollback()
+        return None
+    return {(str(row[0]), str(row[1]), _file_key(str(row[2]))):
+            {'exectype': str(row[3]), 'order': row[4] or 0, 'filename': str(row[2]),
+             'checksum': str(row[5]) if row[5] else None} for row in rows}
+
+
+def changeset_checksum(changeset):
+    """Version 8 MD5SUM Liquibase 4.0-4.23 stores for a changeSet, or None when it cannot be reproduced here
+
+    Each change is serialized like StringChangeLogSerializer does and hashed; the changeSet
+    checksum is the hash of the change checksums, each followed by ':'.
+    """
+    parts = []
+    for change in changeset.changes:
+        fields = _change_fields(change)
+        if fields is None:
+            return None
+        parts.append(_checksum(f"{_tag(change)}:{_serialize(fields, 1)}") + ":")
+    return _checksum("".join(parts))
+
+
+def _checksum_matches(stored, checksum, valid):
+    """Whether a recorded MD5SUM is the changeSet's checksum or one its <validCheckSum>s allow"""
+    return stored == checksum or stored in valid or 'ANY' in (value.upper() for value in valid)
+
+
+def _change_fields(change):
+    """The serializable fields of a change element, or None for content only Liquibase can read"""
+    tag = _tag(change)
+    if tag in ('sql', 'sqlFile', 'createProcedure', 'createView') or (change.text or '').strip():
+        return None
+    fields = _attributes(change)
+    columns = []
+    for child in change:
+        if not isinstance(child.tag, str):
+            continue
+        if _tag(child) != 'column' or (child.text or '').strip():
+            return None
+        columns.append(_column_fields(child))
+    if columns or tag in ('createTable', 'addColumn', 'createIndex', 'dropColumn', 'insert', 'update'):
+        fields['columns'] = columns
+    return fields
+
+
+def _column_fields(column):
+    fields = _attributes(column)
+    for child in column:
+        if not isinstance(child.tag, str):
+            continue
+        if _tag(child) != 'constraints':
+            return None
+        # Nested serializable objects are written without their field name
+        fields['constraints'] = _attributes(child)
+    return fields
+
+
+def _attributes(element):
+    fields = {}
+    for name, value in element.attrib.items():
+        if '}' in name:
+            continue
+        fields[name] = value.lower() if value.lower() in ('true', 'false') else value
+    return fields
+
+
+def _serialize(fields, indent):
+    """StringChangeLogSerializer form of an object: its fields sorted, four spaces per level"""
+    values = set()
+    for name, value in fields.items():
+        if isinstance(value, dict):
+            values.add(_indent(indent) + _serialize(value, indent + 1))
+        elif isinstance(value, list):
+            values.add(f"{_indent(indent)}{name}={_serialize_list(value, indent + 1)}")
+        else:
+            values.add(f'{_indent(indent)}{name}="{value}"')
+    body = "\n" + "\n".join(sorted(values)) + "\n" if values else ""
+    return f"[{body}{_indent(indent - 1)}]"
+
+
+def _serialize_list(items, indent):
+    if not items:
+        return "[]"
+    body = ",\n".join(_indent(indent) + _serialize(item, indent + 1) for item in items)
+    return f"[\n{body}\n{_indent(indent - 1)}]"
+
+
+def _indent(level):
+    return " " * (4 * level)
+
+
+def _checksum(text):
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return f"{CHECKSUM_VERSION}:{hashlib.md5(text.encode('utf-8')).hexdigest()}"
+
+
+def _statement(sql, index, db_type):
+    """Statement dict for SQL that must be sent whole (splitStatements="false")"""
+    verb = sql.split(None, 1)[0].upper() if sql.split() else ''
+    return {'sql': sql, 'index': index, 'line': None, 'end_line': None, 'offset': None, 'batch': index,
+            'tokens': [verb], 'classification': SQLStatementSplitter.classify([verb])}
+
+
+def _check_preconditions(element, location):
+    """Why preconditions cannot be evaluated natively, or None"""
+    for action in ('onFail', 'onError'):
+        if (element.get(action) or 'HALT').upper() not in PRECONDITION_FAILURES:
+            return f"{location}: {action}={element.get(action)} is not supported natively"
+    for child in element.iter():
+        if child is element or not isinstance(child.tag, str):
+            continue
+        if _tag(child) not in PRECONDITION_TAGS:
+            return f"{location}: precondition <{_tag(child)}> is not supported natively"
+    return _check_properties(element, location)
+
+
+def _check_properties(element, location):
+    """Changelog parameters (${name}) are resolved by the Liquibase CLI only"""
+    for node in element.iter():
+        if any('${' in str(value) for value in node.attrib.values()) or '${' in (node.text or ''):
+            return f"{location}: changelog parameters are not supported natively"
+    return None
+
+
+def _dbms_matches(dbms, db_type):
+    """Whether a dbms="..." filter (comma-separated, ! to exclude, all/none) includes db_type"""
+    if not dbms:
+        return True
+    names = DBMS_NAMES[db_type]
+    entries = [entry.strip().lower() for entry in dbms.split(',') if entry.strip()]
+    if any(entry.startswith('!') and entry[1:] in names for entry in entries):
+        return False
+    included = [entry for entry in entries if not entry.startswith('!')]
+    if not included:
+        return True
+    return 'none' not in included and ('all' in included or any(entry in names for entry in included))
+
+
+def _file_key(path):
+    return posixpath.basename(str(path).replace('\\', '/'))
+
+
+def _tag(element):
+    """Element name without its XML namespace"""
+    return element.tag.rsplit('}', 1)[-1] if isinstance(element.tag, str) else ''
+
+
+def _children(element, tag):
+    return [child for child in element if _tag(child) == tag]
+
+
+def _child(element, tag):
+    children = _children(element, tag)
+    return children[0] if children else None
+
+
+def _flag(value, default=False):
+    if value is None:
+        return default
+    return str(value).strip().lower() in ('true', '1', 'yes')
@@ -0,0 +1,294 @@
+"""
+Online schema changes for large MySQL tables
+
+An ALTER TABLE is first tried as ALGORITHM=INSTANT, then as ALGORITHM=INPLACE, LOCK=NONE;
+MySQL rejects either immediately when the change does not qualify, without touching the
+table. Anything left needs a table copy, which is done without blocking writers:
+
+1. CREATE TABLE _<table>_new LIKE <table> and apply the ALTER to the copy
+2. Triggers on the original table replay every INSERT/UPDATE/DELETE into the copy
+3. Rows are copied in primary-key ranges of chunk_size, sleeping throttle seconds
+   between chunks
+4. RENAME TABLE swaps both tables in one atomic step, guarded by a short
+   lock_wait_timeout and retried, then the old table and triggers are dropped
+
+Tables without a primary key, with triggers of their own or involved in foreign keys
+cannot be copied safely this way; their ALTER runs directly with a warning.
+"""
+
+import re
+import time
+
+
+# Error codes for "this ALGORITHM/LOCK is not supported for this change" (and INSTANT
+# syntax on servers older than 8.0)
+ALGORITHM_REJECTED_ERRORS = (1064, 1845, 1846, 4092)
+LOCK_WAIT_TIMEOUT_ERROR = 1205
+
+# Seconds the RENAME may wait for metadata locks, and how often it is retried
+SWAP_LOCK_WAIT_TIMEOUT = 5
+SWAP_ATTEMPTS = 5
+
+# Seconds between row copy progress lines
+PROGRESS_INTERVAL = 10
+
+ALTER_PATTERN = re.compile(
+    r"^\s*ALTER\s+(?:ONLINE\s+|IGNORE\s+)*TABLE\s+((?:`[^`]+`|[\w$]+)(?:\s*\.\s*(?:`[^`]+`|[\w$]+))?)\s+(.+)$",
+    re.IGNORECASE | re.DOTALL
+)
+# Clauses that choose their own algorithm or are not column/index changes
+DIRECT_ONLY_PATTERN = re.compile(r"\b(?:ALGORITHM|LOCK|RENAME\s+(?:TO|AS)|PARTITION|DISCARD|IMPORT)\b", re.IGNORECASE)
+
+
+def parse_alter(sql):
+    """(schema or None, table, alter specification) for an ALTER TABLE statement, else None"""
+    match = ALTER_PATTERN.match(sql)
+    if not match:
+        return None
+    parts = [part.strip().strip('`') for part in match.group(1).split('.')]
+    schema, table = (parts[0], parts[1]) if len(parts) == 2 else (None, parts[0])
+    return schema, table, match.group(2).strip().rstrip(';')
+
+
+def quote(name):
+    return "`" + name.replace("`", "``") + "`"
+
+
+def query_rows(conn, query, params=(), schema=None):
+    """Run an INFORMATION_SCHEMA query; {schema} becomes the schema (default: current database)"""
+    placeholder = "%s" if schema else "DATABASE()"
+    params = ((schema,) if schema else ()) + tuple(params)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query.replace("{schema}", placeholder), params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def primary_key(conn, schema, table):
+    """Primary key column names of a table, in key order (empty without a primary key)"""
+    rows = query_rows(conn, "SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE "
+                            "WHERE TABLE_SCHEMA = {schema} AND TABLE_NAME = %s AND CONSTRAINT_NAME = 'PRIMARY' "
+                            "ORDER BY ORDINAL_POSITION", (table,), schema)
+    return [row[0] for row in rows]
+
+
+def estimated_rows(conn, schema, table):
+    """Row count estimate from table statistics (0 when unknown)"""
+    rows = query_rows(conn, "SELECT TABLE_ROWS FROM INFORMATION_SCHEMA.TABLES "
+                            "WHERE TABLE_SCHEMA = {schema} AND TABLE_NAME = %s", (table,), schema)
+    return int(rows[0][0] or 0) if rows else 0
+
+
+class OnlineSchemaChange:
+    """Apply one ALTER TABLE to a MySQL table without blocking reads and writes"""
+
+    def __init__(self, conn, schema, table, alter_spec, chunk_size=1000, throttle=0.0, log=None, cancel=None):
+        self.conn = conn
+        self.schema = schema
+        self.table = table
+        self.alter_spec = alter_spec
+        self.chunk_size = max(1, int(chunk_size))
+        self.throttle = max(0.0, float(throttle))
+        self.log = log or (lambda message: None)
+        self.cancel = cancel
+
+        self.new_table = f"_{table}_new"[:64]
+        self.old_table = f"_{table}_old"[:64]
+        self.triggers = {event: f"_{table}_osc_{event.lower()[:3]}"[:64] for event in ('INSERT', 'UPDATE', 'DELETE')}
+
+    def run(self):
+        """Apply the change; returns the method used: instant, inplace, copy or direct"""
+        if DIRECT_ONLY_PATTERN.search(self.alter_spec):
+            self._execute(f"ALTER TABLE {self._name(self.table)} {self.alter_spec}")
+            return "direct"
+
+        for algorithm in ("ALGORITHM=INSTANT", "ALGORITHM=INPLACE, LOCK=NONE"):
+            try:
+                self._execute(f"ALTER TABLE {self._name(self.table)} {self.alter_spec}, {algorithm}")
+                return "instant" if "INSTANT" in algorithm else "inplace"
+            except Exception as e:
+                if not self._algorithm_rejected(e):
+                    raise
+
+        reason = self._copy_blocker()
+        if reason:
+            self.log(f"  ⚠️ {self.table}: online copy not possible ({reason}) - running the ALTER directly")
+            self._execute(f"ALTER TABLE {self._name(self.table)} {self.alter_spec}")
+            return "direct"
+
+        self._copy_and_swap()
+        return "copy"
+
+    def _copy_and_swap(self):
+        start_time = time.time()
+        row_estimate = estimated_rows(self.conn, self.schema, self.table)
+        self.log(f"  🔁 {self.table}: online copy of ~{row_estimate:,} rows in chunks of {self.chunk_size:,}")
+
+        if self._scalar("SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = {schema} AND TABLE_NAME = %s",
+                        (self.new_table,)):
+            raise Exception(f"{self.new_table} already exists (left by an interrupted online change?) - drop it and rerun")
+
+        try:
+            self._execute(f"CREATE TABLE {self._name(self.new_table)} LIKE {self._name(self.table)}")
+            self._execute(f"ALTER TABLE {self._name(self.new_table)} {self.alter_spec}")
+
+            key_columns = primary_key(self.conn, self.schema, self.table)
+            if primary_key(self.conn, self.schema, self.new_table) != key_columns:
+                raise Exception("the ALTER changes the primary key, which an online copy cannot follow")
+            columns = self._shared_columns()
+
+            self._create_triggers(key_columns, columns)
+            copied = self._copy_rows(key_columns, columns, row_estimate)
+            self._swap()
+        except Exception:
+            self._cleanup()
+            raise
+
+        self._drop_triggers()
+        self._execute(f"DROP TABLE IF EXISTS {self._name(self.old_table)}")
+        self.log(f"  ✓ {self.table}: {copied:,} rows copied and swapped in {time.time() - start_time:.1f}s")
+
+    def _create_triggers(self, primary_key, columns):
+        column_list = ", ".join(quote(column) for column in columns)
+        new_values = ", ".join(f"NEW.{quote(column)}" for column in columns)
+        old_key = " AND ".join(f"{quote(column)} <=> OLD.{quote(column)}" for column in primary_key)
+        target = self._name(self.new_table)
+        source = self._name(self.table)
+
+        self._execute(f"CREATE TRIGGER {self._name(self.triggers['INSERT'])} AFTER INSERT ON {source} FOR EACH ROW "
+                      f"REPLACE INTO {target} ({column_list}) VALUES ({new_values})")
+        self._execute(f"CREATE TRIGGER {self._name(self.triggers['UPDATE'])} AFTER UPDATE ON {source} FOR EACH ROW "
+                      f"BEGIN DELETE IGNORE FROM {target} WHERE {old_key}; "
+                      f"REPLACE INTO {target} ({column_list}) VALUES ({new_values}); END")
+        self._execute(f"CREATE TRIGGER {self._name(self.triggers['DELETE'])} AFTER DELETE ON {source} FOR EACH ROW "
+                      f"DELETE IGNORE FROM {target} WHERE {old_key}")
+
+    def _copy_rows(self, primary_key, columns, estimated_rows):
+        """Copy rows in primary-key order, one committed chunk at a time"""
+        key = ", ".join(quote(column) for column in primary_key)
+        column_list = ", ".join(quote(column) for column in columns)
+        after = f"({key}) > ({', '.join(['%s'] * len(primary_key))})"
+        through = f"({key}) <= ({', '.join(['%s'] * len(primary_key))})"
+        source = f"{self._name(self.table)} FORCE INDEX (PRIMARY)"
+
+        copied = 0
+        last = None
+        next_report = time.time() + PROGRESS_INTERVAL
+        while True:
+            if self.cancel:
+                self.cancel.check()
+            # Upper key of this chunk: the chunk_size-th key after the last one copied
+            where = f"WHERE {after}" if last else ""
+            boundary = self._fetchone(
+                f"SELECT {key} FROM {source} {where} ORDER BY {key} LIMIT 1 OFFSET {self.chunk_size - 1}",
+                last or ()
+            )
+
+            conditions = ([after] if last else []) + ([through] if boundary else [])
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute(
+                    f"INSERT IGNORE INTO {self._name(self.new_table)} ({column_list}) "
+                    f"SELECT {column_list} FROM {source} {where} LOCK IN SHARE MODE",
+                    tuple(last or ()) + tuple(boundary or ())
+                )
+                copied += max(cursor.rowcount, 0)
+            finally:
+                cursor.close()
+            self.conn.commit()
+
+            if not boundary:
+                return copied
+            last = boundary
+
+            if time.time() >= next_report:
+                progress = f" / ~{estimated_rows:,}" if estimated_rows else ""
+                self.log(f"  🔁 {self.table}: {copied:,}{progress} rows copied")
+                next_report = time.time() + PROGRESS_INTERVAL
+            if self.throttle:
+                time.sleep(self.throttle)
+
+    def _swap(self):
+        """Atomically exchange the tables, retrying when other sessions hold metadata locks"""
+        previous_timeout = self._fetchone("SELECT @@SESSION.lock_wait_timeout")[0]
+        self._execute(f"SET SESSION lock_wait_timeout = {SWAP_LOCK_WAIT_TIMEOUT}")
+        try:
+            for attempt in range(1, SWAP_ATTEMPTS + 1):
+                try:
+                    self._execute(f"RENAME TABLE {self._name(self.table)} TO {self._name(self.old_table)}, "
+                                  f"{self._name(self.new_table)} TO {self._name(self.table)}")
+                    return
+                except Exception as e:
+                    if getattr(e, 'errno', None) != LOCK_WAIT_TIMEOUT_ERROR or attempt == SWAP_ATTEMPTS:
+                        raise Exception(f"table swap failed after {attempt} attempt(s): {str(e)}")
+                    self.log(f"  ⏳ {self.table}: swap waited {SWAP_LOCK_WAIT_TIMEOUT}s for locks, retrying ({attempt}/{SWAP_ATTEMPTS})")
+                    time.sleep(attempt)
+        finally:
+            self._execute(f"SET SESSION lock_wait_timeout = {int(previous_timeout)}")
+
+    def _cleanup(self):
+        """Remove the triggers and shadow table of a failed copy; the original table is untouched"""
+        for step in (self._drop_triggers,
+                     lambda: self._execute(f"DROP TABLE IF EXISTS {self._name(self.new_table)}")):
+            try:
+                step()
+            except Exception:
+                pass
+
+    def _drop_triggers(self):
+        for trigger in self.triggers.values():
+            self._execute(f"DROP TRIGGER IF EXISTS {self._name(trigger)}")
+
+    def _copy_blocker(self):
+        """Why the table cannot be copied online, or None"""
+        if not primary_key(self.conn, self.schema, self.table):
+            return "no primary key"
+        if self._scalar("SELECT COUNT(*) FROM INFORMATION_SCHEMA.TRIGGERS "
+                        "WHERE EVENT_OBJECT_SCHEMA = {schema} AND EVENT_OBJECT_TABLE = %s", (self.table,)):
+            return "the table has triggers"
+        if self._scalar("SELECT COUNT(*) FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE "
+                        "WHERE TABLE_SCHEMA = {schema} AND REFERENCED_TABLE_NAME IS NOT NULL "
+                        "AND (TABLE_NAME = %s OR REFERENCED_TABLE_NAME = %s)", (self.table, self.table)):
+            return "foreign keys involve the table"
+        return None
+
+    def _shared_columns(self):
+        """Columns present in both tables (generated columns excluded), in the new table's order"""
+        query = ("SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS "
+                 "WHERE TABLE_SCHEMA = {schema} AND TABLE_NAME = %s AND EXTRA NOT LIKE '%%GENERATED%%' "
+                 "ORDER BY ORDINAL_POSITION")
+        old_columns = {row[0].lower() for row in self._fetchall(query, (self.table,))}
+        return [row[0] for row in self._fetchall(query, (self.new_table,)) if row[0].lower() in old_columns]
+
+    def _algorithm_rejected(self, error):
+        return (getattr(error, 'errno', None) in ALGORITHM_REJECTED_ERRORS
+                or 'not supported' in str(error).lower())
+
+    def _name(self, name):
+        return f"{quote(self.schema)}.{quote(name)}" if self.schema else quote(name)
+
+    def _execute(self, sql):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
+
+    def _fetchall(self, query, params=()):
+        return query_rows(self.conn, query, params, self.schema)
+
+    def _fetchone(self, query, params=()):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            return tuple(rows[0]) if rows else None
+        finally:
+            cursor.close()
+
+    def _scalar(self, query, params=()):
+        rows = self._fetchall(query, params)
+        return rows[0][0] if rows else None
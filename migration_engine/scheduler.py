@@ -0,0 +1,302 @@
+"""
+Dependency-graph scheduling of migration statements across pooled connections
+
+Every statement gets a read set and a write set of object names (tables, views,
+procedures...). A statement depends on each earlier statement, in filename then
+statement order, that writes something it reads or writes, or that reads something
+it writes. Foreign keys count as reads of the parent table for every later write to
+the child. Statements the analysis cannot see through (CALL/EXEC, GRANT, control
+flow) become barriers that depend on, and are depended on by, everything around them.
+Independent statements, such as index builds on different tables, then run
+concurrently on a pool of connections. When files must keep their own transactions,
+whole files are scheduled instead, each waiting for the files its statements depend on.
+"""
+
+import os
+import re
+import time
+import heapq
+import threading
+
+
+# Statements that change connection state and so cannot be spread over a pool
+SESSION_VERBS = ('USE', 'SET', 'DECLARE', 'DELIMITER', 'START', 'BEGIN', 'COMMIT', 'ROLLBACK',
+                 'LOCK', 'UNLOCK', 'SAVEPOINT', 'RELEASE')
+
+NAME_PATTERN = r"((?:[`\"\[]?[\w$#@]+[`\"\]]?)(?:\s*\.\s*[`\"\[]?[\w$#@]+[`\"\]]?)*)"
+REFERENCE_PATTERN = re.compile(r"\b(?:FROM|JOIN|REFERENCES|INTO|UPDATE|EXEC|EXECUTE|CALL)\s+" + NAME_PATTERN, re.IGNORECASE)
+TRIGGER_TABLE_PATTERN = re.compile(r"\bON\s+" + NAME_PATTERN, re.IGNORECASE)
+FOREIGN_KEY_PATTERN = re.compile(r"\bREFERENCES\s+" + NAME_PATTERN, re.IGNORECASE)
+STRING_PATTERN = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+KEYWORDS = {'select', 'where', 'set', 'values', 'as', 'on', 'dual', 'if', 'not', 'exists', 'table', 'current_timestamp'}
+
+
+def object_key(name):
+    """Normalise an object name for comparison: unquoted, lower case, schema dropped"""
+    if not name:
+        return None
+    name = re.sub(r"[`\"\[\]\s]", "", name).lower()
+    return name.split('.')[-1] or None
+
+
+def statement_access(statement):
+    """Return (reads, writes, barrier, session) for a classified statement"""
+    classification = statement['classification']
+    verb = classification['verb']
+    sql = STRING_PATTERN.sub("''", statement['sql'])
+
+    writes = set()
+    for change in classification['objects']:
+        writes.add(object_key(change['object_name']))
+        if change.get('table'):
+            # Index builds lock and change their table
+            writes.add(object_key(change['table']))
+        if change['object_type'] == 'TRIGGER':
+            trigger_table = TRIGGER_TABLE_PATTERN.search(sql)
+            if trigger_table:
+                writes.add(object_key(trigger_table.group(1)))
+    if classification['target']:
+        writes.add(object_key(classification['target']))
+    writes.discard(None)
+
+    reads = {object_key(name) for name in REFERENCE_PATTERN.findall(sql)}
+    reads = {name for name in reads if name and name not in KEYWORDS}
+
+    session = verb in SESSION_VERBS
+    barrier = session or verb in ('CALL', 'EXEC', 'EXECUTE') or (
+        not writes and classification['category'] not in ('QUERY',)
+    )
+    return reads, writes, barrier, session
+
+
+class StatementNode:
+    """One statement in the dependency graph"""
+
+    def __init__(self, order, file_index, statement):
+        self.order = order
+        self.file_index = file_index
+        self.statement = statement
+        self.dependents = []
+        self.waiting_on = 0
+        self.level = 0
+
+
+class DependencyScheduler:
+    """Runs the statements of several migration files as a dependency graph
+
+    connect() opens a pooled connection, execute(conn, statement) runs one statement
+    and on_error(statement, error) may raise to fail the run or return to tolerate the
+    error. After a failure no new statements are started; statements already running
+    finish.
+
+    With run_file(conn, file_path), which executes a whole file (in its own transaction)
+    and returns the number of statements it ran, files are the units of work: a file
+    starts once every earlier file that one of its statements depends on has finished.
+    """
+
+    def __init__(self, connect, execute, on_error, workers=4, log=None, run_file=None):
+        self.connect = connect
+        self.execute = execute
+        self.on_error = on_error
+        self.run_file = run_file
+        self.workers = max(1, workers)
+        self.log = log or (lambda message: None)
+        self.nodes = []
+        self.files = []
+        self.serial = False
+        self._lock = threading.Condition()
+
+    def add_file(self, file_path, statements):
+        """Add a file's statements to the graph, after every file added before it"""
+        file_index = len(self.files)
+        self.files.append(file_path)
+        for statement in statements:
+            if statement['sql']:
+                self.nodes.append(StatementNode(len(self.nodes), file_index, statement))
+
+    def build(self):
+        """Derive dependency edges from read/write sets; returns (depth, widest level)"""
+        last_writer = {}
+        readers_since_write = {}
+        fk_parents = {}
+        last_barrier = None
+        since_barrier = []
+
+        for node in self.nodes:
+            reads, writes, barrier, session = statement_access(node.statement)
+            self.serial = self.serial or session
+
+            # Writing a child table needs its foreign-key parents in place
+            for parent in FOREIGN_KEY_PATTERN.findall(node.statement['sql']):
+                for child in writes:
+                    fk_parents.setdefault(child, set()).add(object_key(parent))
+            for child in writes:
+                reads |= fk_parents.get(child, set())
+
+            dependencies = set()
+            if barrier:
+                dependencies.update(since_barrier)
+                if last_barrier is not None:
+                    dependencies.add(last_barrier)
+            else:
+                if last_barrier is not None:
+                    dependencies.add(last_barrier)
+                for name in reads | writes:
+                    if name in last_writer:
+                        dependencies.add(last_writer[name])
+                for name in writes:
+                    dependencies.update(readers_since_write.get(name, ()))
+
+            for dependency in dependencies:
+                dependency.dependents.append(node)
+                node.level = max(node.level, dependency.level + 1)
+            node.waiting_on = len(dependencies)
+
+            if barrier:
+                last_barrier = node
+                since_barrier = []
+                last_writer = {}
+                readers_since_write = {}
+            else:
+                since_barrier.append(node)
+                for name in reads - writes:
+                    readers_since_write.setdefault(name, []).append(node)
+                for name in writes:
+                    last_writer[name] = node
+                    readers_since_write[name] = []
+
+        self.statement_count = len(self.nodes)
+        if self.run_file:
+            self.nodes = self._file_nodes()
+
+        levels = {}
+        for node in self.nodes:
+            levels[node.level] = levels.get(node.level, 0) + 1
+        return (max(levels) + 1 if levels else 0), max(levels.values(), default=0)
+
+    def _file_nodes(self):
+        """One node per file, depending on the files its statements depend on"""
+        files = [StatementNode(file_index, file_index, None) for file_index in range(len(self.files))]
+        edges = set()
+        for node in self.nodes:
+            for dependent in node.dependents:
+                if dependent.file_index != node.file_index:
+                    edges.add((node.file_index, dependent.file_index))
+        for before, after in sorted(edges):
+            files[before].dependents.append(files[after])
+            files[after].waiting_on += 1
+        # Dependencies always point to earlier files, so each level is final when its file is reached
+        for node in files:
+            for dependent in node.dependents:
+                dependent.level = max(dependent.level, node.level + 1)
+        return files
+
+    def run(self):
+        """Execute the graph; returns {file_path: outcome} like a per-file execution result"""
+        depth, width = self.build()
+        workers = 1 if self.serial else min(self.workers, max(width, 1))
+        if self.serial and self.workers > 1:
+            self.log("  🔀 Session statements (USE/SET/DECLARE...) found - running on one connection")
+        if self.run_file:
+            self.log(f"  🔀 Scheduled {len(self.files)} files ({self.statement_count} statements), one transaction "
+                     f"each: {depth} dependency levels, up to {width} independent - {workers} connections")
+        else:
+            self.log(f"  🔀 Scheduled {len(self.nodes)} statements from {len(self.files)} files: "
+                     f"{depth} dependency levels, up to {width} independent - {workers} connections")
+
+        self._ready = [(node.order, node) for node in self.nodes if node.waiting_on == 0]
+        heapq.heapify(self._ready)
+        self._unfinished = len(self.nodes)
+        self._failure = None
+        self._file_stats = [{'executed': 0, 'done': 0, 'started': None, 'finished': None, 'error': None}
+                            for _ in self.files]
+
+        connections = [self.connect() for _ in range(workers)]
+        try:
+            threads = [threading.Thread(target=self._worker, args=(conn,), daemon=True) for conn in connections]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            for conn in connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+        return self._outcomes()
+
+    def _worker(self, conn):
+        while True:
+            with self._lock:
+                while not self._ready and self._unfinished and self._failure is None:
+                    self._lock.wait()
+                if self._failure is not None or not self._ready:
+                    self._lock.notify_all()
+                    return
+                _, node = heapq.heappop(self._ready)
+                stats = self._file_stats[node.file_index]
+                if stats['started'] is None:
+                    stats['started'] = time.time()
+
+            error = None
+            executed = 1
+            try:
+                if self.run_file:
+                    executed = self.run_file(conn, self.files[node.file_index])
+                else:
+                    self.execute(conn, node.statement)
+                    conn.commit()
+            except Exception as stmt_error:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                try:
+                    if self.run_file:
+                        # The file has already applied its own error policy
+                        raise
+                    self.on_error(node.statement, stmt_error)
+                except Exception as fatal_error:
+                    error = fatal_error
+
+            with self._lock:
+                stats['finished'] = time.time()
+                self._unfinished -= 1
+                if error is not None:
+                    stats['error'] = str(error)
+                    if self._failure is None:
+                        self._failure = (node, error)
+                else:
+                    stats['executed'] += executed
+                    stats['done'] += 1
+                    for dependent in node.dependents:
+                        dependent.waiting_on -= 1
+                        if dependent.waiting_on == 0:
+                            heapq.heappush(self._ready, (dependent.order, dependent))
+                self._lock.notify_all()
+
+    def _outcomes(self):
+        totals = [0] * len(self.files)
+        for node in self.nodes:
+            totals[node.file_index] += 1
+
+        outcomes = {}
+        for file_index, file_path in enumerate(self.files):
+            stats = self._file_stats[file_index]
+            complete = stats['error'] is None and stats['done'] == totals[file_index]
+            error = stats['error']
+            if not complete and error is None:
+                failed_node, _ = self._failure
+                state = "incomplete" if stats['executed'] else "not run"
+                error = f"{state}: stopped after failure in {os.path.basename(self.files[failed_node.file_index])}"
+            outcomes[file_path] = {
+                'success': complete,
+                'changes': stats['executed'],
+                'bytes': os.path.getsize(file_path),
+                'duration': (stats['finished'] - stats['started']) if stats['started'] else 0,
+                'skipped': stats['started'] is None and not complete,
+                'error': None if complete else error
+            }
+        return outcomes
@@ -0,0 +1,132 @@
+"""
+Database connection settings shared by the GUI and the command line
+"""
+
+import os
+import json
+
+
+# Migration tools in the order "run all" executes them
+MIGRATION_TOOLS = ('redgate', 'liquibase', 'bytebase')
+
+# A short-lived Liquibase CLI starts fastest with only the C1 compiler and the serial collector
+LIQUIBASE_JVM_OPTIONS = "-XX:TieredStopAtLevel=1 -XX:+UseSerialGC"
+
+
+class ConnectionSettings:
+    """Plain connection settings, the headless counterpart of the GUI's Settings tab"""
+
+    DEFAULTS = {
+        'db_type': 'mysql',
+        'host': 'localhost',
+        'port': '3306',
+        'database': 'migrationtest',
+        'username': 'root',
+        'password': '',
+        'driver': 'ODBC Driver 17 for SQL Server',
+        'trusted_connection': True,
+        'batch_mode': True,
+        'transactional': True,
+        'parallel_workers': 1,
+        'drift_policy': 'warn',
+        'checkpoint_interval': 0,
+        'online_schema_change': False,
+        'online_chunk_size': 1000,
+        'online_throttle_ms': 0,
+        'chunked_backfill': False,
+        'backfill_chunk_size': 5000,
+        'backfill_max_threads_running': 25,
+        'backfill_max_replica_lag': 5,
+        'backfill_replica': '',
+        'backfill_heartbeat_table': '',
+        'statement_timeout': 0,
+        'lock_timeout': 0,
+        'catalog_preconditions': True,
+        'native_liquibase': True,
+        'liquibase_checksums': True,
+        'liquibase_flow': True,
+        'liquibase_jvm_options': LIQUIBASE_JVM_OPTIONS,
+        'liquibase_cds': True,
+        'native_compare': True,
+        'apply_native_sync': False
+    }
+
+    def __init__(self, db_type="mysql", host="localhost", port="3306", database="migrationtest",
+                 username="root", password="", driver="ODBC Driver 17 for SQL Server",
+                 trusted_connection=True, batch_mode=True, transactional=True, parallel_workers=1,
+                 drift_policy="warn", checkpoint_interval=0, online_schema_change=False,
+                 online_chunk_size=1000, online_throttle_ms=0, chunked_backfill=False,
+                 backfill_chunk_size=5000, backfill_max_threads_running=25, backfill_max_replica_lag=5,
+                 backfill_replica="", backfill_heartbeat_table="", statement_timeout=0, lock_timeout=0,
+                 catalog_preconditions=True, native_liquibase=True, liquibase_checksums=True,
+                 liquibase_flow=True, liquibase_jvm_options=LIQUIBASE_JVM_OPTIONS,
+                 liquibase_cds=True, native_compare=True, apply_native_sync=False):
+        self.db_type = db_type
+        self.host = host
+        self.port = str(port)
+        self.database = database
+        self.username = username
+        self.password = password
+        self.driver = driver
+        self.trusted_connection = trusted_connection
+        self.batch_mode = batch_mode
+        self.transactional = transactional
+        self.parallel_workers = int(parallel_workers)
+        # What to do when an applied migration file has been edited: "warn" or "refuse"
+        self.drift_policy = drift_policy
+        # Commit and checkpoint every N statements inside a transactional file (0: only at natural commits)
+        self.checkpoint_interval = int(checkpoint_interval)
+        # MySQL ALTER TABLE via INSTANT/INPLACE or a throttled shadow-table copy (see online.py)
+        self.online_schema_change = online_schema_change
+        self.online_chunk_size = int(online_chunk_size)
+        self.online_throttle_ms = int(online_throttle_ms)
+        # MySQL whole-table UPDATE/DELETE/INSERT ... SELECT in primary-key chunks (see backfill.py);
+        # chunks slow down as Threads_running or the lag of backfill_replica ("host[:port]") nears its limit
+        self.chunked_backfill = chunked_backfill
+        self.backfill_chunk_size = int(backfill_chunk_size)
+        self.backfill_max_threads_running = int(backfill_max_threads_running)
+        self.backfill_max_replica_lag = int(backfill_max_replica_lag)
+        self.backfill_replica = backfill_replica
+        # pt-heartbeat table (schema.table) on the replica, when lag should come from it
+        self.backfill_heartbeat_table = backfill_heartbeat_table
+        # Seconds a migration statement may run, and wait for locks, before it is cancelled (0: no limit)
+        self.statement_timeout = int(statement_timeout)
+        self.lock_timeout = int(lock_timeout)
+        # Skip statements a catalog snapshot shows would change nothing (see catalog.py)
+        self.catalog_preconditions = catalog_preconditions
+        # Apply Liquibase changelogs in Python, falling back to the CLI for what it cannot run (see liquibase.py)
+        self.native_liquibase = native_liquibase
+        # Only start the Liquibase CLI when changeSet checksums show something pending or changed
+        self.liquibase_checksums = liquibase_checksums
+        # Run validate, status and update in one Liquibase JVM through a flow file
+        self.liquibase_flow = liquibase_flow
+        # JAVA_OPTS for Liquibase launches, plus a class-data sharing archive when liquibase_cds is set
+        self.liquibase_jvm_options = liquibase_jvm_options or ""
+        self.liquibase_cds = liquibase_cds
+        # Compare and sync schemas in Python when SQL Compare cannot run (see compare.py)
+        self.native_compare = native_compare
+        # Run the native sync script against the target instead of only writing it for review
+        self.apply_native_sync = apply_native_sync
+
+    @classmethod
+    def from_dict(cls, state):
+        """Build settings from a saved GUI state dict, filling in defaults"""
+        values = dict(cls.DEFAULTS)
+        values.update({key: value for key, value in state.items() if key in cls.DEFAULTS})
+        return cls(**values)
+
+    @classmethod
+    def load(cls, config_file="gui_config.json"):
+        """Load settings from the GUI's state file (defaults when it does not exist)"""
+        if not os.path.exists(config_file):
+            return cls()
+        with open(config_file, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self):
+        """Settings as a GUI state dict"""
+        return {key: getattr(self, key) for key in self.DEFAULTS}
+
+    def describe(self):
+        """Short target description for logs (never includes the password)"""
+        return f"{self.db_type.upper()} {self.host}/{self.database}"
@@ -0,0 +1,153 @@
+"""
+Long-lived shadow databases for schema comparison
+
+Comparing the target with "what the migrations produce" needs a database the migrations
+have been applied to. Building one from scratch on every run replays the whole history;
+ShadowDatabase keeps one per target instead (<database>_shadow) and records each file
+applied to it together with the hash of the migration set up to and including that file.
+
+A run only applies the files added since the last one. When an applied file was edited,
+removed or reordered the recorded hashes stop matching and the shadow is rebuilt. The
+marker table lives in the shadow itself, so comparisons must exclude SHADOW_MARKER.
+"""
+
+import os
+import time
+import hashlib
+
+from .checksum import checksum_files
+from .connection import connect_server, create_database, drop_database
+from .baseline import mysql_quote, mssql_quote
+
+
+# Table inside each shadow recording the migration files applied to it
+SHADOW_MARKER = "_migration_shadow"
+
+
+class ShadowDatabase:
+    """A target's shadow database, brought up to date with a folder of migration files"""
+
+    def __init__(self, engine, migrations_path):
+        self.engine = engine
+        self.settings = engine.settings
+        self.db_type = engine.settings.db_type
+        self.log = engine.log
+        self.migrations_path = migrations_path
+        self.name = f"{self.settings.database}_shadow"
+
+    def prepare(self):
+        """Apply pending migration files to the shadow (rebuilding it when history changed); returns its name"""
+        files = self._migration_set()
+        applied = self._applied()
+        matched = 0
+        if applied is not None:
+            while matched < min(len(applied), len(files)) and applied[matched] == files[matched][:2]:
+                matched += 1
+
+        if applied is not None and matched == len(applied) == len(files):
+            self.log(f"  🪞 Shadow {self.name} is up to date ({len(files)} migrations)")
+            return self.name
+
+        start_time = time.time()
+        if applied is None or matched < len(applied):
+            reason = "created" if applied is None else f"rebuilt ({applied[matched][0]} was changed or removed)"
+            self.log(f"  🪞 Shadow {self.name} {reason} from {len(files)} migrations")
+            self._rebuild()
+            pending = files
+        else:
+            pending = files[matched:]
+            self.log(f"  🪞 Applying {len(pending)} new migrations to shadow {self.name}")
+
+        engine = self.engine.for_database(self.name)
+        try:
+            for filename, migration_set, path in pending:
+                engine.cancel.check()
+                self._apply(engine, filename, migration_set, path)
+        except Exception as e:
+            # A half-applied file leaves the shadow in an unknown state - start over next time
+            self._drop()
+            raise Exception(f"Failed to update shadow database {self.name}: {str(e)}")
+        self.log(f"  ✓ Shadow {self.name} ready ({time.time() - start_time:.1f}s)")
+        return self.name
+
+    def _migration_set(self):
+        """[(filename, hash of the set up to and including it, path)] in deployment order"""
+        filenames = sorted(f for f in os.listdir(self.migrations_path) if f.endswith('.sql'))
+        paths = [os.path.join(self.migrations_path, filename) for filename in filenames]
+        checksums = checksum_files(paths)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.db_type}\n".encode())
+        files = []
+        for filename, path in zip(filenames, paths):
+            digest.update(f"{filename}:{checksums[path]}\n".encode())
+            files.append((filename, digest.copy().hexdigest(), path))
+        return files
+
+    def _applied(self):
+        """[(filename, migration set)] recorded in the shadow in order, or None when there is no usable shadow"""
+        if self.db_type == "sqlserver":
+            query = f"SELECT filename, migration_set FROM {mssql_quote(self.name)}.dbo.{SHADOW_MARKER} ORDER BY id"
+        else:
+            query = f"SELECT filename, migration_set FROM {mysql_quote(self.name)}.{SHADOW_MARKER} ORDER BY id"
+        try:
+            conn = connect_server(self.settings)
+            try:
+                rows = self.engine._fetch_rows(conn, query)
+            finally:
+                conn.close()
+        except Exception:
+            # No shadow yet, or one left without its marker by an interrupted build
+            return None
+        return [(str(row[0]), str(row[1])) for row in rows]
+
+    def _rebuild(self):
+        self._drop()
+        create_database(self.settings, self.name)
+        conn = self.engine.for_database(self.name).connect()
+        try:
+            cursor = conn.cursor()
+            if self.db_type == "sqlserver":
+                cursor.execute(f"""
+                CREATE TABLE {SHADOW_MARKER} (
+                    id INT IDENTITY(1,1) PRIMARY KEY,
+                    filename NVARCHAR(255) NOT NULL,
+                    migration_set NVARCHAR(64) NOT NULL,
+                    applied_at DATETIME2 DEFAULT GETDATE()
+                )
+                """)
+            else:
+                cursor.execute(f"""
+                CREATE TABLE {SHADOW_MARKER} (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    filename VARCHAR(255) NOT NULL,
+                    migration_set VARCHAR(64) NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """)
+            conn.commit()
+            cursor.close()
+        finally:
+            conn.close()
+
+    def _apply(self, engine, filename, migration_set, path):
+        """Run one migration file against the shadow and record it"""
+        conn = engine.connect()
+        try:
+            engine._execute_statements(conn, engine._stream_sql_file(path, self.db_type, report=False),
+                                       self.db_type, engine._raise_statement_error)
+            cursor = conn.cursor()
+            cursor.execute(engine._adapt_params(
+                f"INSERT INTO {SHADOW_MARKER} (filename, migration_set) VALUES (%s, %s)"), (filename, migration_set))
+            conn.commit()
+            cursor.close()
+        except Exception as e:
+            conn.rollback()
+            raise Exception(f"{filename}: {str(e)}")
+        finally:
+            conn.close()
+
+    def _drop(self):
+        try:
+            drop_database(self.settings, self.name)
+        except Exception as e:
+            self.log(f"⚠️ Warning: Could not drop shadow database {self.name}: {str(e)}")
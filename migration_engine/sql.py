@@ -0,0 +1,599 @@
+"""
+SQL script tokenizing, streaming and parsed-statement caching
+"""
+
+import os
+import re
+import json
+import gzip
+import hashlib
+import threading
+
+
+# Buffer size for reading SQL scripts and how often streaming progress is reported
+STREAM_CHUNK_SIZE = 1024 * 1024
+STREAM_PROGRESS_INTERVAL = 16 * 1024 * 1024
+
+# Parsed-migration cache limits: total on-disk size and largest script worth caching
+PARSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+PARSE_CACHE_MAX_FILE_BYTES = 8 * 1024 * 1024
+
+
+class SQLStatementSplitter:
+    """Incremental SQL tokenizer that turns lines of a script into complete statements
+
+    Lines are fed one at a time and finished statements are returned as soon as their
+    terminator is seen, so callers never need the whole script in memory. Quoted strings,
+    comments, MySQL DELIMITER directives, T-SQL BEGIN/END blocks and GO batch separators
+    are all understood. A T-SQL procedure, function or trigger runs to the end of its
+    batch, since its body need not be wrapped in BEGIN/END. Offsets are byte positions in
+    the UTF-8 source, and string literals keep their line endings.
+    """
+
+    TOKEN_PATTERNS = {
+        # MySQL only starts a -- comment when whitespace (or the end of the line) follows
+        'mysql': re.compile(r"""(?P<ws>\s+)|(?P<comment>--(?=\s|$)|\#|/\*)|(?P<quote>['"`])|(?P<word>[A-Za-z_][\w$]*)|(?P<other>.)"""),
+        'sqlserver': re.compile(r"""(?P<ws>\s+)|(?P<comment>--|/\*)|(?P<quote>['"\[])|(?P<word>[A-Za-z_@#][\w@#$]*)|(?P<other>.)"""),
+    }
+    QUOTE_CLOSERS = {"'": "'", '"': '"', '`': '`', '[': ']'}
+    NON_BLOCK_BEGINS = ('TRAN', 'TRANSACTION', 'DISTRIBUTED', 'DIALOG', 'CONVERSATION')
+    GO_PATTERN = re.compile(r'^GO(\s+\d+)?\s*;?$', re.IGNORECASE)
+    DELIMITER_PATTERN = re.compile(r'^DELIMITER\s+(\S+)', re.IGNORECASE)
+    HEAD_TOKEN_LIMIT = 12
+    QUOTED_TOKEN_LIMIT = 256
+    DDL_HEAD_LIMIT = 16
+    MAX_DDL_HEADS = 32
+    DDL_VERBS = ('CREATE', 'ALTER', 'DROP')
+    # T-SQL modules whose body is the rest of the batch
+    MODULE_TYPES = ('PROC', 'PROCEDURE', 'FUNCTION', 'TRIGGER')
+    DML_VERBS = ('INSERT', 'UPDATE', 'DELETE', 'MERGE', 'REPLACE')
+    QUERY_VERBS = ('SELECT', 'WITH', 'SHOW', 'EXPLAIN', 'DESCRIBE', 'DESC')
+    OBJECT_TYPES = ('TABLE', 'VIEW', 'PROCEDURE', 'PROC', 'FUNCTION', 'INDEX', 'TRIGGER',
+                    'DATABASE', 'SCHEMA', 'SEQUENCE', 'EVENT', 'TYPE')
+    TARGET_SKIP_WORDS = ('INTO', 'FROM', 'IGNORE', 'LOW_PRIORITY', 'DELAYED', 'HIGH_PRIORITY', 'QUICK', 'ONLY')
+
+    def __init__(self, db_type="mysql"):
+        self.db_type = "sqlserver" if db_type == "sqlserver" else "mysql"
+        self.token_pattern = self.TOKEN_PATTERNS[self.db_type]
+        self.delimiter = ";"
+        self.batch = 0
+        self.statement_count = 0
+        self._quote = None
+        self._quoted_token = None
+        self._in_block_comment = False
+        self._blocks = []
+        self._pending_begin = False
+        self._pending_end = False
+        self._lines = []
+        self._line_parts = []
+        self._tokens = []
+        self._ddl_heads = []
+        self._ddl_open = None
+        self._start_line = None
+        self._start_offset = None
+        self._line_no = 0
+        self._last_line = 0
+        self._offset = 0
+
+    def split(self, sql_content):
+        """Split an in-memory script, returning statement dicts"""
+        statements = []
+        offset = 0
+        for line_no, line in enumerate(sql_content.split('\n'), 1):
+            statements.extend(self.feed(line, line_no, offset))
+            offset += len(line.encode('utf-8')) + 1
+        statements.extend(self.finish())
+        return statements
+
+    def feed(self, line, line_no=0, offset=0):
+        """Consume one line of SQL and return any statements it completed"""
+        self._line_no = line_no
+        self._offset = offset
+        ending = line[len(line.rstrip('\r\n')):]
+        line = line.rstrip('\r\n')
+        completed = []
+
+        at_top_level = not self._quote and not self._in_block_comment and not self._line_parts
+        stripped = line.strip()
+        if at_top_level and stripped:
+            if self.db_type == "mysql":
+                delimiter_match = self.DELIMITER_PATTERN.match(stripped)
+                if delimiter_match:
+                    self._emit(completed)
+                    self.delimiter = delimiter_match.group(1)
+                    return completed
+            elif self.GO_PATTERN.match(stripped):
+                self._emit(completed)
+                self._blocks = []
+                self._pending_begin = False
+                self.batch += 1
+                return completed
+
+        pos = 0
+        length = len(line)
+        while pos < length:
+            if self._in_block_comment:
+                end = line.find('*/', pos)
+                if end == -1:
+                    break
+                self._in_block_comment = False
+                self._line_parts.append(' ')
+                pos = end + 2
+                continue
+
+            if self._quote:
+                end = self._scan_quoted(line, pos)
+                segment = line[pos:] if end == -1 else line[pos:end]
+                self._line_parts.append(segment)
+                if self._quoted_token is not None:
+                    self._quoted_token.append(segment)
+                if end == -1:
+                    break
+                if self._quoted_token is not None:
+                    self._record_token(''.join(self._quoted_token)[:self.QUOTED_TOKEN_LIMIT])
+                    self._quoted_token = None
+                self._quote = None
+                pos = end
+                continue
+
+            if self.db_type == "mysql" and line.startswith(self.delimiter, pos):
+                self._emit(completed)
+                pos += len(self.delimiter)
+                continue
+
+            match = self.token_pattern.match(line, pos)
+            kind = match.lastgroup
+            token = match.group(kind)
+            pos = match.end()
+            if kind == 'word' and self.db_type == "mysql" and self.delimiter in token:
+                # Identifiers may contain '$', so END$$ has to be cut at the delimiter
+                token = token[:token.index(self.delimiter)]
+                pos = match.start() + len(token)
+
+            if kind == 'ws':
+                if self._start_line is not None:
+                    self._line_parts.append(token)
+                continue
+
+            if kind == 'comment':
+                if token == '/*':
+                    self._in_block_comment = True
+                    continue
+                # Line comment - drop the rest of the line
+                break
+
+            if self._pending_end:
+                self._pending_end = False
+                if kind == 'word' and token.upper() == 'ELSE':
+                    pass
+                else:
+                    self._emit(completed)
+                    if token == ';':
+                        continue
+
+            if self._pending_begin:
+                self._pending_begin = False
+                if not (kind == 'word' and token.upper() in self.NON_BLOCK_BEGINS):
+                    self._blocks.append('BEGIN')
+
+            if self.db_type == "sqlserver" and token == ';' and not self._blocks and not self._in_module():
+                self._emit(completed)
+                continue
+
+            if self._start_line is None:
+                self._start_line = self._line_no
+                self._start_offset = self._offset + len(line[:match.start()].encode('utf-8'))
+
+            if kind == 'quote':
+                self._quote = token
+                self._line_parts.append(token)
+                if len(self._tokens) < self.HEAD_TOKEN_LIMIT or self._ddl_open is not None:
+                    self._quoted_token = [token]
+                continue
+
+            if kind == 'word':
+                upper = token.upper()
+                if upper in self.DDL_VERBS:
+                    self._open_ddl_head()
+                self._record_token(token)
+                if self.db_type == "sqlserver":
+                    self._track_block(upper)
+            elif token in '.(,':
+                self._record_token(token)
+
+            self._line_parts.append(token)
+
+        if self._quote and ending.startswith('\r'):
+            # The literal goes on past this line - keep its CRLF, statements are joined with LF
+            self._line_parts.append('\r')
+        self._end_line()
+        return completed
+
+    def finish(self):
+        """Flush whatever statement is still pending at end of input"""
+        completed = []
+        self._end_line()
+        self._emit(completed)
+        return completed
+
+    def _scan_quoted(self, line, pos):
+        """Return the index just past the closing quote, or -1 if the literal continues"""
+        closer = self.QUOTE_CLOSERS[self._quote]
+        backslash_escapes = self.db_type == "mysql" and self._quote in ("'", '"')
+        while pos < len(line):
+            ch = line[pos]
+            if backslash_escapes and ch == '\\':
+                pos += 2
+                continue
+            if ch == closer:
+                if pos + 1 < len(line) and line[pos + 1] == closer:
+                    pos += 2
+                    continue
+                return pos + 1
+            pos += 1
+        return -1
+
+    def _track_block(self, word):
+        """Follow T-SQL BEGIN/CASE ... END nesting so inner semicolons don't split"""
+        if word == 'BEGIN':
+            self._pending_begin = True
+        elif word == 'CASE':
+            self._blocks.append('CASE')
+        elif word == 'END' and self._blocks:
+            kind = self._blocks.pop()
+            if kind == 'BEGIN' and not self._blocks and not self._in_module():
+                self._pending_end = True
+
+    def _in_module(self):
+        """Whether the T-SQL statement so far is CREATE/ALTER PROCEDURE, FUNCTION or TRIGGER"""
+        words = [token.upper() for token in self._tokens[:4]]
+        if words[:1] not in (['CREATE'], ['ALTER']):
+            return False
+        if words[1:3] == ['OR', 'ALTER']:
+            words = words[2:]
+        return len(words) > 1 and words[1] in self.MODULE_TYPES
+
+    def _record_token(self, token):
+        if len(self._tokens) < self.HEAD_TOKEN_LIMIT:
+            self._tokens.append(token)
+        if self._ddl_open is not None:
+            self._ddl_open.append(token)
+            if len(self._ddl_open) >= self.DDL_HEAD_LIMIT:
+                self._ddl_open = None
+
+    def _open_ddl_head(self):
+        """Start capturing the tokens after a CREATE/ALTER/DROP keyword"""
+        # CREATE OR ALTER / ALTER TABLE ... DROP belong to the head already being captured
+        if self._ddl_open is not None and len(self._ddl_open) < 4:
+            return
+        if len(self._ddl_heads) < self.MAX_DDL_HEADS:
+            self._ddl_open = []
+            self._ddl_heads.append(self._ddl_open)
+
+    @staticmethod
+    def _unquote(identifier):
+        if identifier[:1] in ('[', '`', '"') and len(identifier) > 1:
+            return identifier[1:-1]
+        return identifier
+
+    @classmethod
+    def _qualified_name(cls, tokens, index):
+        """Read a possibly schema-qualified identifier starting at tokens[index]"""
+        if index >= len(tokens) or tokens[index] in ('.', '(', ','):
+            return None, index
+        name = cls._unquote(tokens[index])
+        while index + 2 < len(tokens) and tokens[index + 1] == '.':
+            index += 2
+            name = cls._unquote(tokens[index])
+        return name, index + 1
+
+    @classmethod
+    def _classify_ddl_head(cls, head):
+        """Turn a captured CREATE/ALTER/DROP head into an object change"""
+        upper = [token.upper() for token in head]
+        for position, word in enumerate(upper[1:], 1):
+            if word in cls.OBJECT_TYPES:
+                break
+        else:
+            return None
+
+        index = position + 1
+        while index < len(upper) and upper[index] in ('IF', 'NOT', 'EXISTS'):
+            index += 1
+        name, index = cls._qualified_name(head, index)
+        if not name:
+            return None
+
+        change = {
+            'change_type': upper[0],
+            'object_type': 'PROCEDURE' if word == 'PROC' else word,
+            'object_name': name,
+        }
+        if word == 'INDEX' and 'ON' in upper[index:]:
+            change['table'], _ = cls._qualified_name(head, upper.index('ON', index) + 1)
+        return change
+
+    @classmethod
+    def classify(cls, tokens, ddl_heads=()):
+        """Classify a statement from its head tokens and captured DDL heads"""
+        verb = tokens[0].upper() if tokens else ''
+        objects = []
+        for head in ddl_heads:
+            change = cls._classify_ddl_head(head)
+            if change:
+                objects.append(change)
+
+        target = None
+        if objects:
+            category = 'DDL'
+        elif verb in cls.DML_VERBS:
+            category = 'DML'
+            index = 1
+            while index < len(tokens) and tokens[index].upper() in cls.TARGET_SKIP_WORDS:
+                index += 1
+            target, _ = cls._qualified_name(tokens, index)
+        elif verb in cls.QUERY_VERBS:
+            category = 'QUERY'
+        elif verb:
+            category = 'CONTROL'
+        else:
+            category = 'OTHER'
+
+        return {'verb': verb, 'category': category, 'objects': objects, 'target': target}
+
+    def _end_line(self):
+        if not self._line_parts:
+            return
+        text = ''.join(self._line_parts)
+        if not self._quote:
+            text = text.rstrip()
+        if text.strip() or self._quote:
+            self._lines.append(text)
+            self._last_line = self._line_no
+        self._line_parts = []
+
+    def _emit(self, completed):
+        """Close the current statement and append it to completed if non-empty"""
+        if self._line_parts:
+            text = ''.join(self._line_parts).rstrip()
+            if text.strip():
+                self._lines.append(text)
+                self._last_line = self._line_no
+            self._line_parts = []
+        sql = '\n'.join(self._lines).strip()
+        if sql:
+            completed.append({
+                'sql': sql,
+                'index': self.statement_count,
+                'line': self._start_line,
+                'end_line': self._last_line,
+                'offset': self._start_offset,
+                'batch': self.batch,
+                'tokens': self._tokens,
+                'classification': self.classify(self._tokens, self._ddl_heads),
+            })
+            self.statement_count += 1
+        self._lines = []
+        self._tokens = []
+        self._ddl_heads = []
+        self._ddl_open = None
+        self._start_line = None
+        self._start_offset = None
+        self._pending_end = False
+
+
+class SQLStatementStream:
+    """Constant-memory iterator over the statements of a SQL file
+
+    The file is read through a large buffered binary handle one line at a time and fed
+    to SQLStatementSplitter, so statements can be executed as soon as they complete.
+    bytes_processed/total_bytes are kept up to date and progress_callback is invoked
+    every progress_interval bytes.
+    """
+
+    def __init__(self, file_path, db_type="mysql", chunk_size=STREAM_CHUNK_SIZE,
+                 progress_callback=None, progress_interval=STREAM_PROGRESS_INTERVAL, cache=None):
+        self.file_path = file_path
+        self.db_type = db_type
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self.cache = cache
+        self.total_bytes = os.path.getsize(file_path)
+        self.bytes_processed = 0
+        self.statement_count = 0
+        self.from_cache = False
+
+    def __iter__(self):
+        if self.cache is not None:
+            cached = self.cache.get(self.file_path, self.db_type)
+            if cached is not None:
+                self.from_cache = True
+                for statement in cached:
+                    self.statement_count += 1
+                    yield statement
+                self.bytes_processed = self.total_bytes
+                return
+
+        # Only scripts small enough to cache are collected; large ones stay constant-memory
+        collected = [] if self.cache is not None and self.total_bytes <= self.cache.max_entry_bytes else None
+        splitter = SQLStatementSplitter(self.db_type)
+        next_report = self.progress_interval
+        with open(self.file_path, 'rb', buffering=self.chunk_size) as f:
+            for line_no, raw_line in enumerate(f, 1):
+                offset = self.bytes_processed
+                self.bytes_processed += len(raw_line)
+                line = raw_line.decode('utf-8-sig' if offset == 0 else 'utf-8')
+                for statement in splitter.feed(line, line_no, offset):
+                    self.statement_count += 1
+                    if collected is not None:
+                        collected.append(statement)
+                    yield statement
+                if self.progress_callback and self.bytes_processed >= next_report:
+                    self.progress_callback(self.bytes_processed, self.total_bytes)
+                    next_report = self.bytes_processed + self.progress_interval
+        for statement in splitter.finish():
+            self.statement_count += 1
+            if collected is not None:
+                collected.append(statement)
+            yield statement
+
+        if collected is not None:
+            self.cache.put(self.file_path, self.db_type, collected)
+
+
+class SQLLineStream:
+    """Statement iterator over text lines as they arrive, such as a tool's piped stdout
+
+    The SQLStatementStream counterpart for scripts that never reach the disk: each line is
+    fed to SQLStatementSplitter as soon as it is read, so only the statement in progress
+    is held in memory. Nothing is cached and the total size is unknown.
+    """
+
+    def __init__(self, lines, db_type="mysql", first_line=1):
+        self.lines = lines
+        self.db_type = db_type
+        self.first_line = first_line
+        self.total_bytes = None
+        self.bytes_processed = 0
+        self.statement_count = 0
+        self.from_cache = False
+
+    def __iter__(self):
+        splitter = SQLStatementSplitter(self.db_type)
+        for line_no, line in enumerate(self.lines, self.first_line):
+            offset = self.bytes_processed
+            self.bytes_processed += len(line.encode('utf-8'))
+            for statement in splitter.feed(line.lstrip('\ufeff') if offset == 0 else line, line_no, offset):
+                self.statement_count += 1
+                yield statement
+        for statement in splitter.finish():
+            self.statement_count += 1
+            yield statement
+
+
+class ParsedMigrationCache:
+    """Size-bounded on-disk cache of parsed statement lists keyed by content hash
+
+    Entries are gzipped JSON lists of the statement dicts produced by SQLStatementSplitter
+    (SQL text, source position and classification). A small index remembers the hash of
+    each file by size and mtime so unchanged files are neither re-read nor re-parsed.
+    Least recently used entries are evicted once the cache grows past max_bytes.
+    """
+
+    CACHE_VERSION = 3
+    INDEX_LIMIT = 5000
+
+    def __init__(self, cache_dir, max_bytes=PARSE_CACHE_MAX_BYTES, max_entry_bytes=PARSE_CACHE_MAX_FILE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.hits = 0
+        self.misses = 0
+        self._index = None
+        self._lock = threading.Lock()
+
+    def content_hash(self, file_path):
+        """SHA-256 of the file, reusing the indexed value when size and mtime are unchanged"""
+        key = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        with self._lock:
+            known = self._load_index().get(key)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()
+
+        with self._lock:
+            self._index[key] = [stat.st_size, stat.st_mtime_ns, content_hash]
+            self._write_index()
+        return content_hash
+
+    def get(self, file_path, db_type):
+        """Return cached statements for the file, or None on a miss"""
+        if os.path.getsize(file_path) > self.max_entry_bytes:
+            return None
+        entry_path = self._entry_path(self.content_hash(file_path), db_type)
+        try:
+            with gzip.open(entry_path, 'rt', encoding='utf-8') as f:
+                statements = json.load(f)
+            # Touch the entry so eviction keeps recently used parses
+            os.utime(entry_path, None)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return statements
+
+    def put(self, file_path, db_type, statements):
+        """Store parsed statements for the file and evict old entries if over budget"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entry_path = self._entry_path(self.content_hash(file_path), db_type)
+            temp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+                json.dump(statements, f, separators=(',', ':'))
+            os.replace(temp_path, entry_path)
+            self._evict()
+        except OSError:
+            # Caching is an optimisation only - never fail a migration over it
+            pass
+
+    def clear(self):
+        """Remove every cache entry and the hash index"""
+        with self._lock:
+            if os.path.isdir(self.cache_dir):
+                for name in os.listdir(self.cache_dir):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+            self._index = {}
+
+    def _entry_path(self, content_hash, db_type):
+        return os.path.join(self.cache_dir, f"{content_hash}-{db_type}-v{self.CACHE_VERSION}.json.gz")
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _write_index(self):
+        if len(self._index) > self.INDEX_LIMIT:
+            self._index = {path: entry for path, entry in self._index.items() if os.path.exists(path)}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json.gz'):
+                entry_path = os.path.join(self.cache_dir, name)
+                stat = os.stat(entry_path)
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+                total_size -= size
+            except OSError:
+                pass
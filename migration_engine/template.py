@@ -0,0 +1,346 @@
+"""
+Template databases for fresh, fully migrated environments
+
+Replaying every migration into a reset database is the slow part of each comparison run.
+TemplateCache builds one migrated template per migration set - the template database is
+named after a hash of the selected tools' migration files - and later resets clone it:
+
+- MySQL: the template's tables are recreated in the target and filled with
+  INSERT ... SELECT on several connections at once, then views, routines and triggers
+  are added
+- SQL Server: the template is backed up once (COPY_ONLY) when it is built, and every
+  clone restores that backup under the target's name
+
+Editing, adding or removing a migration file changes the hash, so the next clone builds
+a new template and drops the outdated ones.
+"""
+
+import os
+import time
+import hashlib
+import threading
+
+from .connection import connect_server, create_database, drop_database
+from .checksum import checksum_files
+from .baseline import MySQLSchemaDump, mysql_quote, mssql_quote
+
+
+# Table inside each template recording what it was built from; never copied to clones
+TEMPLATE_MARKER = "_migration_template"
+TEMPLATE_HASH_LENGTH = 12
+
+# Connections copying MySQL tables at once when parallel_workers is not set
+CLONE_WORKERS = 4
+
+
+class TemplateCache:
+    """Builds migrated template databases for a target and clones them over it"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.settings = engine.settings
+        self.log = engine.log
+
+    def migration_set_hash(self, tools):
+        """Hash of the database type, the tools and every migration file they would deploy"""
+        files = [(tool, filename, path) for tool in tools for filename, path in self.engine.migration_files(tool)
+                 if os.path.exists(path)]
+        checksums = checksum_files([path for _, _, path in files])
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.settings.db_type}:{','.join(tools)}\n".encode())
+        for tool, filename, path in files:
+            digest.update(f"{tool}/{filename}:{checksums[path]}\n".encode())
+        return digest.hexdigest()
+
+    def template_name(self, tools):
+        return f"{self.settings.database}_tpl_{self.migration_set_hash(tools)[:TEMPLATE_HASH_LENGTH]}"
+
+    def clone(self, tools, rebuild=False):
+        """Replace the target database with a clone of the template for tools' migration set
+
+        The template is built first when it does not exist yet (or rebuild is set).
+        Returns {'template', 'built', 'build_seconds', 'clone_seconds', 'tables'}.
+        """
+        tools = list(tools)
+        template = self.template_name(tools)
+        build_seconds = 0
+        built = rebuild or self._template_info(template) is None
+        if built:
+            start_time = time.time()
+            self.build(tools, template)
+            build_seconds = time.time() - start_time
+
+        self.log(f"🧬 Cloning template {template} into {self.settings.database}")
+        start_time = time.time()
+        if self.settings.db_type == "sqlserver":
+            tables = self._restore_sqlserver(template)
+        else:
+            tables = self._copy_mysql(template)
+        clone_seconds = time.time() - start_time
+        self.log(f"✓ {self.settings.database} cloned from {template} ({tables} tables, {clone_seconds:.1f}s)")
+        return {
+            'template': template,
+            'built': built,
+            'build_seconds': build_seconds,
+            'clone_seconds': clone_seconds,
+            'tables': tables
+        }
+
+    def build(self, tools, template):
+        """Migrate a new template database with every tool, then drop outdated templates"""
+        self.log(f"🏗️ Building template {template} from the {', '.join(tools)} migrations")
+        # A database without the marker is left over from an interrupted build
+        drop_database(self.settings, template)
+        create_database(self.settings, template)
+        try:
+            engine = self.engine.for_database(template)
+            for tool in tools:
+                self.engine.cancel.check()
+                results = engine.run(tool)
+                if results.failed:
+                    raise Exception(f"{tool} failed while building template {template}: {results.errors[0]}")
+                self.log(f"  ✓ {tool.capitalize()} applied to {template}")
+            self._mark_ready(engine, template, tools)
+        except Exception:
+            drop_database(self.settings, template)
+            raise
+        self._prune(template)
+
+    def _mark_ready(self, engine, template, tools):
+        """Record the migration set in the template; on SQL Server the backup clones restore comes first"""
+        backup_path = self._backup_sqlserver(template) if self.settings.db_type == "sqlserver" else None
+        conn = engine.connect()
+        try:
+            cursor = conn.cursor()
+            if self.settings.db_type == "sqlserver":
+                cursor.execute(f"""
+                CREATE TABLE {TEMPLATE_MARKER} (
+                    migration_set NVARCHAR(64) NOT NULL,
+                    tools NVARCHAR(100) NOT NULL,
+                    backup_path NVARCHAR(1000) NULL,
+                    built_at DATETIME2 DEFAULT GETDATE()
+                )
+                """)
+            else:
+                cursor.execute(f"""
+                CREATE TABLE {TEMPLATE_MARKER} (
+                    migration_set VARCHAR(64) NOT NULL,
+                    tools VARCHAR(100) NOT NULL,
+                    backup_path VARCHAR(1000) NULL,
+                    built_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """)
+            cursor.execute(engine._adapt_params(f"""
+                INSERT INTO {TEMPLATE_MARKER} (migration_set, tools, backup_path) VALUES (%s, %s, %s)
+            """), (self.migration_set_hash(tools), ",".join(tools), backup_path))
+            conn.commit()
+            cursor.close()
+        finally:
+            conn.close()
+
+    def _template_info(self, template):
+        """(migration set, backup path) recorded in a finished template, or None"""
+        if self.settings.db_type == "sqlserver":
+            query = f"SELECT migration_set, backup_path FROM {mssql_quote(template)}.dbo.{TEMPLATE_MARKER}"
+        else:
+            query = f"SELECT migration_set, backup_path FROM {mysql_quote(template)}.{TEMPLATE_MARKER}"
+        try:
+            conn = connect_server(self.settings)
+            try:
+                rows = self.engine._fetch_rows(conn, query)
+            finally:
+                conn.close()
+        except Exception:
+            # No such database, or its build never finished
+            return None
+        return rows[0] if rows else None
+
+    def _prune(self, keep):
+        """Drop the target's templates built from other migration sets"""
+        prefix = f"{self.settings.database}_tpl_"
+        if self.settings.db_type == "sqlserver":
+            query = "SELECT name FROM sys.databases"
+        else:
+            query = "SELECT SCHEMA_NAME FROM INFORMATION_SCHEMA.SCHEMATA"
+        try:
+            conn = connect_server(self.settings)
+            try:
+                names = [str(row[0]) for row in self.engine._fetch_rows(conn, query)]
+            finally:
+                conn.close()
+        except Exception as e:
+            self.log(f"⚠️ Warning: Could not list old templates: {str(e)}")
+            return
+        for name in names:
+            if name.startswith(prefix) and name != keep and len(name) == len(keep):
+                info = self._template_info(name)
+                drop_database(self.settings, name)
+                if info and info[1]:
+                    self._delete_backup(info[1])
+                self.log(f"  🗑️ Dropped outdated template {name}")
+
+    def _copy_mysql(self, template):
+        """Recreate the target from the template: tables in parallel, then views and programs"""
+        conn = self.engine.for_database(template).connect()
+        try:
+            dump = MySQLSchemaDump(conn, template)
+            tables, views = dump.objects()
+            jobs = [(table, dump.table_definition(table), dump.row_columns(table))
+                    for table in tables if table != TEMPLATE_MARKER]
+            definitions = [definition for _, definition in dump.view_definitions(views)]
+            definitions.extend(definition for _, _, definition in dump.program_definitions())
+            charset = self.engine._fetch_rows(conn, "SELECT DEFAULT_CHARACTER_SET_NAME, DEFAULT_COLLATION_NAME "
+                                                    "FROM INFORMATION_SCHEMA.SCHEMATA WHERE SCHEMA_NAME = DATABASE()")
+        finally:
+            conn.close()
+
+        server = connect_server(self.settings)
+        try:
+            cursor = server.cursor()
+            cursor.execute(f"DROP DATABASE IF EXISTS {mysql_quote(self.settings.database)}")
+            create = f"CREATE DATABASE {mysql_quote(self.settings.database)}"
+            if charset:
+                create += f" CHARACTER SET {charset[0][0]} COLLATE {charset[0][1]}"
+            cursor.execute(create)
+            cursor.close()
+        finally:
+            server.close()
+
+        pending = iter(jobs)
+        lock = threading.Lock()
+        failures = []
+
+        def worker(conn):
+            cursor = conn.cursor()
+            table = None
+            try:
+                cursor.execute("SET SESSION FOREIGN_KEY_CHECKS = 0, UNIQUE_CHECKS = 0")
+                while True:
+                    with lock:
+                        job = next(pending, None)
+                    if job is None or failures or self.engine.cancel.cancelled:
+                        return
+                    table, definition, columns = job
+                    column_list = ", ".join(mysql_quote(name) for name, _ in columns)
+                    cursor.execute(definition)
+                    if columns:
+                        cursor.execute(f"INSERT INTO {mysql_quote(table)} ({column_list}) "
+                                       f"SELECT {column_list} FROM {mysql_quote(template)}.{mysql_quote(table)}")
+                    conn.commit()
+            except Exception as e:
+                failures.append(Exception(f"Copying {table or 'tables'} failed: {str(e)}"))
+            finally:
+                cursor.close()
+
+        workers = self.settings.parallel_workers if self.settings.parallel_workers > 1 else CLONE_WORKERS
+        connections = [self.engine.connect() for _ in range(max(1, min(workers, len(jobs))))]
+        try:
+            threads = [threading.Thread(target=worker, args=(conn,), daemon=True) for conn in connections]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            for conn in connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        self.engine.cancel.check()
+        if failures:
+            raise failures[0]
+
+        # Triggers come last, so the copied rows did not fire them
+        conn = self.engine.connect()
+        try:
+            cursor = conn.cursor()
+            for definition in definitions:
+                cursor.execute(definition)
+            conn.commit()
+            cursor.close()
+        finally:
+            conn.close()
+        return len(jobs)
+
+    def _backup_sqlserver(self, template):
+        """COPY_ONLY backup of a finished template next to the server's other backups"""
+        conn = connect_server(self.settings)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT CAST(SERVERPROPERTY('InstanceDefaultBackupPath') AS NVARCHAR(4000))")
+            folder = cursor.fetchone()[0]
+            if not folder:
+                # Older servers: keep it beside the template's data file
+                cursor.execute("SELECT physical_name FROM sys.master_files WHERE database_id = DB_ID(?) AND type = 0",
+                               (template,))
+                folder = _server_path_split(cursor.fetchone()[0])[0]
+            backup_path = _server_path_join(folder, f"{template}.bak")
+            cursor.execute(f"BACKUP DATABASE {mssql_quote(template)} TO DISK = N'{_literal(backup_path)}' "
+                           f"WITH COPY_ONLY, INIT")
+            # BACKUP reports progress as result messages; drain them so it runs to completion
+            while cursor.nextset():
+                pass
+            cursor.close()
+            return backup_path
+        except Exception as e:
+            raise Exception(f"Failed to back up template {template}: {str(e)}")
+        finally:
+            conn.close()
+
+    def _restore_sqlserver(self, template):
+        """Restore the template's backup as the target database, with files renamed for the target"""
+        info = self._template_info(template)
+        if not info or not info[1]:
+            raise Exception(f"Template {template} has no backup to restore")
+        target = self.settings.database
+        drop_database(self.settings, target)
+
+        conn = connect_server(self.settings)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name, physical_name FROM sys.master_files WHERE database_id = DB_ID(?)", (template,))
+            moves = []
+            for logical_name, physical_name in cursor.fetchall():
+                folder, filename = _server_path_split(physical_name)
+                moved = _server_path_join(folder, f"{target}_{logical_name}{os.path.splitext(filename)[1]}")
+                moves.append(f"MOVE N'{_literal(logical_name)}' TO N'{_literal(moved)}'")
+            cursor.execute(f"RESTORE DATABASE {mssql_quote(target)} FROM DISK = N'{_literal(info[1])}' "
+                           f"WITH {', '.join(moves)}, REPLACE, RECOVERY")
+            while cursor.nextset():
+                pass
+            cursor.execute(f"SELECT COUNT(*) FROM {mssql_quote(target)}.sys.tables WHERE is_ms_shipped = 0")
+            tables = cursor.fetchone()[0]
+            cursor.close()
+            return tables
+        except Exception as e:
+            raise Exception(f"Failed to restore template {template} as {target}: {str(e)}")
+        finally:
+            conn.close()
+
+    def _delete_backup(self, backup_path):
+        try:
+            conn = connect_server(self.settings)
+            try:
+                cursor = conn.cursor()
+                cursor.execute(f"EXEC master.dbo.xp_delete_file 0, N'{_literal(backup_path)}'")
+                cursor.close()
+            finally:
+                conn.close()
+        except Exception as e:
+            self.log(f"⚠️ Warning: Could not delete template backup {backup_path}: {str(e)}")
+
+
+def _server_path_split(path):
+    """(folder, file name) of a path on the database server, which may use either separator"""
+    separator = "\\" if "\\" in path else "/"
+    folder, _, filename = path.rpartition(separator)
+    return folder, filename
+
+
+def _server_path_join(folder, filename):
+    separator = "\\" if "\\" in folder else "/"
+    return folder.rstrip("\\/") + separator + filename
+
+
+def _literal(text):
+    return str(text).replace("'", "''")
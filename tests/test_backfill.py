@@ -0,0 +1,30 @@
+import pytest
+
+from migration_engine.backfill import parse_backfill
+
+
+def test_update():
+    backfill = parse_backfill("UPDATE users SET note = 'a; WHERE b' WHERE id > 3;")
+    assert (backfill.kind, backfill.table, backfill.condition) == ("UPDATE", "users", "id > 3")
+    assert backfill.set_clause.strip() == "note = 'a; WHERE b'"
+
+
+def test_delete_without_where():
+    backfill = parse_backfill("DELETE FROM audit_log")
+    assert (backfill.kind, backfill.table, backfill.condition) == ("DELETE", "audit_log", None)
+
+
+def test_insert_select_chunks_its_source():
+    backfill = parse_backfill("INSERT INTO archive (id) SELECT id FROM orders WHERE status = 'x'")
+    assert (backfill.kind, backfill.table, backfill.condition) == ("INSERT", "orders", "status = 'x'")
+
+
+@pytest.mark.parametrize("sql", [
+    "INSERT INTO orders (id) SELECT id FROM orders",
+    "INSERT INTO t VALUES (1)",
+    "UPDATE users u JOIN roles r ON r.id = u.role_id SET u.x = 1",
+    "UPDATE users SET a = 1 LIMIT 10",
+    "SELECT * FROM users",
+])
+def test_not_chunkable(sql):
+    assert parse_backfill(sql) is None
@@ -0,0 +1,54 @@
+from migration_engine.compare import SchemaSnapshot, SchemaDiff
+
+
+def _snapshot(tables=(), indexes=None, foreign_keys=None, views=None):
+    """SQL Server snapshot built by hand: tables are names with one id column, the rest {name: definition}"""
+    snapshot = SchemaSnapshot(None, "sqlserver", "db")
+    for name in tables:
+        column = {'name': 'id', 'definition': 'INT NOT NULL', 'create': '[id] INT NOT NULL'}
+        snapshot.tables[name] = {'name': f"[dbo].[{name}]", 'columns': {'id': column}, 'order': ['id']}
+    for attribute, entries in (('indexes', indexes), ('foreign_keys', foreign_keys)):
+        for name, definition in (entries or {}).items():
+            getattr(snapshot, attribute)[('a', name)] = {
+                'name': name, 'table': 'a', 'definition': definition,
+                'create': f"CREATE {name} {definition}", 'drop': f"DROP {name}"}
+    for name, definition in (views or {}).items():
+        snapshot.modules[('VIEW', f"dbo.{name}")] = {
+            'name': name, 'kind': 'VIEW', 'definition': definition,
+            'create': f"CREATE VIEW {name} AS {definition}", 'drop': f"DROP VIEW {name}"}
+    return snapshot
+
+
+def _diff(alter):
+    source = _snapshot(["a", "b"], indexes={'ix': "new"}, foreign_keys={'fk': "new"},
+                       views={'v2': "SELECT * FROM v1", 'v1': "SELECT id FROM a WHERE 1 = 1"})
+    target = _snapshot(["a", "c"], indexes={'ix': "old"}, foreign_keys={'fk': "old"},
+                       views={'v1': "SELECT id FROM a"})
+    return SchemaDiff(source, target, alter)
+
+
+def test_alter_drops_dependents_first_and_creates_views_in_dependency_order():
+    statements = [sql for sql, _ in _diff(alter=True).statements]
+    assert statements == [
+        "DROP fk",
+        "DROP VIEW v1",
+        "DROP ix",
+        "CREATE TABLE [dbo].[b] (\n    [id] INT NOT NULL\n)",
+        "CREATE ix new",
+        "CREATE fk new",
+        "CREATE VIEW v1 AS SELECT id FROM a WHERE 1 = 1",
+        "CREATE VIEW v2 AS SELECT * FROM v1",
+    ]
+
+
+def test_without_alter_changed_objects_are_only_listed():
+    diff = _diff(alter=False)
+    statements = [sql for sql, _ in diff.statements]
+    assert not any(sql.startswith("DROP") for sql in statements)
+    assert [sql for sql in statements if sql.startswith("-- Left unchanged")] == [
+        "-- Left unchanged: index [dbo].[a].ix differs from the migrations",
+        "-- Left unchanged: foreign key [dbo].[a].fk differs from the migrations",
+        "-- Left unchanged: view v1 differs from the migrations",
+    ]
+    assert statements[-1] == "CREATE VIEW v2 AS SELECT * FROM v1"
+    assert ('extra', 'TABLE', "[dbo].[c]") in diff.differences
@@ -0,0 +1,141 @@
+"""
+Checksums, dbms filters and pending changeSets of the native Liquibase executor
+
+The checksums this repo's changelogs get must equal the MD5SUMs a real `liquibase update`
+(4.0-4.23, version 8 checksums) writes. Record them once per database type in
+fixtures/liquibase_md5sums.json by running `liquibase update` against an empty database
+and exporting
+
+    SELECT FILENAME, ID, AUTHOR, MD5SUM FROM DATABASECHANGELOG
+
+as {"mysql": [{"filename", "id", "author", "md5sum"}...], "sqlserver": [...]}; the test is
+skipped for database types without recorded rows.
+"""
+
+import json
+import os
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from migration_engine.liquibase import (LiquibaseChangelog, NativeLiquibase, UnsupportedChangelog, changeset_checksum,
+                                        _checksum_matches, _dbms_matches, _file_key, _tag, CHECKSUM_VERSION)
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RECORDED_MD5SUMS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "liquibase_md5sums.json")
+LIQUIBASE_DIRS = {'mysql': "mysql", 'sqlserver': "microsoft_sql"}
+
+
+def _changesets(db_type):
+    changelog = LiquibaseChangelog(os.path.join(ROOT, "liquibase", LIQUIBASE_DIRS[db_type])).load()
+    return [changeset for changeset in changelog.changesets if changeset.applies_to(db_type)]
+
+
+def _native(db_type):
+    engine = SimpleNamespace(settings=SimpleNamespace(db_type=db_type), log=print)
+    return NativeLiquibase(engine, os.path.join(ROOT, "liquibase", LIQUIBASE_DIRS[db_type]))
+
+
+def _ran(changesets, checksum):
+    return {changeset.key: {'exectype': 'EXECUTED', 'order': order, 'filename': changeset.path, 'checksum': checksum}
+            for order, changeset in enumerate(changesets, 1)}
+
+
+@pytest.mark.parametrize("db_type", sorted(LIQUIBASE_DIRS))
+def test_checksums_match_liquibase(db_type):
+    if not os.path.exists(RECORDED_MD5SUMS):
+        pytest.skip("no MD5SUMs recorded from a real `liquibase update` (see module docstring)")
+    with open(RECORDED_MD5SUMS, 'r', encoding='utf-8') as f:
+        rows = json.load(f).get(db_type)
+    if not rows:
+        pytest.skip(f"no MD5SUMs recorded for {db_type}")
+    recorded = {(row['id'], row['author'], _file_key(row['filename'])): row['md5sum'] for row in rows}
+
+    compared = 0
+    for changeset in _changesets(db_type):
+        checksum = changeset_checksum(changeset)
+        if checksum is None or changeset.key not in recorded:
+            continue
+        assert checksum == recorded[changeset.key], changeset.location
+        compared += 1
+    assert compared, f"no {db_type} changeSet could be compared"
+
+
+@pytest.mark.parametrize("db_type", sorted(LIQUIBASE_DIRS))
+def test_checksum_format(db_type):
+    for changeset in _changesets(db_type):
+        checksum = changeset_checksum(changeset)
+        if checksum is not None:
+            assert re.fullmatch(rf"{CHECKSUM_VERSION}:[0-9a-f]{{32}}", checksum), changeset.location
+
+
+def test_raw_sql_has_no_native_checksum():
+    changesets = _changesets('sqlserver')
+    with_sql = [changeset for changeset in changesets if any(_tag(change) == 'sql' for change in changeset.changes)]
+    assert with_sql
+    assert all(changeset_checksum(changeset) is None for changeset in with_sql)
+
+
+def test_edited_changeset_changes_checksum():
+    changeset = next(changeset for changeset in _changesets('mysql') if changeset_checksum(changeset))
+    before = changeset_checksum(changeset)
+    change = changeset.changes[0]
+    attribute = next(iter(change.attrib))
+    change.set(attribute, change.get(attribute) + "_edited")
+    assert changeset_checksum(changeset) != before
+
+
+def test_valid_checksums():
+    assert _checksum_matches("8:a", "8:a", [])
+    assert _checksum_matches("8:old", "8:new", ["8:old"])
+    assert _checksum_matches("8:old", "8:new", ["any"])
+    assert _checksum_matches("9:old", None, ["9:old"])
+    assert not _checksum_matches("9:recorded", "8:computed", [])
+    assert not _checksum_matches("8:old", "8:new", ["8:other"])
+
+
+def test_pending_new_changesets():
+    changesets = _changesets('mysql')
+    ran = _ran(changesets[:1], None)
+    pending = _native('mysql')._pending(changesets, ran, {changeset.key: [] for changeset in changesets})
+    assert pending == changesets[1:]
+
+
+def test_ran_without_md5sum_is_not_pending():
+    changesets = [changeset for changeset in _changesets('mysql') if not changeset.run_always]
+    checksums = {changeset.key: ["8:computed"] for changeset in changesets}
+    assert _native('mysql')._pending(changesets, _ran(changesets, None), checksums) == []
+
+
+def test_recorded_md5sum_matches():
+    changesets = [changeset for changeset in _changesets('mysql') if not changeset.run_always]
+    # A version 9 checksum Liquibase recorded for the unchanged file
+    checksums = {changeset.key: ["8:computed", "9:recorded"] for changeset in changesets}
+    assert _native('mysql')._pending(changesets, _ran(changesets, "9:recorded"), checksums) == []
+
+
+def test_mismatch_is_left_to_the_cli():
+    changesets = [changeset for changeset in _changesets('mysql') if not changeset.run_always]
+    checksums = {changeset.key: ["8:computed"] for changeset in changesets}
+    with pytest.raises(UnsupportedChangelog):
+        _native('mysql')._pending(changesets, _ran(changesets, "8:edited"), checksums)
+
+
+@pytest.mark.parametrize("dbms, db_type, expected", [
+    (None, 'mysql', True),
+    ("", 'sqlserver', True),
+    ("mysql", 'mysql', True),
+    ("mariadb", 'mysql', True),
+    ("mysql", 'sqlserver', False),
+    ("mssql, mysql", 'sqlserver', True),
+    ("MSSQL", 'sqlserver', True),
+    ("!mssql", 'sqlserver', False),
+    ("!mssql", 'mysql', True),
+    ("all", 'mysql', True),
+    ("all, !mysql", 'mysql', False),
+    ("none", 'mysql', False),
+])
+def test_dbms_matches(dbms, db_type, expected):
+    assert _dbms_matches(dbms, db_type) is expected
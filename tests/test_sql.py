@@ -0,0 +1,65 @@
+from migration_engine.sql import SQLStatementSplitter
+
+
+def test_mysql_delimiters_and_strings():
+    statements = SQLStatementSplitter("mysql").split(
+        "CREATE TABLE a (x INT);\n"
+        "INSERT INTO a VALUES (';');\n"
+        "DELIMITER $$\n"
+        "CREATE PROCEDURE p() BEGIN SELECT 1; SELECT 2; END$$\n"
+        "DELIMITER ;\n"
+        "-- comment; not a statement\n"
+        "SELECT 3;"
+    )
+    assert [statement['sql'] for statement in statements] == [
+        "CREATE TABLE a (x INT)",
+        "INSERT INTO a VALUES (';')",
+        "CREATE PROCEDURE p() BEGIN SELECT 1; SELECT 2; END",
+        "SELECT 3",
+    ]
+    assert [statement['line'] for statement in statements] == [1, 2, 4, 7]
+    assert [statement['classification']['verb'] for statement in statements] == ["CREATE", "INSERT", "CREATE", "SELECT"]
+
+
+def test_sqlserver_go_batches():
+    statements = SQLStatementSplitter("sqlserver").split(
+        "CREATE TABLE a (x INT)\nGO\n"
+        "CREATE VIEW v AS SELECT x FROM a\nGO\n"
+        "INSERT INTO a VALUES (1); INSERT INTO a VALUES (2)\nGO"
+    )
+    assert [(statement['sql'], statement['batch']) for statement in statements] == [
+        ("CREATE TABLE a (x INT)", 0),
+        ("CREATE VIEW v AS SELECT x FROM a", 1),
+        ("INSERT INTO a VALUES (1)", 2),
+        ("INSERT INTO a VALUES (2)", 2),
+    ]
+
+
+def test_sqlserver_module_body_runs_to_end_of_batch():
+    statements = SQLStatementSplitter("sqlserver").split(
+        "CREATE PROCEDURE p AS\nSET NOCOUNT ON;\nSELECT 1;\nGO\n"
+        "IF 1 = 1 BEGIN SELECT 1; END\nSELECT 2"
+    )
+    assert [statement['sql'] for statement in statements] == [
+        "CREATE PROCEDURE p AS\nSET NOCOUNT ON;\nSELECT 1;",
+        "IF 1 = 1 BEGIN SELECT 1; END",
+        "SELECT 2",
+    ]
+
+
+def test_mysql_double_dash_needs_whitespace():
+    statements = SQLStatementSplitter("mysql").split("SELECT 1--1;\nSELECT 2 -- comment;\n;")
+    assert [statement['sql'] for statement in statements] == ["SELECT 1--1", "SELECT 2"]
+
+
+def test_offsets_are_bytes():
+    sql = "SELECT 'é';\nSELECT 2;"
+    statements = SQLStatementSplitter("mysql").split(sql)
+    encoded = sql.encode('utf-8')
+    assert encoded[statements[1]['offset']:].startswith(b"SELECT 2")
+
+
+def test_literals_keep_crlf():
+    statements = SQLStatementSplitter("mysql").split("INSERT INTO t VALUES ('a\r\nb');\r\nSELECT 1;\r\n")
+    assert statements[0]['sql'] == "INSERT INTO t VALUES ('a\r\nb')"
+    assert statements[1]['sql'] == "SELECT 1"